@@ -0,0 +1,81 @@
+from argparse import ArgumentParser, ArgumentTypeError
+from os import path
+from src.warehouse import Warehouse, COMPARE_BY
+
+if __name__ == '__main__':
+    def file_path(rel_path: str) -> None:
+        abs_path = path.abspath(rel_path)
+        if path.isfile(abs_path):
+            return abs_path
+        raise ArgumentTypeError(f"file_path: {rel_path} is not a valid path.")
+
+    parser = ArgumentParser(
+        description='Compares the runs of two campaigns, solver versions or '
+        'hosts in a results database of run_backends.py (--sqlite-output). '
+        'The runs are paired by model, instance and backend, and a backend '
+        'regressed when the candidate is significantly slower (paired t-test '
+        'on the logarithms of the PAR-10 runtimes) or finds significantly '
+        'worse objectives (sign test) than the baseline. Exits with 1 when '
+        'any backend regressed.')
+
+    parser.add_argument(dest='db', metavar='<results>.db', type=file_path,
+                        help='The results database.')
+
+    parser.add_argument(dest='baseline', metavar='<baseline>', type=str,
+                        nargs='?', help='The campaign, solver version or '
+                        'host (--by) to compare against.')
+
+    parser.add_argument(dest='candidate', metavar='<candidate>', type=str,
+                        nargs='?', help='The campaign, solver version or '
+                        'host (--by) to compare.')
+
+    parser.add_argument('--by', dest='by', choices=sorted(COMPARE_BY),
+                        default='campaign', help='What <baseline> and '
+                        '<candidate> name. Defaults to campaign.')
+
+    parser.add_argument('--backends', dest='backends', metavar='<backend>',
+                        type=str, nargs='+',
+                        help='The names of the backends to compare.')
+
+    parser.add_argument('--alpha', dest='alpha', metavar='<alpha>',
+                        type=float, default=0.05,
+                        help='The significance level of the tests. Defaults '
+                        'to 0.05.')
+
+    parser.add_argument('--list', dest='list', action='store_true',
+                        help='Lists the campaigns of the database.')
+
+    args = parser.parse_args()
+
+    warehouse = Warehouse(args.db)
+    if args.list:
+        for name, started, host, model, num_runs in warehouse.campaigns():
+            print(f'{name}: {num_runs} runs of {model} on {host}, '
+                  f'started {started}')
+        exit(0)
+
+    if args.baseline is None or args.candidate is None:
+        parser.error("<baseline> and <candidate> are required.")
+
+    try:
+        regressions = warehouse.compare(args.baseline, args.candidate,
+                                        args.by, args.backends)
+    except KeyError as e:
+        parser.error(e.args[0])
+    finally:
+        warehouse.close()
+    if len(regressions) == 0:
+        parser.error(f"{args.baseline} and {args.candidate} share no runs.")
+
+    regressed = False
+    for r in regressions:
+        slower = r.slower(args.alpha)
+        worse = r.worse_objective(args.alpha)
+        regressed = regressed or slower or worse
+        print(f'{r.backend_name}: {r.num_instances} instances, '
+              f'time x{r.time_ratio:.3f} (p={r.time_p_value:.4f})'
+              f'{" SLOWER" if slower else ""}, objective worse on '
+              f'{r.num_worse}, better on {r.num_better} '
+              f'(p={r.objective_p_value:.4f})'
+              f'{" WORSE" if worse else ""}')
+    exit(1 if regressed else 0)
@@ -1,18 +1,15 @@
-import minizinc
 import logging
 from typing import List
 from argparse import ArgumentParser, ArgumentTypeError
 from glob import glob
 from os import path
 from json import load
-from src.aux import set_minizinc_driver_path, filter_minizinc_backends
-from src.outputters.outputter import Outputter
-from src.outputters.json_outputter import JsonOutputter
-from src.outputters.log_outputter import LogOutputter
-# from src.outputters.plot_outputter import PlotOutputter
-from src.outputters.tex_outputter import TexOutputter
-from src.backend_runner import BackendRunner
+from importlib.util import find_spec
+from src.aux import set_minizinc_driver_path, filter_minizinc_backends, \
+  get_minizinc_executable
+from src.param_grid import ParamRange, ParamGrid
 from src.str_to_timedelta import StrToTimedelta
+from src.time_source import TIME_SOURCES
 
 if __name__ == '__main__':
     def file_path(rel_path: str) -> None:
@@ -51,7 +48,14 @@ if __name__ == '__main__':
         'the LaTeX table')
 
     parser.add_argument(dest='model', metavar='<model>.mzn', type=file_path,
-                        help='The MiniZinc model file.')
+                        help='The MiniZinc model file, or a campaign '
+                        '<campaign>.json that lists models with the globs of '
+                        'their data files ("data") or their params '
+                        '("params", as for -r), and the "backends", '
+                        '"timeout", per-backend "timeouts", flag "variants" '
+                        '(each run as a separate backend), "extra" flags '
+                        'and "repetitions" of the campaign or of a model. '
+                        'These default to the flags of this script.')
 
     parser.add_argument('-t', '--timeout', dest='timeout', metavar='<timeout>',
                         type=str, nargs='*',
@@ -59,6 +63,28 @@ if __name__ == '__main__':
                         'space separated time units for each instance. For '
                         'example, "1h 2m03s 100ms".')
 
+    parser.add_argument('--timeout-ladder', dest='timeout_ladder',
+                        metavar='<timeout>', type=str, nargs='+',
+                        help='Runs every instance with each backend using '
+                        'the smallest of the given timeouts first, and then '
+                        'reruns only the runs that timed out with the next '
+                        'larger timeout. The output reports the result of '
+                        'the last run of each instance and backend. For '
+                        'example, "5s 30s 2m". Backends with a timeout of '
+                        'their own in a campaign scale the ladder, so that '
+                        'its largest timeout becomes theirs. This flag is '
+                        'mutually exclusive with -t (--timeout).')
+
+    parser.add_argument('--ladder-chunk', dest='ladder_chunk',
+                        metavar='<rows>', type=int, default=256,
+                        help='The number of instances (rows) that '
+                        '--timeout-ladder runs with each of its timeouts '
+                        'before it moves on to the next instances, and '
+                        'reports their results. Larger chunks run more '
+                        'instances with the smallest timeouts first, '
+                        'smaller ones report results sooner. Defaults to '
+                        '256.')
+
     parser.add_argument('--json-config', dest='json_config_path',
                         metavar='<json file>', type=file_path,
                         default=json_config_path,
@@ -66,14 +92,17 @@ if __name__ == '__main__':
                         'default values for this script.')
 
     data_group = parser.add_mutually_exclusive_group()
-    data_group.add_argument('-r', '--param', dest='param',
+    data_group.add_argument('-r', '--param', dest='params',
                             metavar=('<param>', '<start>', '<stop>', '<inc>'),
-                            nargs=4, type=str,
+                            nargs=4, type=str, action='append',
                             help='The range the model is to be run on, where '
                             'parameter <param> is initially set to <start>, '
                             'then iteratively modifies <param> adding <inv> '
                             'until <param> reaches (or surpasses) <stop>. '
                             'Note that <inc> can be a negative value. '
+                            'This flag can be repeated, in which case the '
+                            'model is run on every combination of the '
+                            'parameter values. '
                             'This flag is mutually exclusive with -d (--data)')
 
     data_group.add_argument('-d', '--data', dest='data_files',
@@ -82,6 +111,250 @@ if __name__ == '__main__':
                             'to run the model on. This flag is mutually '
                             'exclusive with -r (--param).')
 
+    parser.add_argument('--generator', dest='generator',
+                        metavar='<module>:<function>', type=str,
+                        help='Runs the model on instances generated by a '
+                        'Python function (given as <module>:<function> or '
+                        '<file>.py:<function>), which is called with a dict '
+                        'of the params of -r (--param), which then vary the '
+                        'instances instead of the model, and a seed, and '
+                        'returns the data of an instance as a dict or as dzn '
+                        'text. The instances are generated in worker '
+                        'processes ahead of the runs and cached by their '
+                        'contents in --generator-cache.')
+
+    parser.add_argument('--seeds', dest='seeds', metavar='<n>', type=int,
+                        default=1, help='The number of instances that '
+                        '--generator generates for each combination of the '
+                        'params, with the seeds 0 to <n> - 1. Defaults to 1.')
+
+    parser.add_argument('--generator-workers', dest='generator_workers',
+                        metavar='<n>', type=int, default=1,
+                        help='The number of worker processes of --generator. '
+                        'Defaults to 1.')
+
+    parser.add_argument('--generator-cache', dest='generator_cache',
+                        metavar='<dir>', type=str,
+                        help='The directory that --generator writes the '
+                        'instances to, named by the hash of their contents, '
+                        'so that instances are only generated once. Defaults '
+                        'to "generated" next to the model.')
+
+    parser.add_argument('--adaptive', dest='adaptive',
+                        metavar='<resolution>', type=int,
+                        help='Runs an adaptive sweep over the single '
+                        '-r (--param) range: the range is first run with '
+                        'its increment <inc>, after which the intervals '
+                        'where a backend goes from solved to timed out (or '
+                        'where its runtime jumps) are bisected until they are '
+                        'at most <resolution> wide.')
+
+    parser.add_argument('--budget', dest='budget', metavar='<runs>',
+                        type=int, help='The maximum number of runs of an '
+                        'adaptive sweep (--adaptive).')
+
+    parser.add_argument('--jump-factor', dest='jump_factor',
+                        metavar='<factor>', type=float, default=10.0,
+                        help='The factor by which the runtime of a backend '
+                        'must change between two parameter values for an '
+                        'adaptive sweep (--adaptive) to bisect the interval '
+                        'between them. Defaults to 10.')
+
+    parser.add_argument('--race', dest='race', metavar='<block size>',
+                        type=int, help='Races the backends (F-race): after '
+                        'every <block size> instances, a Friedman test on '
+                        'the ranks of the backends over the instances run so '
+                        'far decides whether they perform differently, and '
+                        'the backends that perform significantly worse than '
+                        'the best backend are not run on the remaining '
+                        'instances.')
+
+    parser.add_argument('--race-alpha', dest='race_alpha', metavar='<alpha>',
+                        type=float, default=0.05,
+                        help='The significance level of the tests of a race '
+                        '(--race). Defaults to 0.05.')
+
+    parser.add_argument('--threads', dest='threads', metavar='<n>',
+                        type=int, nargs='+', help='Studies the thread '
+                        'scaling of the backends: each backend is run with '
+                        'each of the given numbers of threads (passed on as '
+                        '-p <n>) as a separate backend, and the speedup and '
+                        'parallel efficiency with respect to the fewest '
+                        'threads are reported for each instance and as the '
+                        'geometric mean over all instances.')
+
+    parser.add_argument('--proof', dest='proof', metavar='<mode>',
+                        choices=('proof', 'gap'), nargs='+',
+                        help='Studies the optimality proofs of an '
+                        'optimisation model: each backend is also run with '
+                        'the objective constrained to the best known '
+                        'objective of the instance (proof: times the proof '
+                        'without searching worse solutions) or to beat it '
+                        '(gap: times closing the gap, or proving the best '
+                        'known objective optimal), as a separate backend. '
+                        'Instances without a best known objective are not '
+                        'run in these modes. Requires --bounds.')
+
+    parser.add_argument('--bounds', dest='bounds', metavar='<file>.json',
+                        type=file_path, nargs='+',
+                        help='The best known objectives of --proof: either '
+                        '--json-output files of earlier runs, or files '
+                        'mapping data files (or their names) and param '
+                        'points (as "n = 5") to objectives.')
+
+    parser.add_argument('-j', '--jobs', dest='jobs', metavar='<n>',
+                        type=int, default=1,
+                        help='Runs up to <n> instances and backends at once. '
+                        'A run occupies as many cores of the core budget '
+                        '(--cores) as its backend is given threads (-p or '
+                        '--parallel), and runs are only started while they '
+                        'fit into the budget, backfilling single-threaded '
+                        'runs around wider ones. Defaults to 1.')
+
+    parser.add_argument('--cores', dest='cores', metavar='<n>', type=int,
+                        help='The number of cores the runs of --jobs may '
+                        'occupy at once. Defaults to the number of CPUs of '
+                        '--cpus, or else the number of available CPUs.')
+
+    parser.add_argument('--plan', dest='plan', metavar='<results>.json',
+                        type=file_path, nargs='*',
+                        help='Estimates the cost of the runs instead of '
+                        'running them: the runtime of each instance and '
+                        'backend is drawn from its runs in the given '
+                        '--json-output files (or else from the runs of its '
+                        'backend on other instances), the scheduling of '
+                        '--jobs and --timeout-ladder is simulated, and the '
+                        'expected makespan, CPU-hours and share of timeouts '
+                        'are printed. Without results, every run is '
+                        'expected to time out.')
+
+    parser.add_argument('--plan-jobs', dest='plan_jobs', metavar='<n>',
+                        type=int, nargs='+',
+                        help='The numbers of --jobs to compare with --plan. '
+                        'Defaults to --jobs.')
+
+    parser.add_argument('--watch', dest='watch', action='store_true',
+                        help='Keeps watching the model, the files it '
+                        'includes and the data files after running, and '
+                        'reruns the instances affected by each change, '
+                        'those that were solved or disproved fastest first. '
+                        'A change during a rerun cancels the runs in flight. '
+                        'Stop with Ctrl-C.')
+
+    parser.add_argument('--watch-interval', dest='watch_interval',
+                        metavar='<seconds>', type=float, default=0.5,
+                        help='How often --watch checks the files for '
+                        'changes. Defaults to 0.5.')
+
+    parser.add_argument('--selector', dest='selector', metavar='<file>',
+                        type=str, help='The per-instance algorithm selector '
+                        'used by --select, or the file that --train-selector '
+                        'saves it to.')
+
+    parser.add_argument('--train-selector', dest='train_selector',
+                        metavar='<results>.json', type=file_path, nargs='+',
+                        help='Trains a selector (--selector) on the runs of '
+                        'earlier --json-output files: the instances are '
+                        'flattened for the first backend to extract their '
+                        'features, and the cost of a run is its time, or 10 '
+                        'times the timeout when unsolved (PAR-10). A '
+                        'leave-one-out evaluation against the virtual best '
+                        'solver is printed and no backends are run.')
+
+    parser.add_argument('--select', dest='select', metavar='<k>', type=int,
+                        help='Runs only the <k> backends that the selector '
+                        '(--selector) predicts to be the best for each '
+                        'instance.')
+
+    parser.add_argument('--knn', dest='knn', metavar='<k>', type=int,
+                        default=5, help='The number of nearest instances '
+                        'whose costs --train-selector predicts the costs of '
+                        'the backends from. Defaults to 5.')
+
+    parser.add_argument('--flatten-workers', dest='flatten_workers',
+                        metavar='<n>', type=int, default=0,
+                        help='Flattens the upcoming instances for the '
+                        'backends using <n> worker threads while the current '
+                        'instance is being solved, so that the timeout only '
+                        'applies to solving the FlatZinc. Defaults to 0, '
+                        'which flattens and solves each instance in one '
+                        'MiniZinc call.')
+
+    parser.add_argument('--kill-grace', dest='kill_grace',
+                        metavar='<seconds>', type=float, default=5.0,
+                        help='Each run leads its own process group under a '
+                        'watchdog, which sends SIGTERM to the group of a run '
+                        'that exceeds its timeout by <seconds>, and SIGKILL '
+                        '<seconds> later. Defaults to 5.')
+
+    parser.add_argument('--on-error', dest='on_error',
+                        choices=('abort', 'continue'), default='abort',
+                        help='What a run that fails with an error (after its '
+                        '--retries), or whose model cannot be flattened or '
+                        'instance generated by --generator, does: end the '
+                        'runs (abort), or be reported as ERR with the error '
+                        'output of MiniZinc while the remaining runs '
+                        'continue (continue), '
+                        'after which the failed runs are listed. Defaults to '
+                        'abort.')
+
+    parser.add_argument('--retries', dest='retries', metavar='<n>',
+                        type=int, default=0,
+                        help='Retries a run that fails with an error up to '
+                        '<n> times, for example on a failed license check '
+                        'or a crashed driver. Errors of the model or its '
+                        'data (syntax, type and evaluation errors) are not '
+                        'retried. Defaults to 0.')
+
+    parser.add_argument('--retry-backoff', dest='retry_backoff',
+                        metavar='<seconds>', type=float, default=1.0,
+                        help='The seconds before the first retry of '
+                        '--retries, doubled for each further retry (up to a '
+                        'minute). With --jobs, a run frees its job and cores '
+                        'while it waits. Defaults to 1.')
+
+    parser.add_argument('--calibration', dest='calibration',
+                        metavar='<file>.json', type=str,
+                        help='Calibrates the speed of this host by a '
+                        'reference workload, which is run once per host and '
+                        'kept in <file>.json (shared by the hosts of a '
+                        'campaign). The first host calibrated is the '
+                        'reference host: the timeouts are scaled to the '
+                        'speed of this host, so that they allow as much work '
+                        'as on the reference host, and the reported times '
+                        'are normalized to the reference host. Each result '
+                        'records its host and speed factor.')
+
+    parser.add_argument('--recalibrate', dest='recalibrate',
+                        action='store_true',
+                        help='Runs the reference workload of --calibration '
+                        'again, for example after a hardware change.')
+
+    parser.add_argument('--time-source', dest='time_source',
+                        choices=TIME_SOURCES, default='wall',
+                        help='The time that is reported for each run: the '
+                        'wall time measured by this script (wall), the time '
+                        'reported by MiniZinc (solver), or the solving time '
+                        'reported by MiniZinc excluding flattening (solve). '
+                        'Defaults to wall.')
+
+    parser.add_argument('--memory-limit', dest='memory_limit',
+                        metavar='<size>', type=str,
+                        help='The address space limit of each solver process, '
+                        'in bytes or with a unit, for example "8G". Runs '
+                        'exceeding it are reported as out of memory (m/o). '
+                        'Overrides the "limits" of the JSON configuration '
+                        'file, and is overridden by the "limits" of a backend '
+                        'in "backend_config".')
+
+    parser.add_argument('--cpus', dest='cpus', metavar='<cpu list>',
+                        type=str, help='The CPU cores the solver processes '
+                        'are pinned to, for example "0-3,6".')
+
+    parser.add_argument('--thread-limit', dest='thread_limit', metavar='<n>',
+                        type=int, help='The number of threads each solver '
+                        'is allowed to use (passed on as -p <n>).')
+
     parser.add_argument('-o', '--output', dest='output',
                         metavar='<output file>', type=creatable_file,
                         help='The LaTeX file to write the output to; this '
@@ -98,12 +371,34 @@ if __name__ == '__main__':
                         'Creates file <output file> if it does not already '
                         'exist.')
 
+    parser.add_argument('--sqlite-output', dest='sqlite_output',
+                        metavar='<output file>', type=creatable_file,
+                        help='Adds the runs to the SQLite results database '
+                        '<output file>, keyed by the hash of the model and '
+                        'instance, the backend, its version and flags, and '
+                        'the host. Compare the runs of two campaigns, solver '
+                        'versions or hosts with compare.py.')
+
+    parser.add_argument('--campaign', dest='campaign', metavar='<name>',
+                        type=str, help='The name of the campaign in the '
+                        '--sqlite-output database; runs of an existing '
+                        'campaign are added to it. Defaults to the model, '
+                        'host and start time.')
+
     parser.add_argument('--vars', dest='vars', metavar='<var>', type=str,
                         nargs='+', help='The name of each variable that is '
                         'to be included in the output LaTeX table. Note that '
                         'the objective value is included in the LaTeX table '
                         'automatically.')
 
+    parser.add_argument('--lean', dest='lean', action='store_true',
+                        help='Only outputs the objective and the --vars '
+                        'of each solution, in place of the output item of '
+                        'the model, and only reads those of the last '
+                        'solution of each run, which cuts the output and '
+                        'parsing time of models with large solutions. The '
+                        'JSON output then only has these variables.')
+
     parser.add_argument('--backends', dest='backends', metavar='<backend>',
                         type=str, nargs='+', help='The set of solvers to run '
                         'the instances on.')
@@ -118,6 +413,33 @@ if __name__ == '__main__':
                         '<output file>. Creates file <output file> if it does '
                         'not already exist.')
 
+    parser.add_argument('--progress', dest='progress', action='store_true',
+                        help='Reports the progress of the runs, the '
+                        'throughput, the CPU utilisation, the timeout rate of '
+                        'each backend and the estimated time remaining. On '
+                        'a terminal the progress is refreshed in place, '
+                        'otherwise it is written to stderr periodically.')
+
+    parser.add_argument('--progress-interval', dest='progress_interval',
+                        metavar='<seconds>', type=float, default=60.0,
+                        help='The number of seconds between progress lines '
+                        'when stderr is not a terminal. Defaults to 60.')
+
+    parser.add_argument('--metrics-port', dest='metrics_port',
+                        metavar='<port>', type=int,
+                        help='Serves metrics of the runs (runs, timeouts and '
+                        'errors per backend, run durations, queue depth, '
+                        'running solvers and outputter latencies) in the '
+                        'OpenMetrics text format on http://<host>:<port>/'
+                        'metrics while the runs are in progress.')
+
+    parser.add_argument('--metrics-file', dest='metrics_file',
+                        metavar='<output file>', type=creatable_file,
+                        help='Writes the metrics (see --metrics-port) to '
+                        '<output file> after each run, for example for the '
+                        'textfile collector of a Prometheus node exporter. '
+                        'This overwrites the contents of <output file>.')
+
     parser.add_argument('--minizinc-path', dest='driver_path', type=dir_path,
                         help='The path to the MiniZinc CLI.')
 
@@ -135,34 +457,194 @@ if __name__ == '__main__':
     #                     'matplotlib.')
 
     imported_test_creator = False
-    try:
-        from src.outputters.test_creator_outputter import TestCreatorOutputter
+    if find_spec('src.outputters.test_creator_outputter') is not None:
         parser.add_argument('--create-tests', dest='create_tests',
                             metavar='<output file>', type=creatable_file,
                             help='The file to write test JSON of the runs to; '
                             'this overwrites the contents of <output file>.')
         imported_test_creator = True
-    except ImportError:
-        pass
 
     with open(json_config_path, 'r') as json_file:
         config = load(json_file)
 
-    if 'driver_path' in config:
-        set_minizinc_driver_path(config['driver_path'])
-
+    # The epilog uses the cached solver catalog, so that --help does not
+    # need to import minizinc or ask the driver for its solvers
     if 'backends' in config:
-        _, backends = filter_minizinc_backends(config['backends'])
+        config_driver_path = config.get('driver_path', None)
+        _, backends = filter_minizinc_backends(config['backends'],
+                                               config_driver_path)
+        executable = get_minizinc_executable(config_driver_path)
         parser.epilog = ('The default backends of this script are: ' +
                          ', '.join((b_name for _, b_name in backends)) +
                          '. To list more information on all backends and ' +
                          'their underlying solving technologies, run ' +
-                         f'{minizinc.default_driver._executable} --solvers".')
+                         f'"{executable or "minizinc"} --solvers".')
 
     args = parser.parse_args()
 
+    # Only import the modules depending on minizinc once the arguments are
+    # parsed, as importing minizinc looks up the MiniZinc driver
+    from src.backend_runner import BackendRunner
+    from src.resource_limits import ResourceLimits
+    from src.outputters.outputter import Outputter
+    from src.outputters.log_outputter import LogOutputter
+    from src.outputters.tex_outputter import TexOutputter
+    from src.supervisor import get_supervisor, install_shutdown_hook
+
+    # Ctrl-C tears down the solver process groups, which run in their own
+    # sessions and therefore do not receive it from the terminal
+    install_shutdown_hook()
+
+    if 'driver_path' in config:
+        set_minizinc_driver_path(config['driver_path'])
+
+    campaign = None
+    if args.model.endswith('.json'):
+        if (args.params is not None or args.data_files is not None or
+                args.adaptive is not None or args.watch or
+                args.plan is not None or args.proof is not None or
+                args.train_selector is not None or args.select is not None or
+                args.generator is not None):
+            parser.error("a campaign cannot be combined with -r (--param), "
+                         "-d (--data), --adaptive, --watch, --plan, --proof, "
+                         "--train-selector, --select or --generator.")
+        from src.campaign import Campaign
+        try:
+            campaign = Campaign.load(args.model)
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot load the campaign {args.model}: {e}")
+        if (len(campaign.models) > 1 and args.json_output is not None and
+                '{model}' not in args.json_output):
+            parser.error("the --json-output of a campaign of several models "
+                         "requires a {model} placeholder.")
+
+    if args.adaptive is not None and args.params is None:
+        parser.error("--adaptive requires -r (--param).")
+
+    if args.kill_grace < 0:
+        parser.error("<seconds> of --kill-grace must not be negative.")
+    get_supervisor().grace_period = args.kill_grace
+
+    if args.generator is not None:
+        if (args.data_files is not None or args.adaptive is not None or
+                args.watch or args.plan is not None):
+            parser.error("--generator cannot be combined with -d (--data), "
+                         "--adaptive, --watch or --plan.")
+        if args.seeds < 1:
+            parser.error("the number of --seeds must be positive.")
+        if args.generator_workers < 1:
+            parser.error("the number of --generator-workers must be "
+                         "positive.")
+
+    if args.ladder_chunk < 1:
+        parser.error("the number of rows of --ladder-chunk must be "
+                     "positive.")
+
+    if args.retries < 0:
+        parser.error("the number of --retries must not be negative.")
+
+    if args.retry_backoff < 0:
+        parser.error("<seconds> of --retry-backoff must not be negative.")
+
+    if args.recalibrate and args.calibration is None:
+        parser.error("--recalibrate requires --calibration.")
+
+    if args.jobs < 1:
+        parser.error("the number of --jobs must be positive.")
+
+    if args.jobs > 1 and args.flatten_workers > 0:
+        parser.error("--jobs cannot be combined with --flatten-workers.")
+
+    if args.cores is not None and args.cores < 1:
+        parser.error("the number of --cores must be positive.")
+
+    if args.threads is not None and any(t <= 0 for t in args.threads):
+        parser.error("the numbers of --threads must be positive.")
+
+    bounds = None
+    if args.proof is not None:
+        if args.bounds is None:
+            parser.error("--proof requires --bounds.")
+        if args.threads is not None or args.select is not None:
+            parser.error("--proof cannot be combined with --threads or "
+                         "--select.")
+        from src.proof import Bounds, model_objective
+        objective = model_objective(args.model)
+        if objective is None:
+            parser.error("--proof requires a model that minimizes or "
+                         "maximizes an objective.")
+        bounds = Bounds(*objective)
+        for bounds_path in args.bounds:
+            try:
+                bounds.load(bounds_path)
+            except (OSError, ValueError, KeyError, AttributeError) as e:
+                parser.error(f"cannot load --bounds {bounds_path}: {e}")
+    elif args.bounds is not None:
+        parser.error("--bounds requires --proof.")
+
+    if args.race is not None:
+        if args.race <= 0:
+            parser.error("<block size> of --race must be positive.")
+        if args.adaptive is not None or args.timeout_ladder is not None:
+            parser.error("--race cannot be combined with --adaptive or "
+                         "--timeout-ladder.")
+
+    if args.watch:
+        if args.watch_interval <= 0:
+            parser.error("<seconds> of --watch-interval must be positive.")
+        if (args.adaptive is not None or args.race is not None or
+                args.timeout_ladder is not None or args.flatten_workers > 0
+                or args.train_selector is not None or args.lean):
+            parser.error("--watch cannot be combined with --adaptive, "
+                         "--race, --timeout-ladder, --flatten-workers, "
+                         "--train-selector or --lean.")
+        if imported_test_creator and args.create_tests is not None:
+            parser.error("--watch cannot be combined with --create-tests.")
+
+    if args.plan is not None:
+        if (args.adaptive is not None or args.race is not None or
+                args.watch or args.select is not None or
+                args.train_selector is not None):
+            parser.error("--plan cannot be combined with --adaptive, "
+                         "--race, --watch, --select or --train-selector.")
+        if args.plan_jobs is not None and any(j < 1 for j in args.plan_jobs):
+            parser.error("the numbers of --plan-jobs must be positive.")
+    elif args.plan_jobs is not None:
+        parser.error("--plan-jobs requires --plan.")
+
+    if args.select is not None:
+        if args.select <= 0:
+            parser.error("<k> of --select must be positive.")
+        if args.selector is None or args.train_selector is not None:
+            parser.error("--select requires a trained --selector.")
+
+    if args.train_selector is not None and args.selector is None:
+        parser.error("--train-selector requires --selector.")
+
+    if args.knn <= 0:
+        parser.error("<k> of --knn must be positive.")
+
+    selector = None
+    if args.select is not None:
+        from src.selector import Selector
+        try:
+            selector = Selector.load(args.selector)
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(f"cannot load --selector {args.selector}: {e}")
+
     if args.driver_path is not None:
         set_minizinc_driver_path(args.driver_path)
+    timeout_ladder = None
+    if args.timeout_ladder is not None:
+        if args.timeout is not None:
+            parser.error("--timeout-ladder is mutually exclusive with -t "
+                         "(--timeout).")
+        try:
+            timeout_ladder = [
+              StrToTimedelta.parse(t).total_seconds() * 1000
+              for t in args.timeout_ladder]
+        except ArgumentTypeError as e:
+            parser.error(e.args[0])
     if args.timeout is None:
         args.timeout = config.get('timeout', None)
     try:
@@ -174,46 +656,180 @@ if __name__ == '__main__':
 
     backend_config = config.get('backend_config', dict())
 
+    try:
+        limits = ResourceLimits.from_config(config.get('limits', dict()))
+        limits = limits.merge(ResourceLimits(args.memory_limit, args.cpus,
+                                             args.thread_limit))
+    except (TypeError, ValueError) as e:
+        parser.error(e.args[0])
+
+    calibration = None
+    if args.calibration is not None:
+        from src.calibration import calibrate
+        from src.faults import error_message
+        try:
+            calibration = calibrate(args.calibration,
+                                    recalibrate=args.recalibrate)
+        except Exception as e:
+            parser.error(f"cannot calibrate with {args.calibration}: "
+                         f"{error_message(e)}")
+
     outputters: List[Outputter] = [
       TexOutputter(no_header=args.no_header, tex_file_path=args.output),
       LogOutputter(logging.INFO if args.verbose else logging.WARNING,
-                   args.log_output)
+                   args.log_output, args.progress, args.progress_interval)
     ]
 
     if args.json_output is not None:
+        from src.outputters.json_outputter import JsonOutputter
         outputters.append(JsonOutputter(args.json_output))
 
+    if args.sqlite_output is not None:
+        from src.outputters.sqlite_outputter import SqliteOutputter
+        outputters.append(SqliteOutputter(args.sqlite_output, args.campaign,
+                                          backend_config))
+
+    if args.metrics_port is not None or args.metrics_file is not None:
+        from src.outputters.metrics_outputter import MetricsOutputter
+        outputters.append(MetricsOutputter(args.metrics_port,
+                                           args.metrics_file))
+
     if imported_test_creator and args.create_tests is not None:
+        from src.outputters.test_creator_outputter import TestCreatorOutputter
         outputters.append(TestCreatorOutputter(args.create_tests))
 
     # if args.plot_output is not None:
+    #     from src.outputters.plot_outputter import PlotOutputter
     #     outputters.append(PlotOutputter(args.plot_output))
 
-    backend_runner = BackendRunner(
-        args.model,
-        timeout.total_seconds() * 1000,
-        vars=args.vars,
-        backends=args.backends,
-        outputters=outputters,
-        extra=args.extra,
-        backend_config=backend_config)
-
-    if args.param is not None:
-        if any((not is_int(p) for p in args.param[1:])):
-            parser.error("<start>, <stop>, and <inc> must be integers.")
-
-        param_name = args.param[0]
-        start, stop, increment = tuple((int(p) for p in args.param[1:]))
-
-        if start < stop and increment <= 0:
-            parser.error(
-                f"the non-increasing param {param_name} is not lower bounded.")
-
-        if start > stop and increment >= 0:
-            parser.error(
-                f"the non-decreasing param {param_name} is not upper bounded.")
+    def runner(model, timeout_ms, backends, extra, **kwargs) -> BackendRunner:
+        return BackendRunner(
+          model,
+          timeout_ms,
+          vars=args.vars,
+          backends=backends,
+          outputters=outputters,
+          extra=extra,
+          backend_config=backend_config,
+          flatten_workers=args.flatten_workers,
+          time_source=args.time_source,
+          limits=limits,
+          timeout_ladder=timeout_ladder,
+          ladder_chunk=args.ladder_chunk,
+          race_block_size=0 if args.race is None else args.race,
+          race_alpha=args.race_alpha,
+          threads=args.threads,
+          jobs=args.jobs,
+          cores=args.cores,
+          selector=selector,
+          num_selected=0 if args.select is None else args.select,
+          lean=args.lean,
+          bounds=bounds,
+          proof_modes=args.proof,
+          on_error=args.on_error,
+          retries=args.retries,
+          retry_backoff=args.retry_backoff,
+          calibration=calibration,
+          **kwargs)
+
+    # A campaign runs the studies of its models one after another, each
+    # with its own tables and results
+    if campaign is not None:
+        for study in campaign.studies():
+            runner(study.model,
+                   timeout.total_seconds() * 1000 if study.timeout is None
+                   else study.timeout,
+                   study.backends or args.backends,
+                   args.extra if study.extra is None else study.extra,
+                   backend_timeouts=study.backend_timeouts,
+                   variants=study.variants,
+                   repetitions=study.repetitions).run_study(study)
+        exit(0)
+
+    backend_runner = runner(args.model, timeout.total_seconds() * 1000,
+                            args.backends, args.extra)
+
+    if args.train_selector is not None:
+        selector = backend_runner.train_selector(args.train_selector,
+                                                 args.knn)
+        selector.save(args.selector)
+        exit(0)
+
+    def watch(instances, param_names=None) -> None:
+        try:
+            backend_runner.watch(instances, param_names, args.watch_interval)
+        except KeyboardInterrupt:
+            pass
 
-        backend_runner.run_with_param(param_name, start, stop, increment)
+    def plan(instances, num_instances, param_names=None) -> None:
+        from src.planner import History
+        try:
+            history = History(args.plan)
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(f"cannot load the results of --plan: {e}")
+        backend_runner.plan(instances, num_instances, param_names, history,
+                            args.plan_jobs)
+
+    def generate(grid=None) -> None:
+        from src.generator import Generator, generator_points
+        module, _, function = args.generator.rpartition(':')
+        if module.endswith('.py'):
+            module = path.abspath(module)
+        cache_dir = (args.generator_cache or
+                     path.join(path.dirname(args.model), 'generated'))
+        try:
+            generator = Generator(f'{module}:{function}',
+                                  path.abspath(cache_dir),
+                                  args.generator_workers)
+        except (ImportError, OSError, SyntaxError, ValueError) as e:
+            parser.error(f"cannot load the --generator {args.generator}: "
+                         f"{e}")
+        params = [dict()] if grid is None else (dict(p) for p in grid)
+        num_instances = (1 if grid is None else len(grid)) * args.seeds
+        backend_runner.run_with_data_files(
+          generator.generate(generator_points(params,
+                                              list(range(args.seeds)))),
+          num_instances)
+
+    if args.params is not None:
+        param_ranges: List[ParamRange] = []
+        for param in args.params:
+            if any((not is_int(p) for p in param[1:])):
+                parser.error("<start>, <stop>, and <inc> must be integers.")
+
+            param_name = param[0]
+            start, stop, increment = tuple((int(p) for p in param[1:]))
+
+            if start < stop and increment <= 0:
+                parser.error(
+                  f"the non-increasing param {param_name} is not lower "
+                  "bounded.")
+
+            if start > stop and increment >= 0:
+                parser.error(
+                  f"the non-decreasing param {param_name} is not upper "
+                  "bounded.")
+
+            if any(r.name == param_name for r in param_ranges):
+                parser.error(f"the param {param_name} is given twice.")
+
+            param_ranges.append(ParamRange(param_name, start, stop, increment))
+
+        if args.adaptive is not None:
+            if len(param_ranges) != 1:
+                parser.error("--adaptive requires exactly one -r (--param).")
+            backend_runner.run_adaptive(param_ranges[0], args.adaptive,
+                                        args.budget, args.jump_factor)
+        elif args.watch:
+            grid = ParamGrid(param_ranges)
+            watch([(param, None) for param in grid], grid.names)
+        elif args.plan is not None:
+            grid = ParamGrid(param_ranges)
+            plan(((param, None) for param in grid), len(grid), grid.names)
+        elif args.generator is not None:
+            generate(ParamGrid(param_ranges))
+        else:
+            backend_runner.run_with_params(ParamGrid(param_ranges))
     elif args.data_files is not None:
         data_files = []
         seen_data_files = set()
@@ -223,6 +839,18 @@ if __name__ == '__main__':
                 continue
             data_files.append(data_file)
             seen_data_files.add(data_file)
-        backend_runner.run_with_data_files(data_files)
+        if args.watch:
+            watch([(None, data_file) for data_file in data_files])
+        elif args.plan is not None:
+            plan(((None, data_file) for data_file in data_files),
+                 len(data_files))
+        else:
+            backend_runner.run_with_data_files(data_files)
+    elif args.watch:
+        watch([(None, None)])
+    elif args.plan is not None:
+        plan([(None, None)], 1)
+    elif args.generator is not None:
+        generate()
     else:
         backend_runner.run()
@@ -0,0 +1,57 @@
+from typing import List, Dict, Union
+from .result import Result
+from .param_grid import ParamRange
+
+
+class AdaptiveSweep:
+    param_range: ParamRange = None
+    resolution: int = 1
+    jump_factor: float = 10.0
+    # The rows of the backends at each value, where a backend that did not
+    # run (for example one that --select skipped) is None
+    results: Dict[int, List[Union[None, Result]]] = {}
+
+    def __init__(self, param_range: ParamRange, resolution: int = 1,
+                 jump_factor: float = 10.0):
+        self.param_range = param_range
+        self.resolution = max(1, resolution)
+        self.jump_factor = jump_factor
+        self.results = dict()
+
+    @property
+    def values(self) -> List[int]:
+        return sorted(self.results.keys())
+
+    def coarse_values(self) -> List[int]:
+        return list(self.param_range.values)
+
+    def add(self, value: int, results: List[Union[None, Result]]) -> None:
+        self.results[value] = results
+
+    def changes(self, left: Union[None, Result],
+                right: Union[None, Result]) -> bool:
+        if left is None or right is None:
+            return False
+        if left.solved != right.solved:
+            return True
+        if not left.solved:
+            return False
+        fast, slow = sorted((left.time.total_seconds(),
+                             right.time.total_seconds()))
+        return slow >= self.jump_factor * max(fast, 0.001)
+
+    def next_values(self) -> List[int]:
+        values = self.values
+        next_values = []
+        for left, right in zip(values, values[1:]):
+            if right - left <= self.resolution:
+                continue
+            if any(self.changes(lr, rr) for lr, rr in
+                   zip(self.results[left], self.results[right])):
+                next_values.append((left + right) // 2)
+        return next_values
+
+    def frontier(self, backend_index: int) -> Union[None, int]:
+        return max((v for v, results in self.results.items()
+                    if results[backend_index] is not None and
+                    results[backend_index].solved), default=None)
@@ -1,8 +1,20 @@
-import minizinc
-from typing import List, Tuple, Set
+from typing import List, Tuple, Set, Union, Dict
+from os import environ, path, makedirs, replace, stat, getpid
+from shutil import which
+from json import load, dump
+from sys import modules
+
+# The solver catalog is cached per user, as listing the solvers makes the
+# MiniZinc driver parse the configuration of every installed solver
+SOLVER_CACHE_PATH = path.join(
+  environ.get('XDG_CACHE_HOME', path.join(path.expanduser('~'), '.cache')),
+  'run_backends', 'solvers.json')
+
+_minizinc_backends: Dict[str, List[Tuple[str, str]]] = {}
 
 
 def set_minizinc_driver_path(driver_path: str) -> None:
+    import minizinc
     try:
         if driver_path is not None and minizinc.default_driver is None:
             driver = minizinc.Driver.find([driver_path], name='minizinc')
@@ -12,7 +24,54 @@ def set_minizinc_driver_path(driver_path: str) -> None:
         driver.make_default()
 
 
-def get_minizinc_backends() -> List[str]:
+def get_minizinc_executable(
+        driver_path: Union[None, str] = None) -> Union[None, str]:
+    # Use the driver of minizinc when it is already imported, otherwise
+    # look the executable up the same way without importing minizinc
+    minizinc = modules.get('minizinc', None)
+    if minizinc is not None and minizinc.default_driver is not None:
+        return path.realpath(minizinc.default_driver._executable)
+    executable = which('minizinc')
+    if executable is None and driver_path is not None:
+        executable = which('minizinc', path=driver_path)
+    return None if executable is None else path.realpath(executable)
+
+
+def get_solver_cache_key(executable: str) -> List[Union[str, float]]:
+    return [path.realpath(executable), stat(executable).st_mtime,
+            environ.get('MZN_SOLVER_PATH', '')]
+
+
+def load_minizinc_backends(
+        executable: str,
+        cache_path: str = SOLVER_CACHE_PATH
+) -> Union[None, List[Tuple[str, str]]]:
+    try:
+        with open(cache_path, 'r') as cache_file:
+            cache = load(cache_file)
+        if cache['key'] != get_solver_cache_key(executable):
+            return None
+        return [(id, name) for id, name in cache['backends']]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_minizinc_backends(executable: str,
+                           backends: List[Tuple[str, str]],
+                           cache_path: str = SOLVER_CACHE_PATH) -> None:
+    tmp_cache_path = f'{cache_path}.{getpid()}.tmp'
+    try:
+        makedirs(path.dirname(cache_path), exist_ok=True)
+        with open(tmp_cache_path, 'w') as cache_file:
+            dump({'key': get_solver_cache_key(executable),
+                  'backends': backends}, cache_file)
+        replace(tmp_cache_path, cache_path)
+    except OSError:
+        pass
+
+
+def list_minizinc_backends() -> List[Tuple[str, str]]:
+    import minizinc
     available_backends = minizinc.default_driver.available_solvers()
     names = []
     for id, backends in available_backends.items():
@@ -34,12 +93,30 @@ def get_minizinc_backends() -> List[str]:
     return names
 
 
+def get_minizinc_backends(
+        driver_path: Union[None, str] = None) -> List[Tuple[str, str]]:
+    executable = get_minizinc_executable(driver_path)
+    if executable is None:
+        set_minizinc_driver_path(driver_path)
+        return list_minizinc_backends()
+    if executable not in _minizinc_backends:
+        backends = load_minizinc_backends(executable)
+        if backends is None:
+            set_minizinc_driver_path(driver_path)
+            backends = list_minizinc_backends()
+            save_minizinc_backends(executable, backends)
+        _minizinc_backends[executable] = backends
+    return _minizinc_backends[executable]
+
+
 def filter_minizinc_backends(
-        backends: List[str]) -> Tuple[Set[str], List[Tuple[str, str]]]:
+        backends: List[str],
+        driver_path: Union[None, str] = None
+) -> Tuple[Set[str], List[Tuple[str, str]]]:
 
     unique = set((b.lower() for b in backends))
     backends = []
-    for backend_id, backend_name in get_minizinc_backends():
+    for backend_id, backend_name in get_minizinc_backends(driver_path):
         if backend_name.lower() in unique or backend_id.lower() in unique:
             if backend_name.lower() in unique:
                 unique.remove(backend_name.lower())
@@ -47,3 +124,11 @@ def filter_minizinc_backends(
                 unique.remove(backend_id.lower())
             backends.append((backend_id, backend_name))
     return unique, backends
+
+
+def get_solver_version(backend_id: str) -> str:
+    import minizinc
+    try:
+        return minizinc.Solver.lookup(backend_id).version
+    except (LookupError, AttributeError, ValueError):
+        return ''
@@ -1,10 +1,43 @@
 import minizinc
 import logging
-from typing import List, Dict, Any, Union, Tuple
+from typing import List, Dict, Any, Union, Tuple, Iterable, Iterator, Deque, \
+  Set, AsyncIterator, Callable
+from asyncio import get_running_loop
 from datetime import timedelta
-from src.result import Result
+from time import perf_counter, monotonic
+from collections import deque
+from itertools import islice
+from concurrent.futures import Future, ThreadPoolExecutor, wait, \
+  FIRST_COMPLETED
+from os import sched_getaffinity
+from socket import gethostname
+from threading import Event
+from src.result import Result, best_result
 from src.outputters.outputter import Outputter
 from .aux import filter_minizinc_backends
+from .param_grid import ParamPoint, ParamRange, ParamGrid
+from .adaptive_sweep import AdaptiveSweep
+from .cell import Cell, RunRecord
+from .campaign import Study
+from .flattener import Flattener, FlatInstance, FlattenTimeout, \
+  solve_model
+from .resource_limits import ResourceLimits, LimitedDriver
+from .race import Race
+from .scaling import Scaling
+from .scheduler import CoreScheduler
+from .selector import Selector, load_campaign_costs
+from .planner import History, Plan, plan
+from .features import fzn_features, statistics_features
+from .search_stats import stat_names
+from .proof import Bounds, PROOF_MODES, model_objective
+from .faults import Backoff, Failure, FailedInstance, is_transient, \
+  retry_backoff, error_message, RETRY_BACKOFF
+from .calibration import Calibration
+from .watcher import Watcher, Cancelled, model_includes
+
+# The rows a timeout ladder runs with each of its timeouts before the next
+# rows, which reports rows while a long campaign runs
+LADDER_CHUNK = 256
 
 
 class BackendRunner:
@@ -13,21 +46,205 @@ class BackendRunner:
     timeout: int = 0
     vars: List[str] = []
     backends: List[Tuple[str, str]] = []
+    all_backends: List[Tuple[str, str]] = []
     outputters: List[Outputter] = []
     extra: Dict[str, str] = {}
+    flatten_workers: int = 0
+    timeout_ladder: List[int] = []
+    ladder_chunk: int = LADDER_CHUNK
+    race_block_size: int = 0
+    race_alpha: float = 0.05
+    thread_backends: Dict[str, Tuple[str, str, int]] = {}
+    # The virtual backends of the flag variants, as (backend id, flags)
+    variant_backends: Dict[str, Tuple[str, Dict[str, str]]] = {}
+    backend_timeouts: Dict[str, int] = {}
+    repetitions: int = 1
+    bounds: Union[None, Bounds] = None
+    # The virtual backends of a proof study, as (backend id, proof mode)
+    proof_backends: Dict[str, Tuple[str, str]] = {}
+    jobs: int = 1
+    cores: int = 1
+    selector: Union[None, Selector] = None
+    num_selected: int = 0
+    # Whether runs only decode the objective and vars of their last solution
+    lean: bool = False
+    # Whether a run that keeps failing ends the campaign ('abort') or is
+    # recorded as an ERR cell ('continue'), and how often it is retried
+    on_error: str = 'abort'
+    retries: int = 0
+    retry_backoff: float = RETRY_BACKOFF
+    _failures: List[Failure] = []
+    # The speed of this host relative to the reference host, which scales
+    # the timeouts of the runs and normalizes their times
+    calibration: Union[None, Calibration] = None
+    host: str = ''
+    _feature_flattener: Union[None, Flattener] = None
+    time_source: str = 'wall'
+    flattener: Union[None, Flattener] = None
+    limits: ResourceLimits = None
+    backend_limits: Dict[str, ResourceLimits] = {}
+    backend_stat_names: Dict[str, Dict[str, List[str]]] = {}
+    # The names of the backends by their ids
+    backend_names: Dict[str, str] = {}
+    _drivers: Dict[str, LimitedDriver] = {}
+    # The methods of the models of lean and flattened runs
+    _methods: Dict[str, minizinc.Method] = {}
+    _latency_outputters: List[Outputter] = []
+    _generated_intro: bool = False
+    # Set when the runs in flight are stale, for example by --watch
+    _cancel: Union[None, Event] = None
+
+    def get_thread_id(self, backend_id: str) -> str:
+        # The id of a virtual backend without its proof mode and variant
+        if backend_id in self.proof_backends:
+            backend_id = self.proof_backends[backend_id][0]
+        if backend_id in self.variant_backends:
+            backend_id = self.variant_backends[backend_id][0]
+        return backend_id
+
+    def get_backend_id(self, backend_id: str) -> str:
+        backend_id = self.get_thread_id(backend_id)
+        if backend_id not in self.thread_backends:
+            return backend_id
+        return self.thread_backends[backend_id][0]
 
     def get_extra(self, backend_id: str) -> Dict[str, str]:
-        return dict(self.backend_config.get(backend_id, {}).get('extra', {}),
-                    **self.extra)
+        extra = dict(self.backend_config.get(self.get_backend_id(backend_id),
+                                             {}).get('extra', {}),
+                     **self.extra)
+        if backend_id in self.proof_backends:
+            backend_id = self.proof_backends[backend_id][0]
+        if backend_id in self.variant_backends:
+            extra.update(self.variant_backends[backend_id][1])
+        if self.get_thread_id(backend_id) in self.thread_backends:
+            # The threads of a scaling study replace the configured ones
+            extra.pop('-p', None)
+            extra.pop('--parallel', None)
+        return extra
+
+    def get_limits(self, backend_id: str) -> ResourceLimits:
+        limits = self.limits
+        if self.get_backend_id(backend_id) in self.backend_limits:
+            limits = limits.merge(
+              self.backend_limits[self.get_backend_id(backend_id)])
+        if self.get_thread_id(backend_id) in self.thread_backends:
+            limits = limits.merge(ResourceLimits(
+              threads=self.thread_backends[self.get_thread_id(backend_id)][2]))
+        return limits
+
+    def get_timeout(self, backend_id: str) -> int:
+        return self.backend_timeouts.get(self.get_backend_id(backend_id),
+                                         self.timeout)
+
+    def get_ladder_timeout(self, backend_id: str, timeout: int) -> int:
+        # A backend with a timeout of its own scales the ladder, whose
+        # largest timeout becomes its timeout
+        return max(1, round(timeout * self.get_timeout(backend_id) /
+                            self.timeout))
+
+    def get_run_timeout(self, cell: Cell) -> int:
+        # The timeouts of cells are in the time of the reference host
+        if self.calibration is None:
+            return cell.timeout
+        return self.calibration.scale_timeout(cell.timeout)
+
+    def get_solve_flags(self, backend_id: str) -> Dict[str, str]:
+        flags = self.get_extra(backend_id)
+        threads = self.get_limits(backend_id).threads
+        if threads is not None and not ({'-p', '--parallel'} & flags.keys()):
+            flags['-p'] = str(threads)
+        return flags
+
+    def get_stat_names(self, backend_id: str) -> Dict[str, List[str]]:
+        backend_id = self.get_backend_id(backend_id)
+        if backend_id not in self.backend_stat_names:
+            self.backend_stat_names[backend_id] = stat_names(
+              backend_id,
+              self.backend_config.get(backend_id, {}).get('statistics', None),
+              self.backend_names.get(backend_id, ''))
+        return self.backend_stat_names[backend_id]
+
+    def get_constraint(self, backend_id: str,
+                       param: Union[None, ParamPoint],
+                       data_file: Union[None, str]) -> Union[None, str]:
+        if backend_id not in self.proof_backends:
+            return None
+        return self.bounds.constraint(param, data_file,
+                                      self.proof_backends[backend_id][1])
+
+    def beats_bound(self, backend_id: str) -> bool:
+        # Whether the runs of a backend are constrained to beat the best
+        # known objective
+        return (backend_id in self.proof_backends and
+                self.proof_backends[backend_id][1] == 'gap')
+
+    def get_threads(self, backend_id: str) -> int:
+        flags = self.get_solve_flags(backend_id)
+        threads = flags.get('-p', flags.get('--parallel', 1))
+        try:
+            return max(1, int(threads))
+        except ValueError:
+            return 1
 
     def __init__(self, model: Union[None, str], timeout: int,
                  vars: List[str] = [], backends: List[str] = None,
                  outputters: List[Outputter] = [],
                  extra: Dict[str, str] = {},
-                 backend_config: Dict[str, Dict[str, Any]] = {}):
+                 backend_config: Dict[str, Dict[str, Any]] = {},
+                 flatten_workers: int = 0,
+                 time_source: str = 'wall',
+                 limits: Union[None, ResourceLimits] = None,
+                 timeout_ladder: Union[None, List[int]] = None,
+                 race_block_size: int = 0,
+                 race_alpha: float = 0.05,
+                 threads: Union[None, List[int]] = None,
+                 jobs: int = 1,
+                 cores: Union[None, int] = None,
+                 selector: Union[None, Selector] = None,
+                 num_selected: int = 0,
+                 lean: bool = False,
+                 bounds: Union[None, Bounds] = None,
+                 proof_modes: Union[None, List[str]] = None,
+                 backend_timeouts: Union[None, Dict[str, int]] = None,
+                 variants: Union[None, Dict[str, str]] = None,
+                 repetitions: int = 1,
+                 on_error: str = 'abort',
+                 retries: int = 0,
+                 retry_backoff: float = RETRY_BACKOFF,
+                 calibration: Union[None, Calibration] = None,
+                 ladder_chunk: int = LADDER_CHUNK):
         self.logger = logging.getLogger('BackendRunner')
         self.model = model
-        self.timeout = timeout
+        self.timeout_ladder = sorted(timeout_ladder or [])
+        # The largest timeout of a ladder is the timeout of the final table
+        self.timeout = (timeout if len(self.timeout_ladder) == 0
+                        else self.timeout_ladder[-1])
+        self.ladder_chunk = max(1, ladder_chunk)
+        self.flatten_workers = flatten_workers
+        self.race_block_size = race_block_size
+        self.race_alpha = race_alpha
+        self.time_source = time_source
+        self.limits = ResourceLimits() if limits is None else limits
+        self.jobs = jobs
+        self.selector = selector
+        self.num_selected = num_selected
+        self.lean = lean
+        self.bounds = bounds
+        self.repetitions = max(1, repetitions)
+        self.on_error = on_error
+        self.retries = max(0, retries)
+        self.retry_backoff = retry_backoff
+        self._failures = []
+        self.calibration = calibration
+        self.host = (gethostname() if calibration is None
+                     else calibration.host)
+        if cores is None:
+            cores = len(self.limits.cpus if self.limits.cpus is not None
+                        else sched_getaffinity(0))
+        self.cores = cores
+        self._drivers = dict()
+        self._methods = dict()
+        self._cancel = Event()
         self.outputters = outputters
         self.vars = [] if vars is None else vars
         self.extra = self.parse_extra(extra)
@@ -38,12 +255,66 @@ class BackendRunner:
             exit(1)
 
         erronous_backends, self.backends = filter_minizinc_backends(backends)
+        self.backend_names = dict(self.backends)
 
         if len(erronous_backends) > 0:
             self.logger.error("Could not load the inputted backend(s): {" +
                               ', '.join(erronous_backends) + '}')
             exit(1)
 
+        # The timeouts of backends are given by their ids or names, like
+        # the backends themselves
+        timeouts = {b.lower(): t for b, t in (backend_timeouts or {}).items()}
+        self.backend_timeouts = {
+          b_id: timeouts.get(b_id.lower(), timeouts.get(b_name.lower()))
+          for b_id, b_name in self.backends
+          if b_id.lower() in timeouts or b_name.lower() in timeouts}
+
+        # A scaling study runs each backend as one virtual backend for each
+        # number of threads
+        self.thread_backends = dict()
+        if threads is not None and len(threads) > 0:
+            thread_backends = []
+            for b_id, b_name in self.backends:
+                for num_threads in sorted(set(threads)):
+                    thread_id = f'{b_id}@{num_threads}'
+                    self.thread_backends[thread_id] = (b_id, b_name,
+                                                       num_threads)
+                    thread_backends.append((thread_id,
+                                            f'{b_name} p={num_threads}'))
+            self.backends = thread_backends
+
+        # Flag variants run each backend once for each variant, with the
+        # flags of the variant added to its extra flags (an empty variant
+        # runs it as is)
+        self.variant_backends = dict()
+        if variants is not None and len(variants) > 0:
+            variant_backends = []
+            for b_id, b_name in self.backends:
+                for variant, flags in variants.items():
+                    self.variant_backends[f'{b_id}~{variant}'] = (
+                      b_id, self.parse_extra(flags))
+                    variant_backends.append((f'{b_id}~{variant}',
+                                             f'{b_name} {variant}'))
+            self.backends = variant_backends
+
+        # A proof study runs each backend once more for each proof mode,
+        # with its objective bounded by the best known one
+        self.proof_backends = dict()
+        if bounds is not None and proof_modes is not None:
+            proof_backends = []
+            for b_id, b_name in self.backends:
+                proof_backends.append((b_id, b_name))
+                for mode in (m for m in PROOF_MODES if m in proof_modes):
+                    self.proof_backends[f'{b_id}#{mode}'] = (b_id, mode)
+                    proof_backends.append((f'{b_id}#{mode}',
+                                           f'{b_name} {mode}'))
+            self.backends = proof_backends
+
+        # A race removes backends from self.backends, while the outputters
+        # keep a column for each of all_backends
+        self.all_backends = self.backends
+
     def parse_extra(self, extra: Union[None, str]) -> Dict[str, str]:
         if extra is None or len(extra) == 0:
             return {}
@@ -64,7 +335,16 @@ class BackendRunner:
 
     def parse_backend_config(self, backend_config: Dict[str, Dict[str, Any]]
                              ) -> Dict[str, Dict[str, Any]]:
-        for config in backend_config.values():
+        self.backend_limits = dict()
+        self.backend_stat_names = dict()
+        for backend_id, config in backend_config.items():
+            if 'limits' in config:
+                self.backend_limits[backend_id] = ResourceLimits.from_config(
+                  config['limits'])
+            if 'statistics' in config:
+                # Checked here, and looked up with the name of the backend
+                # by get_stat_names
+                stat_names(backend_id, config['statistics'])
             if 'extra' not in config:
                 continue
             for flag, val in config['extra'].items():
@@ -75,135 +355,973 @@ class BackendRunner:
                 config['extra'][flag] = str(val)
         return backend_config
 
-    def _get_instance(self, backend_id: str,
-                      data_file: Union[None, str] = None) -> minizinc.Instance:
+    @staticmethod
+    def _check_data_file(cell: Cell) -> None:
+        # Raises the error of an instance that could not be made, which
+        # --on-error decides on like a failure of minizinc
+        if isinstance(cell.data_file, FailedInstance):
+            raise cell.data_file.error
+
+    def _get_instance(self, cell: Cell) -> minizinc.Instance:
+        self._check_data_file(cell)
+        model = minizinc.Model(cell.model)
+
+        if cell.data_file is not None:
+            model.add_file(cell.data_file)
+
+        solver = minizinc.Solver.lookup(self.get_backend_id(cell.backend_id))
+        return minizinc.Instance(solver, model,
+                                 self._get_driver(cell.backend_id))
+
+    def _get_method(self, cell: Cell) -> minizinc.Method:
+        # Analysed once per model, as runs that do not solve an instance
+        # only need its method
+        self._check_data_file(cell)
+        if cell.model not in self._methods:
+            self._methods[cell.model] = self._get_instance(cell).method
+        return self._methods[cell.model]
+
+    def _get_instance_result(self, cell: Cell
+                             ) -> Tuple[Union[None, minizinc.Instance],
+                                        minizinc.Method, Union[None, Result]]:
+        # The instance of a cell and its method, or the ERR result of a
+        # failure to create it with --on-error continue. A lean run solves
+        # the model without an instance.
         try:
-            model = minizinc.Model(self.model)
+            if self.lean:
+                return None, self._get_method(cell), None
+            instance = self._get_instance(cell)
+            return instance, instance.method, None
+        except Exception as e:
+            return self._get_failed_instance_result(cell, e)
+
+    def _get_failed_instance_result(self, cell: Cell, e: Exception
+                                    ) -> Tuple[None, minizinc.Method, Result]:
+        if self.on_error == 'abort':
+            self._emit('exception', e)
+            exit(1)
+        # The method is read from the model, as minizinc could not
+        # analyse it
+        method = minizinc.Method.SATISFY
+        try:
+            objective = model_objective(cell.model)
+            if objective is not None:
+                method = minizinc.Method[objective[0].upper()]
+        except (OSError, UnicodeDecodeError):
+            pass
+        return None, method, self._get_error_result(cell, method, e, 1)
+
+    def _get_error_result(self, cell: Cell, method: minizinc.Method,
+                          e: Exception, attempts: int) -> Result:
+        return Result(method,
+                      minizinc.Result(minizinc.Status.ERROR, None, {}),
+                      '--all-solutions' in cell.flags, self.vars, None,
+                      self.time_source, error_message=error_message(e),
+                      attempts=attempts)
 
-            if data_file is not None:
-                model.add_file(data_file)
+    def _retry(self, cell: Cell, method: minizinc.Method,
+               attempt: Callable[[], Result], attempts: int = 0,
+               defer: bool = False) -> Result:
+        # Retries the transient failures of a run with exponential backoff.
+        # A run that keeps failing is raised, or with --on-error continue
+        # becomes an ERR result. A deferred run raises Backoff rather than
+        # sleeping, and is resubmitted with its attempts so far, while a
+        # run that is not deferred holds its job during the backoff.
+        while True:
+            attempts += 1
+            try:
+                result = attempt()
+                result.attempts = attempts
+                return result
+            except Exception as e:
+                if self._cancel.is_set():
+                    raise Cancelled() from e
+                if attempts > self.retries or not is_transient(e):
+                    if self.on_error == 'abort':
+                        raise
+                    return self._get_error_result(cell, method, e, attempts)
+                self.logger.warning(
+                  f'Retrying {cell.backend_name} on instance '
+                  f'{cell.instance_index + 1} after: ' +
+                  error_message(e).splitlines()[0])
+            delay = retry_backoff(attempts, self.retry_backoff)
+            if defer:
+                raise Backoff(attempts, delay)
+            if self._cancel.wait(delay):
+                raise Cancelled()
 
-            solver = minizinc.Solver.lookup(backend_id)
-            return minizinc.Instance(solver, model)
+    def _get_driver(self, backend_id: str) -> LimitedDriver:
+        # Every run goes through a LimitedDriver, which starts it in its own
+        # process group under the watchdog
+        if backend_id not in self._drivers:
+            self._drivers[backend_id] = LimitedDriver.from_driver(
+              minizinc.default_driver, self.get_limits(backend_id))
+        return self._drivers[backend_id]
+
+    def cancel(self) -> None:
+        self._cancel.set()
+        for driver in list(self._drivers.values()):
+            driver.kill()
+
+    def _get_mem_out_result(self, cell: Cell, method: minizinc.Method,
+                            e: Exception, start: float,
+                            returncode: Union[None, int] = None
+                            ) -> Union[None, Result]:
+        if not self.get_limits(cell.backend_id).is_out_of_memory(e,
+                                                                 returncode):
+            return None
+        return Result(method,
+                      minizinc.Result(minizinc.Status.UNKNOWN, None, {}),
+                      '--all-solutions' in cell.flags,
+                      self.vars, timedelta(seconds=perf_counter() - start),
+                      self.time_source, out_of_memory=True)
+
+    def _get_expired_result(self, cell: Cell, method: minizinc.Method,
+                            start: float) -> Union[None, Result]:
+        # A run the watchdog terminated for exceeding its timeout timed out
+        if not self._get_driver(cell.backend_id).expired():
+            return None
+        return Result(method,
+                      minizinc.Result(minizinc.Status.UNKNOWN, None, {}),
+                      '--all-solutions' in cell.flags,
+                      self.vars, timedelta(seconds=perf_counter() - start),
+                      self.time_source)
+
+    def _solve_with_retries(self, cell: Cell,
+                            instance: Union[None, minizinc.Instance],
+                            attempts: int = 0, defer: bool = False
+                            ) -> Result:
+        if instance is None:
+            method = self._get_method(cell)
+            return self._retry(cell, method,
+                               lambda: self._solve_lean(cell, method),
+                               attempts, defer)
+        # An instance keeps the params and the constraint of its solve, so
+        # that each retry solves a new one
+        instances = [instance]
+
+        def attempt() -> Result:
+            return self._solve(cell, instances.pop() if len(instances) > 0
+                               else self._get_instance(cell))
+        return self._retry(cell, instance.method, attempt, attempts, defer)
+
+    def _get_result(self, cell: Cell,
+                    instance: Union[None, minizinc.Instance]) -> Result:
+        try:
+            return self._solve_with_retries(cell, instance)
         except Exception as e:
-            for outputter in self.outputters:
-                outputter.exception(e)
+            if self._cancel.is_set():
+                raise Cancelled() from e
+            self._emit('exception', e)
             exit(1)
 
-    def _get_result(self, backend_id: str, instance: minizinc.Instance,
-                    param: Union[None, Tuple[str, int]] = None) -> Result:
+    def _solve_lean(self, cell: Cell, method: minizinc.Method) -> Result:
+        start = perf_counter()
+        try:
+            mzn_result = solve_model(
+              cell.model, self.get_backend_id(cell.backend_id), method,
+              dict(cell.flags), self.get_run_timeout(cell),
+              self.get_limits(cell.backend_id), cell.param, cell.data_file,
+              self.vars,
+              self.get_constraint(cell.backend_id, cell.param,
+                                  cell.data_file))
+            return Result(method, mzn_result, '--all-solutions' in cell.flags,
+                          self.vars,
+                          timedelta(seconds=perf_counter() - start),
+                          self.time_source,
+                          stat_names=self.get_stat_names(cell.backend_id),
+                          proof=self.beats_bound(cell.backend_id))
+        except Exception as e:
+            result = self._get_mem_out_result(cell, method, e, start)
+            if result is None:
+                raise
+            return result
+
+    def _solve(self, cell: Cell, instance: minizinc.Instance) -> Result:
+        start = perf_counter()
+        constraint = self.get_constraint(cell.backend_id, cell.param,
+                                         cell.data_file)
         try:
-            if isinstance(param, tuple):
-                instance[param[0]] = param[1]
-            kwargs = self.get_extra(backend_id)
+            if cell.param is not None:
+                for param_name, param_value in cell.param:
+                    instance[param_name] = param_value
+            if constraint is not None:
+                instance.add_string(constraint)
+            kwargs = dict(cell.flags)
             if '--all-solutions' in kwargs:
                 kwargs['all_solutions'] = kwargs.pop('--all-solutions')
-            kwargs['timeout'] = timedelta(milliseconds=self.timeout)
+            kwargs['timeout'] = timedelta(
+              milliseconds=self.get_run_timeout(cell))
             mzn_result = instance.solve(**kwargs)
+            wall_time = timedelta(seconds=perf_counter() - start)
             return Result(instance.method, mzn_result,
-                          '--all-solutions' in self.get_extra(backend_id),
-                          self.vars)
+                          '--all-solutions' in cell.flags,
+                          self.vars, wall_time, self.time_source,
+                          stat_names=self.get_stat_names(cell.backend_id),
+                          proof=self.beats_bound(cell.backend_id))
         except Exception as e:
+            # A run the watchdog killed timed out, and is not out of memory
+            result = (self._get_expired_result(cell, instance.method, start)
+                      or self._get_mem_out_result(
+                        cell, instance.method, e, start,
+                        self._get_driver(cell.backend_id).returncode()))
+            if result is None:
+                raise
+            return result
+
+    def _emit(self, callback: str, *args, **kwargs) -> None:
+        if len(self._latency_outputters) == 0:
             for outputter in self.outputters:
-                outputter.exception(e)
-            exit(1)
+                getattr(outputter, callback)(*args, **kwargs)
+            return
+        for outputter in self.outputters:
+            start = perf_counter()
+            getattr(outputter, callback)(*args, **kwargs)
+            latency = perf_counter() - start
+            for latency_outputter in self._latency_outputters:
+                latency_outputter.outputter_latency(
+                  type(outputter).__name__, callback, latency)
 
-    def _run_single(self, generate_intro: bool, backend_id: str,
-                    backend_name: str, backend_index: int, instance_index: int,
-                    num_instances: int,
-                    param: Union[None, Tuple[str, int]] = None,
-                    data_file: Union[None, str] = None) -> Result:
-        instance = self._get_instance(backend_id, data_file=data_file)
+    def _flatten(self, cell: Cell) -> FlatInstance:
+        # Flattened with the flags of the cell, which hold its threads and
+        # variant, within the timeout of its run. A failure becomes an ERR
+        # result with --on-error continue.
+        return self.flattener.flatten(
+          cell.model, self.get_backend_id(cell.backend_id),
+          self._get_method(cell), dict(cell.flags), cell.param,
+          cell.data_file,
+          self.get_constraint(cell.backend_id, cell.param, cell.data_file),
+          self.get_run_timeout(cell), self.vars if self.lean else None)
 
-        if generate_intro:
-            for outputter in self.outputters:
-                outputter.intro(
-                  self.backends, self.model, self.timeout,
-                  instance.method == minizinc.Method.SATISFY,
-                  self.vars,
-                  param[0] if param is not None else None,
-                  is_data_file_run=data_file is not None,
-                  extra_flags=self.extra)
+    def _get_flat_instance(self, cell: Cell, future: Future
+                           ) -> Tuple[Union[None, FlatInstance],
+                                      minizinc.Method, Union[None, Result]]:
+        try:
+            flat = future.result()
+            return flat, flat.method, None
+        except FlattenTimeout as e:
+            return None, e.method, Result(
+              e.method, minizinc.Result(minizinc.Status.UNKNOWN, None, {}),
+              '--all-solutions' in cell.flags, self.vars,
+              timedelta(milliseconds=self.get_run_timeout(cell)),
+              self.time_source)
+        except Exception as e:
+            return self._get_failed_instance_result(cell, e)
 
-        for outputter in self.outputters:
-            outputter.pre_run(
-              backend_id, backend_name, backend_index, len(self.backends),
-              instance_index, num_instances, param, data_file)
+    def _solve_flat(self, cell: Cell, flat: FlatInstance) -> Result:
+        start = perf_counter()
+        try:
+            mzn_result = self.flattener.solve(
+              flat, dict(cell.flags), self.get_run_timeout(cell),
+              self.get_limits(cell.backend_id),
+              self.vars if self.lean else None)
+            wall_time = timedelta(seconds=perf_counter() - start)
+            return Result(flat.method, mzn_result,
+                          '--all-solutions' in cell.flags, self.vars,
+                          wall_time, self.time_source,
+                          stat_names=self.get_stat_names(cell.backend_id),
+                          proof=self.beats_bound(cell.backend_id))
+        except Exception as e:
+            result = self._get_mem_out_result(cell, flat.method, e, start)
+            if result is None:
+                raise
+            return result
 
-        result = self._get_result(backend_id, instance, param=param)
+    def _get_flat_result(self, cell: Cell, flat: FlatInstance) -> Result:
+        try:
+            return self._retry(cell, flat.method,
+                               lambda: self._solve_flat(cell, flat))
+        except Cancelled:
+            raise
+        except Exception as e:
+            self._emit('exception', e)
+            exit(1)
+        finally:
+            flat.remove()
 
-        for outputter in self.outputters:
-            outputter.post_run(
-              backend_id, backend_name, backend_index, len(self.backends),
-              instance_index, num_instances, param, data_file, result)
+    def _run_single(self, cell: Cell,
+                    flat_future: Union[None, Future] = None) -> Result:
+        if self._cancel.is_set():
+            raise Cancelled()
+        if flat_future is None:
+            instance, method, result = self._get_instance_result(cell)
+        else:
+            flat, method, result = self._get_flat_instance(cell, flat_future)
+
+        self._pre_run(cell, method)
+
+        if result is None and flat_future is None:
+            result = self._get_result(cell, instance)
+        elif result is None:
+            result = self._get_flat_result(cell, flat)
+
+        # The result of a run killed by cancel is discarded
+        if self._cancel.is_set():
+            raise Cancelled()
+        self._post_run(cell, result)
 
         return result
 
-    def run(self) -> None:
+    def _pre_run(self, cell: Cell, method: minizinc.Method) -> None:
+        # The reruns of a cell by a timeout ladder are reported as one run
+        if not self._generated_intro:
+            self._generated_intro = True
+            self._emit('intro', self.all_backends, self.model, self.timeout,
+                       method == minizinc.Method.SATISFY, self.vars,
+                       cell.param_names,
+                       is_data_file_run=cell.data_file is not None,
+                       extra_flags=self.extra)
+            if self.calibration is not None:
+                self._emit('calibration', self.calibration.host,
+                           self.calibration.reference_host,
+                           self.calibration.speed_factor)
+
+        if cell.ladder_level is not None and cell.ladder_level > 0:
+            return
+        self._emit('pre_run', cell.backend_id, cell.backend_name,
+                   cell.backend_index, len(self.all_backends),
+                   cell.instance_index, cell.num_instances, cell.param,
+                   cell.data_file)
+
+    def _post_run(self, cell: Cell, result: Result) -> None:
+        result.host = self.host
+        result.timeout = cell.timeout
+        if self.calibration is not None:
+            result.speed_factor = self.calibration.speed_factor
+        if cell.ladder_level is None:
+            self._report_run(cell, result)
+
+    def _report_run(self, cell: Cell, result: Result) -> None:
+        if result.error_message is not None:
+            self._failures.append(Failure(
+              cell.backend_name, cell.instance_index, cell.param,
+              cell.data_file, result.attempts, result.error_message))
+        self._emit('post_run', cell.backend_id, cell.backend_name,
+                   cell.backend_index, len(self.all_backends),
+                   cell.instance_index, cell.num_instances, cell.param,
+                   cell.data_file, result)
+
+    def instance_features(self, param: Union[None, ParamPoint],
+                          data_file: Union[None, str],
+                          backend_id: str) -> Dict[str, float]:
+        if self._feature_flattener is None:
+            self._feature_flattener = Flattener(1)
+        flat = self._feature_flattener.flatten(
+          self.model, backend_id, None, self.get_extra(backend_id), param,
+          data_file)
+        try:
+            return dict(fzn_features(flat.fzn_path),
+                        **statistics_features(flat.statistics))
+        finally:
+            flat.remove()
+
+    def train_selector(self, json_paths: List[str], k: int = 5) -> Selector:
+        # The features of the instances of earlier campaigns are extracted
+        # by flattening them for the first backend
+        backend_id = self.get_backend_id(self.backends[0][0])
+        instances = []
+        for (param, data_file), costs in load_campaign_costs(
+              json_paths, self.timeout).items():
+            try:
+                features = self.instance_features(param, data_file,
+                                                  backend_id)
+            except Exception as e:
+                self._emit('exception', e)
+                exit(1)
+            instances.append((features, costs))
+        if self._feature_flattener is not None:
+            self._feature_flattener.shutdown()
+            self._feature_flattener = None
+        selector = Selector(instances, k, backend_id)
+        # Evaluated leave-one-out, selecting a single backend
+        self._emit('selector_summary', len(instances), selector.evaluate(1))
+        return selector
+
+    def _select_backends(self, instance_index: int,
+                         param: Union[None, ParamPoint],
+                         data_file: Union[None, str]) -> List[str]:
+        try:
+            features = self.instance_features(
+              param, data_file, self.selector.feature_backend_id)
+        except Exception as e:
+            self._emit('exception', e)
+            exit(1)
+        selected = self.selector.rank(
+          features, [b_name for _, b_name in self.backends]
+        )[:self.num_selected]
+        self._emit('backends_selected', instance_index, param, data_file,
+                   selected)
+        return selected
+
+    def _cells(self,
+               instances: Iterable[Tuple[Union[None, ParamPoint],
+                                         Union[None, str]]],
+               num_instances: int,
+               param_names: Union[None, Tuple[str, ...]] = None,
+               first_index: int = 0) -> Iterator[Cell]:
+        # The repetitions of an instance are consecutive rows
+        for index, (param, data_file) in enumerate(instances):
+            cells = self._instance_cells(
+              first_index + index * self.repetitions,
+              num_instances * self.repetitions, param_names, param,
+              data_file)
+            for repetition in range(self.repetitions):
+                for cell in cells:
+                    yield cell if repetition == 0 else cell.repeat(repetition)
+
+    def _instance_cells(self, instance_index: int, num_instances: int,
+                        param_names: Union[None, Tuple[str, ...]],
+                        param: Union[None, ParamPoint],
+                        data_file: Union[None, str]) -> List[Cell]:
+        # The cells of a row keep the index of their backend in
+        # all_backends, even when a race has eliminated other backends
+        # An instance without a best known objective has no proof runs
+        backends = [(b_index, b_id, b_name) for b_index, (b_id, b_name)
+                    in enumerate(self.all_backends)
+                    if (b_id, b_name) in self.backends and
+                    (b_id not in self.proof_backends or
+                     self.bounds.get(param, data_file) is not None)]
+        if self.selector is not None and self.num_selected > 0:
+            selected = self._select_backends(instance_index, param,
+                                             data_file)
+            backends = [b for b in backends if b[2] in selected]
+        return [Cell(instance_index, num_instances, param_names, param,
+                     data_file, b_index, b_id, b_name, len(backends),
+                     self.get_timeout(b_id), self.model,
+                     self.get_solve_flags(b_id))
+                for b_index, b_id, b_name in backends]
+
+    def _run_cells(self,
+                   cells: Iterable[Cell]) -> Iterator[Tuple[Cell, Result]]:
+        if self.jobs > 1:
+            yield from self._run_cells_parallel(cells)
+            return
+
+        if self.flatten_workers <= 0:
+            for cell in cells:
+                yield cell, self._run_single(cell)
+            return
+
+        # Flatten up to flatten_workers cells ahead of the one being solved
+        pending: Deque[Tuple[Cell, Future]] = deque()
+        self.flattener = Flattener(self.flatten_workers)
+        try:
+            for cell in cells:
+                pending.append((cell,
+                                self.flattener.submit(self._flatten, cell)))
+                if len(pending) > self.flatten_workers:
+                    cell, future = pending.popleft()
+                    yield cell, self._run_single(cell, future)
+            while len(pending) > 0:
+                cell, future = pending.popleft()
+                yield cell, self._run_single(cell, future)
+        finally:
+            for _, future in pending:
+                if not future.cancel() and future.exception() is None:
+                    future.result().remove()
+            self.flattener.shutdown()
+            self.flattener = None
+
+    def _run_cells_parallel(
+            self, cells: Iterable[Cell]) -> Iterator[Tuple[Cell, Result]]:
+        # Runs up to self.jobs cells at once without exceeding the core
+        # budget, while the results are still yielded in the order of the
+        # cells. No more cells are read than the scheduler admits, so that
+        # a slow cell only holds back a bounded number of finished ones.
+        # The outputters are only called from this thread. A cell that backs
+        # off before a retry waits outside of the jobs and cores, and then
+        # waits to be scheduled again.
+        scheduler = CoreScheduler(self.jobs, self.cores)
+        cells = iter(cells)
+        waiting: List[Tuple[int, Cell]] = []
+        running: Dict[Future, Tuple[int, Cell, int, float]] = dict()
+        finished: Dict[int, Tuple[Cell, Result]] = dict()
+        # (time of the retry, index, cell) of the cells backing off, and the
+        # attempts of the cells retried
+        backing_off: List[Tuple[float, int, Cell]] = []
+        attempts: Dict[int, int] = dict()
+        num_cells = 0
+        next_index = 0
+        exhausted = False
+        pool = ThreadPoolExecutor(self.jobs)
+        try:
+            while True:
+                now = monotonic()
+                if any(retry <= now for retry, _, _ in backing_off):
+                    waiting += [(i, c) for retry, i, c in backing_off
+                                if retry <= now]
+                    waiting.sort(key=lambda w: w[0])
+                    backing_off = [b for b in backing_off if b[0] > now]
+                for _ in range(scheduler.admit(len(waiting),
+                                               num_cells - next_index)):
+                    cell = next(cells, None)
+                    if cell is None:
+                        exhausted = True
+                        break
+                    waiting.append((num_cells, cell))
+                    num_cells += 1
+
+                now = monotonic()
+                selected = scheduler.select(
+                  [(scheduler.demand(self.get_threads(cell.backend_id)),
+                    self.get_run_timeout(cell) / 1000)
+                   for _, cell in waiting],
+                  [(cores, end) for _, _, cores, end in running.values()],
+                  now)
+                if self._cancel.is_set():
+                    raise Cancelled()
+                for index in selected:
+                    cell_index, cell = waiting[index]
+                    cores = scheduler.demand(self.get_threads(cell.backend_id))
+                    instance, method, result = self._get_instance_result(cell)
+                    if cell_index not in attempts:
+                        self._pre_run(cell, method)
+                    if result is not None:
+                        attempts.pop(cell_index, None)
+                        self._post_run(cell, result)
+                        finished[cell_index] = (cell, result)
+                        continue
+                    future = pool.submit(self._solve_with_retries, cell,
+                                         instance,
+                                         attempts.pop(cell_index, 0), True)
+                    running[future] = (cell_index, cell, cores,
+                                       now +
+                                       self.get_run_timeout(cell) / 1000)
+                selected = set(selected)
+                waiting = [w for i, w in enumerate(waiting)
+                           if i not in selected]
+
+                while next_index in finished:
+                    yield finished.pop(next_index)
+                    next_index += 1
+
+                # Waits for a run to finish or a cell to end its backoff
+                timeout = (None if len(backing_off) == 0 else
+                           max(0.0, min(b[0] for b in backing_off) -
+                               monotonic()))
+                if len(running) == 0:
+                    timeout = scheduler.idle_wait(
+                      len(waiting), num_cells - next_index, exhausted,
+                      timeout)
+                    if timeout is None:
+                        break
+                    if timeout > 0 and self._cancel.wait(timeout):
+                        raise Cancelled()
+                    continue
+                done, _ = wait(running, timeout, FIRST_COMPLETED)
+                for future in done:
+                    cell_index, cell, _, _ = running.pop(future)
+                    if self._cancel.is_set():
+                        raise Cancelled()
+                    try:
+                        result = future.result()
+                    except Backoff as e:
+                        attempts[cell_index] = e.attempts
+                        backing_off.append((monotonic() + e.delay,
+                                            cell_index, cell))
+                        continue
+                    except Exception as e:
+                        self._emit('exception', e)
+                        exit(1)
+                    self._post_run(cell, result)
+                    finished[cell_index] = (cell, result)
+        finally:
+            if self._cancel.is_set():
+                self.cancel()
+            pool.shutdown(cancel_futures=True)
+
+    def _run_rows(self, cells: Iterable[Cell]
+                  ) -> Iterator[Tuple[List[Cell], List[Result]]]:
+        if len(self.timeout_ladder) > 0:
+            yield from self._run_ladder_rows(cells)
+            return
+        row_cells: List[Cell] = []
         results: List[Result] = []
+        for cell, result in self._run_cells(cells):
+            row_cells.append(cell)
+            results.append(result)
+            if len(results) < cell.num_backends:
+                continue
+            yield self._row(row_cells, results)
+            row_cells, results = [], []
 
-        for outputter in self.outputters:
-            outputter.set_up(None)
+    def _row(self, row_cells: List[Cell], results: List[Result]
+             ) -> Tuple[List[Cell], List[Union[None, Result]]]:
+        # Rows have a result for each of all_backends, which is None for
+        # the backends eliminated by a race
+        row: List[Union[None, Result]] = [None] * len(self.all_backends)
+        for cell, result in zip(row_cells, results):
+            row[cell.backend_index] = result
+        self._emit('instance', row, row_cells[0].param,
+                   row_cells[0].data_file, row_cells[0].instance_index)
+        return row_cells, row
 
-        for b_index, (b_id, b_name) in enumerate(self.backends):
-            results.append(self._run_single(b_index == 0, b_id,
-                                            b_name, b_index, 0, 1))
+    def _ladder_chunks(self, cells: Iterable[Cell],
+                       jobs: int) -> Iterator[List[Cell]]:
+        # The cells of ladder_chunk rows at a time, at least one per job
+        cells = iter(cells)
+        while True:
+            chunk: List[Cell] = []
+            for _ in range(max(self.ladder_chunk, jobs)):
+                cell = next(cells, None)
+                if cell is None:
+                    break
+                chunk += [cell] + list(islice(cells, cell.num_backends - 1))
+            if len(chunk) == 0:
+                return
+            yield chunk
 
-        for outputter in self.outputters:
-            outputter.instance(results, None, None)
+    def _run_ladder_rows(self, cells: Iterable[Cell]
+                         ) -> Iterator[Tuple[List[Cell], List[Result]]]:
+        # The cells are laddered a chunk of rows at a time, so that rows are
+        # reported while the campaign runs. Every cell of a chunk is run
+        # with the smallest timeout first, and only the cells that timed out
+        # are rerun with the next timeout of the ladder. A cell is reported
+        # once, with its best result, when it reached its last level.
+        last_level = len(self.timeout_ladder) - 1
+        for chunk in self._ladder_chunks(cells, self.jobs):
+            results: List[List[Result]] = [[] for _ in chunk]
+            pending = list(range(len(chunk)))
+            for level, timeout in enumerate(self.timeout_ladder):
+                if len(pending) == 0:
+                    break
+                self._emit('timeout_level', level, len(self.timeout_ladder),
+                           timeout, len(pending))
+                for cell_index in pending:
+                    cell = chunk[cell_index]
+                    cell.timeout = self.get_ladder_timeout(cell.backend_id,
+                                                           timeout)
+                    cell.ladder_level = level
+                for cell_index, (_, result) in zip(
+                      pending, self._run_cells(chunk[i] for i in pending)):
+                    results[cell_index].append(result)
+                # A failed run is not rerun with a larger timeout
+                rerun = [i for i in pending if level < last_level and
+                         results[i][-1].timed_out and
+                         not results[i][-1].error]
+                for cell_index in pending:
+                    if cell_index not in rerun:
+                        self._report_run(chunk[cell_index],
+                                         best_result(results[cell_index]))
+                pending = rerun
 
-        for outputter in self.outputters:
-            outputter.outro()
+            best = [best_result(r) for r in results]
+            start = 0
+            while start < len(chunk):
+                end = start + chunk[start].num_backends
+                yield self._row(chunk[start:end], best[start:end])
+                start = end
 
-        for outputter in self.outputters:
-            outputter.tear_down()
+    def _set_up(self, param_names: Union[None, Tuple[str, ...]]) -> None:
+        self._generated_intro = False
+        self._failures = []
+        self._latency_outputters = [
+          outputter for outputter in self.outputters
+          if (type(outputter).outputter_latency is not
+              Outputter.outputter_latency)]
+        self._emit('set_up', param_names)
+
+    def _tear_down(self) -> None:
+        if self._feature_flattener is not None:
+            self._feature_flattener.shutdown()
+            self._feature_flattener = None
+        if len(self._failures) > 0:
+            self._emit('failure_summary', self._failures)
+        self._emit('outro')
+        self._emit('tear_down')
+
+    def run(self) -> None:
+        self._run_instances([(None, None)], 1)
 
     def run_with_param(self, param_name, start, stop, increment) -> None:
-        increment = 1 if start == stop else increment
-        stop = (stop - 1) if increment < 0 else (stop + 1)
+        self.run_with_params(
+          ParamGrid([ParamRange(param_name, start, stop, increment)]))
 
-        for outputter in self.outputters:
-            outputter.set_up(param_name)
-
-        values = list(range(start, stop, increment))
-        for instance_index, param_value in enumerate(values):
-            param = (param_name, param_value)
-            results: List[Result] = []
-            for b_index, (b_id, b_name) in enumerate(self.backends):
-                results.append(self._run_single(
-                  instance_index == 0 and b_index == 0,
-                  b_id, b_name, b_index, instance_index, len(values),
-                  param=param))
-
-            if len(results) == 0:
-                continue
+    def run_with_params(self, grid: ParamGrid) -> None:
+        self._run_instances(((param, None) for param in grid), len(grid),
+                            grid.names)
 
-            for outputter in self.outputters:
-                outputter.instance(results, param, None)
+    def run_adaptive(self, param_range: ParamRange, resolution: int = 1,
+                     budget: Union[None, int] = None,
+                     jump_factor: float = 10.0) -> None:
+        sweep = AdaptiveSweep(param_range, resolution, jump_factor)
+        param_names = (param_range.name, )
+        num_runs = 0
 
-        for outputter in self.outputters:
-            outputter.outro()
+        self._set_up(param_names)
 
-    def run_with_data_files(self, data_files) -> None:
-        for outputter in self.outputters:
-            outputter.set_up(None)
+        values = sweep.coarse_values()
+        while len(values) > 0:
+            if budget is not None:
+                values = values[:max(0, (budget - num_runs) //
+                                     max(1, len(self.backends)))]
+            instances = ((((param_range.name, value), ), None)
+                         for value in values)
+            for cells, results in self._run_rows(self._cells(
+                  instances, 0, param_names, len(sweep.results))):
+                sweep.add(cells[0].param[0][1], results)
+                num_runs += len(results)
+            values = sweep.next_values()
 
-        for instance_index, data_file in enumerate(data_files):
-            results: List[Result] = []
-            for b_index, (b_id, b_name) in enumerate(self.backends):
-                results.append(self._run_single(
-                  instance_index == 0 and b_index == 0,
-                  b_id, b_name, b_index, instance_index, len(data_files),
-                  data_file=data_file))
+        frontiers = [(b_name, sweep.frontier(b_index))
+                     for b_index, (_, b_name) in enumerate(self.all_backends)]
+        self._emit('sweep_summary', param_range.name, frontiers, num_runs)
 
-            if len(results) == 0:
-                continue
+        self._tear_down()
 
-            for outputter in self.outputters:
-                outputter.instance(results, None, data_file)
+    def run_with_data_files(self, data_files: Iterable[str],
+                            num_instances: Union[None, int] = None) -> None:
+        # The data files can be a stream, such as generated instances, of
+        # num_instances files (0 if unknown)
+        if num_instances is None:
+            num_instances = len(data_files)
+        self._run_instances(((None, data_file) for data_file in data_files),
+                            num_instances)
 
-        for outputter in self.outputters:
-            outputter.outro()
+    def run_study(self, study: Study) -> None:
+        # The instances of a study are expanded while its cells are run
+        self._run_instances(study.instances(), study.num_instances,
+                            study.param_names)
 
-        for outputter in self.outputters:
-            outputter.tear_down()
+    def plan(self,
+             instances: Iterable[Tuple[Union[None, ParamPoint],
+                                       Union[None, str]]],
+             num_instances: int,
+             param_names: Union[None, Tuple[str, ...]] = None,
+             history: Union[None, History] = None,
+             jobs: Union[None, List[int]] = None,
+             num_simulations: int = 20) -> List[Plan]:
+        # Expands the cells without solving them, and simulates their
+        # scheduling with runtimes drawn from the history, once for each
+        # number of jobs (defaulting to self.jobs)
+        history = History() if history is None else history
+        scheduler = CoreScheduler(self.jobs, self.cores)
+        expanded = list(self._cells(instances, num_instances, param_names))
+        cells = []
+        num_unseen = 0
+        for cell in expanded:
+            runtimes, seen = history.estimate(cell.param, cell.data_file,
+                                              cell.backend_name)
+            cells.append((scheduler.demand(self.get_threads(cell.backend_id)),
+                          runtimes))
+            num_unseen += not seen
+        # The ladder, or the timeout, is scaled to the timeouts of the
+        # backends, and a ladder runs its chunks one after another
+        timeouts = [t / 1000 for t in (self.timeout_ladder or
+                                       [self.timeout])]
+        cell_timeouts = [c.timeout / 1000 for c in expanded]
+        plans = []
+        for num_jobs in (jobs or [self.jobs]):
+            chunk_sizes = None
+            if len(self.timeout_ladder) > 0:
+                chunk_sizes = [len(chunk) for chunk in
+                               self._ladder_chunks(expanded, num_jobs)]
+            plans.append(plan(cells, num_unseen, timeouts, num_jobs,
+                              self.cores, num_simulations,
+                              cell_timeouts=cell_timeouts,
+                              chunk_sizes=chunk_sizes))
+        self._emit('plan_summary', plans)
+        return plans
+
+    def _run_instances(
+            self,
+            instances: Iterable[Tuple[Union[None, ParamPoint],
+                                      Union[None, str]]],
+            num_instances: int,
+            param_names: Union[None, Tuple[str, ...]] = None) -> None:
+        for _ in self._iter_rows(instances, num_instances, param_names):
+            pass
+
+    def iter_results(
+            self,
+            instances: Iterable[Tuple[Union[None, ParamPoint],
+                                      Union[None, str]]] = ((None, None), ),
+            num_instances: int = 1,
+            param_names: Union[None, Tuple[str, ...]] = None
+    ) -> Iterator[RunRecord]:
+        # Yields a record of each run, row by row in the order of the
+        # instances, while the outputters are still called. Cells are only
+        # started when the next record is asked for (up to --jobs runs and
+        # the scheduler lookahead ahead), so a slow consumer holds back the
+        # runs. Closing the iterator cancels the runs in flight, and
+        # runner.cancel() from another thread ends it.
+        rows = self._iter_rows(instances, num_instances, param_names)
+        try:
+            for cells, results in rows:
+                for cell in cells:
+                    yield RunRecord.from_cell(cell,
+                                              results[cell.backend_index])
+        except Cancelled:
+            return
+        except GeneratorExit:
+            self.cancel()
+            raise
+        finally:
+            rows.close()
+
+    async def aiter_results(
+            self,
+            instances: Iterable[Tuple[Union[None, ParamPoint],
+                                      Union[None, str]]] = ((None, None), ),
+            num_instances: int = 1,
+            param_names: Union[None, Tuple[str, ...]] = None
+    ) -> AsyncIterator[RunRecord]:
+        # iter_results driven from a single worker thread, so that the
+        # event loop is not blocked by the runs. Cancelling the consuming
+        # task or closing the iterator cancels the runs in flight.
+        loop = get_running_loop()
+        executor = ThreadPoolExecutor(1, thread_name_prefix='results')
+        records = self.iter_results(instances, num_instances, param_names)
+        exhausted = False
+        try:
+            while True:
+                record = await loop.run_in_executor(executor, next, records,
+                                                    None)
+                if record is None:
+                    exhausted = True
+                    break
+                yield record
+        finally:
+            if not exhausted:
+                self.cancel()
+            await loop.run_in_executor(executor, records.close)
+            executor.shutdown()
+
+    def _iter_rows(
+            self,
+            instances: Iterable[Tuple[Union[None, ParamPoint],
+                                      Union[None, str]]],
+            num_instances: int,
+            param_names: Union[None, Tuple[str, ...]] = None
+    ) -> Iterator[Tuple[List[Cell], List[Union[None, Result]]]]:
+        self._cancel.clear()
+        self._set_up(param_names)
+
+        race = None
+        if self.race_block_size > 0:
+            race = Race(len(self.all_backends), self.race_block_size,
+                        self.race_alpha)
+        scaling = None
+        if len(self.thread_backends) > 0:
+            # The flag variants of a backend scale separately
+            thread_backends = dict()
+            for b_id, _ in self.all_backends:
+                real_id, real_name, threads = self.thread_backends[
+                  self.get_thread_id(b_id)]
+                if b_id in self.variant_backends:
+                    real_name = f'{real_name} {b_id.partition("~")[2]}'
+                thread_backends[b_id] = (real_id, real_name, threads)
+            scaling = Scaling(self.all_backends, thread_backends)
+
+        try:
+            for cells, results in self._run_rows(self._cells(
+                  instances, num_instances, param_names)):
+                if scaling is not None:
+                    self._emit('scaling_instance', scaling.add(results),
+                               cells[0].param, cells[0].data_file)
+                if race is not None:
+                    for elimination in race.add(results):
+                        self._emit(
+                          'backend_eliminated',
+                          self.all_backends[elimination.backend_index][1],
+                          cells[0].instance_index, elimination.num_instances,
+                          elimination.mean_rank,
+                          self.all_backends[elimination.best_backend_index][1],
+                          elimination.best_mean_rank, elimination.p_value)
+                    self.backends = [self.all_backends[i] for i in race.alive]
+                yield cells, results
+        except (GeneratorExit, Cancelled):
+            # A closed or cancelled stream still completes the outputs of
+            # the rows it ran
+            self.backends = self.all_backends
+            self._tear_down()
+            raise
+
+        self.backends = self.all_backends
+        if scaling is not None:
+            self._emit('scaling_summary', scaling.summary())
+        self._tear_down()
+
+    def watch(self,
+              instances: List[Tuple[Union[None, ParamPoint],
+                                    Union[None, str]]],
+              param_names: Union[None, Tuple[str, ...]] = None,
+              interval: float = 0.5) -> None:
+        # Runs all cells, and then reruns the instances affected by each
+        # change of the model, its includes or the data files until
+        # interrupted. An edit during a rerun cancels the runs in flight.
+        includes = model_includes(self.model)
+        data_files = set(d for _, d in instances if d is not None)
+        watcher = Watcher([self.model] + includes + sorted(data_files),
+                          interval, self.cancel)
+        rows: Dict[int, List[Union[None, Result]]] = dict()
+        times: Dict[int, float] = dict()
+        dirty = set(range(len(instances)))
+        changes: List[str] = []
+        try:
+            while True:
+                self._cancel.clear()
+                try:
+                    self._watch_round(instances, param_names, dirty, rows,
+                                      times, changes)
+                except Cancelled:
+                    pass
+                changes = sorted(watcher.wait())
+                if any(c not in data_files for c in changes):
+                    # The model or an include changed, which may have
+                    # changed the includes as well
+                    dirty = set(range(len(instances)))
+                    includes = model_includes(self.model)
+                    watcher.watch(includes)
+                else:
+                    dirty |= set(i for i, (_, d) in enumerate(instances)
+                                 if d in changes)
+        finally:
+            watcher.stop()
+            self.cancel()
+
+    def _watch_round(self,
+                     instances: List[Tuple[Union[None, ParamPoint],
+                                           Union[None, str]]],
+                     param_names: Union[None, Tuple[str, ...]],
+                     dirty: Set[int],
+                     rows: Dict[int, List[Union[None, Result]]],
+                     times: Dict[int, float], changes: List[str]) -> None:
+        # The instances that were fastest to solve or disprove are rerun
+        # first, followed by the ones that were never run, and the ones
+        # that no backend finished
+        order = sorted(dirty, key=lambda i: (0, times[i]) if i in times
+                       else (1, 0) if i not in rows else (2, 0))
+        if len(order) == 0:
+            return
+        self._set_up(param_names)
+        try:
+            if len(changes) > 0:
+                self._emit('files_changed', changes, len(order))
+            cells = (cell for i in order for cell in self._instance_cells(
+                       i, len(instances), param_names, *instances[i]))
+            row: List[Union[None, Result]] = [None] * len(self.all_backends)
+            num_results = 0
+            for cell, result in self._run_cells(cells):
+                row[cell.backend_index] = result
+                num_results += 1
+                if num_results < cell.num_backends:
+                    continue
+                rows[cell.instance_index] = row
+                dirty.discard(cell.instance_index)
+                finished = [r.time.total_seconds() for r in row
+                            if r is not None and (r.solved or r.unsat)]
+                if len(finished) > 0:
+                    times[cell.instance_index] = min(finished)
+                else:
+                    times.pop(cell.instance_index, None)
+                row = [None] * len(self.all_backends)
+                num_results = 0
+            # The table has the rows of all instances in their order, with
+            # the results of the previous runs of the unaffected instances
+            for instance_index, (param, data_file) in enumerate(instances):
+                if instance_index in rows:
+                    self._emit('instance', rows[instance_index], param,
+                               data_file, instance_index)
+        finally:
+            self._tear_down()
@@ -0,0 +1,134 @@
+import minizinc
+from typing import Dict, Any, Union, List
+from datetime import datetime, timedelta
+from json import load, dump
+from fcntl import flock, LOCK_EX, LOCK_UN
+from os import path, replace, getpid
+from socket import gethostname
+from statistics import median
+from time import perf_counter
+
+# The reference workload, a Golomb ruler that keeps a CP solver busy for a
+# few seconds, so that the startup of minizinc is small against it
+REFERENCE_MODEL = '''
+include "alldifferent.mzn";
+int: m = 10;
+int: n = m * m;
+array[1..m] of var 0..n: mark;
+array[1..(m * (m - 1)) div 2] of var 1..n: diffs =
+  [mark[j] - mark[i] | i in 1..m, j in i + 1..m];
+constraint mark[1] = 0;
+constraint forall(i in 1..m - 1)(mark[i] < mark[i + 1]);
+constraint alldifferent(diffs);
+constraint diffs[1] < diffs[(m * (m - 1)) div 2];
+solve minimize mark[m];
+'''
+REFERENCE_BACKEND = 'gecode'
+CALIBRATION_RUNS = 3
+# Seconds a run of the reference workload may take, many times its few
+# seconds, so that a broken or overloaded host fails instead of hanging
+CALIBRATION_TIMEOUT = 120.0
+
+
+def measure(backend: str = REFERENCE_BACKEND,
+            runs: int = CALIBRATION_RUNS,
+            timeout: float = CALIBRATION_TIMEOUT) -> float:
+    # The median wall time in seconds of the reference workload on this
+    # host
+    solver = minizinc.Solver.lookup(backend)
+    times: List[float] = []
+    for _ in range(runs):
+        model = minizinc.Model()
+        model.add_string(REFERENCE_MODEL)
+        instance = minizinc.Instance(solver, model)
+        start = perf_counter()
+        result = instance.solve(timeout=timedelta(seconds=timeout))
+        times.append(perf_counter() - start)
+        if result.status != minizinc.Status.OPTIMAL_SOLUTION:
+            raise RuntimeError(f'{backend} did not solve the reference '
+                               f'workload within {timeout:g}s: '
+                               f'{result.status}')
+    return median(times)
+
+
+class Calibration:
+    host: str = ''
+    reference_host: str = ''
+    time: float = 0.0
+    reference_time: float = 0.0
+
+    def __init__(self, host: str, reference_host: str, time: float,
+                 reference_time: float):
+        self.host = host
+        self.reference_host = reference_host
+        self.time = time
+        self.reference_time = reference_time
+
+    @property
+    def speed_factor(self) -> float:
+        # Above 1 on a host faster than the reference host
+        return self.reference_time / self.time
+
+    def scale_timeout(self, timeout: int) -> int:
+        # The timeout of this host that allows as much work as the given
+        # one on the reference host
+        return max(1, round(timeout / self.speed_factor))
+
+
+def read_calibrations(calibration_path: str) -> Dict[str, Any]:
+    if not path.isfile(calibration_path):
+        return {'reference': None, 'backend': None, 'hosts': dict()}
+    with open(calibration_path, 'r') as calibration_file:
+        calibrations = load(calibration_file)
+    if not isinstance(calibrations, dict) or \
+            not isinstance(calibrations.get('hosts', None), dict):
+        raise ValueError(f'{calibration_path} is not a calibration file')
+    return calibrations
+
+
+def check_backend(calibrations: Dict[str, Any], calibration_path: str,
+                  backend: str) -> None:
+    if calibrations['backend'] not in (None, backend):
+        raise ValueError(f'{calibration_path} was calibrated with '
+                         f'{calibrations["backend"]}, not {backend}')
+
+
+def calibrate(calibration_path: str, backend: str = REFERENCE_BACKEND,
+              host: Union[None, str] = None,
+              recalibrate: bool = False) -> Calibration:
+    # The file keeps the time of the reference workload on each host, and is
+    # shared by the hosts of a campaign. The first host calibrated is the
+    # reference host, whose times the times of all hosts are normalized to.
+    host = gethostname() if host is None else host
+    calibrations = read_calibrations(calibration_path)
+    check_backend(calibrations, calibration_path, backend)
+    if recalibrate or host not in calibrations['hosts']:
+        time = measure(backend)
+        # Read again under a lock, as other hosts may have calibrated in the
+        # meantime, and the reference host is the one in the file written
+        with open(f'{calibration_path}.lock', 'w') as lock_file:
+            flock(lock_file, LOCK_EX)
+            try:
+                calibrations = read_calibrations(calibration_path)
+                check_backend(calibrations, calibration_path, backend)
+                calibrations['backend'] = backend
+                calibrations['hosts'][host] = {
+                  'time': time,
+                  'calibrated': datetime.now().isoformat(timespec='seconds')}
+                if calibrations['reference'] is None:
+                    calibrations['reference'] = host
+                # Written under a temporary name first, so that the other
+                # hosts never read a partial file
+                tmp_path = f'{calibration_path}.{getpid()}.tmp'
+                with open(tmp_path, 'w') as tmp_file:
+                    dump(calibrations, tmp_file, indent=2, sort_keys=True)
+                replace(tmp_path, calibration_path)
+            finally:
+                flock(lock_file, LOCK_UN)
+    reference = calibrations['reference']
+    if reference not in calibrations['hosts']:
+        raise ValueError(f'the reference host {reference} of '
+                         f'{calibration_path} is not calibrated')
+    return Calibration(host, reference,
+                       calibrations['hosts'][host]['time'],
+                       calibrations['hosts'][reference]['time'])
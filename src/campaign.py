@@ -0,0 +1,204 @@
+from typing import List, Dict, Tuple, Union, Iterator, Any
+from argparse import ArgumentTypeError
+from glob import iglob
+from json import load
+from os import path
+from .param_grid import ParamPoint, ParamRange, ParamGrid
+from .str_to_timedelta import StrToTimedelta
+
+# The keys of a campaign spec, which a model of it may override
+STUDY_KEYS = ('timeout', 'timeouts', 'backends', 'variants', 'extra',
+              'repetitions')
+MODEL_KEYS = ('model', 'data', 'params') + STUDY_KEYS
+
+Instance = Tuple[Union[None, ParamPoint], Union[None, str]]
+
+
+def to_ms(time: Any, key: str) -> int:
+    try:
+        ms = int(StrToTimedelta.parse(time).total_seconds() * 1000)
+    except (ArgumentTypeError, ValueError, TypeError):
+        ms = 0
+    if ms <= 0:
+        raise ValueError(f'"{key}" is not a timeout: {time!r}')
+    return ms
+
+
+def check_strings(value: Any, key: str) -> List[str]:
+    if not isinstance(value, list) or len(value) == 0 or \
+            not all(isinstance(v, str) for v in value):
+        raise ValueError(f'"{key}" must be a non-empty list of strings')
+    return value
+
+
+class Study:
+    model: str = ''
+    data: Union[None, List[str]] = None
+    grid: Union[None, ParamGrid] = None
+    timeout: Union[None, int] = None
+    backend_timeouts: Dict[str, int] = {}
+    backends: Union[None, List[str]] = None
+    variants: Dict[str, str] = {}
+    extra: Union[None, str] = None
+    repetitions: int = 1
+
+    def __init__(self, model: str, data: Union[None, List[str]] = None,
+                 grid: Union[None, ParamGrid] = None,
+                 timeout: Union[None, int] = None,
+                 backend_timeouts: Union[None, Dict[str, int]] = None,
+                 backends: Union[None, List[str]] = None,
+                 variants: Union[None, Dict[str, str]] = None,
+                 extra: Union[None, str] = None, repetitions: int = 1):
+        self.model = model
+        self.data = data
+        self.grid = grid
+        self.timeout = timeout
+        self.backend_timeouts = dict(backend_timeouts or dict())
+        self.backends = backends
+        self.variants = dict(variants or dict())
+        self.extra = extra
+        self.repetitions = repetitions
+
+    @property
+    def param_names(self) -> Union[None, Tuple[str, ...]]:
+        return None if self.grid is None else self.grid.names
+
+    def data_files(self) -> Iterator[str]:
+        # The files matching the globs, in order and without duplicates
+        seen = set()
+        for pattern in self.data:
+            for data_file in sorted(iglob(pattern)):
+                if data_file not in seen:
+                    seen.add(data_file)
+                    yield data_file
+
+    def instances(self) -> Iterator[Instance]:
+        if self.grid is not None:
+            return ((param, None) for param in self.grid)
+        if self.data is not None:
+            return ((None, data_file) for data_file in self.data_files())
+        return iter([(None, None)])
+
+    @property
+    def num_instances(self) -> int:
+        if self.grid is not None:
+            return len(self.grid)
+        if self.data is not None:
+            return sum(1 for _ in self.data_files())
+        return 1
+
+
+class Campaign:
+    spec_path: str = ''
+    defaults: Dict[str, Any] = {}
+    models: List[Dict[str, Any]] = []
+
+    def __init__(self, spec_path: str, defaults: Dict[str, Any],
+                 models: List[Dict[str, Any]]):
+        self.spec_path = spec_path
+        self.defaults = defaults
+        self.models = models
+
+    @staticmethod
+    def load(spec_path: str) -> 'Campaign':
+        # A spec is {"timeout": ..., "backends": [...], "models": [{"model":
+        # "m.mzn", "data": ["data/*.dzn"]}, ...]}, where each model can
+        # override the keys of the campaign. Paths are relative to the spec.
+        with open(spec_path, 'r') as spec_file:
+            spec = load(spec_file)
+        if not isinstance(spec, dict):
+            raise ValueError('a campaign must be a JSON object')
+        unknown = set(spec) - set(STUDY_KEYS) - {'models'}
+        if len(unknown) > 0:
+            raise ValueError(f'unknown keys {", ".join(sorted(unknown))}')
+        models = spec.get('models', None)
+        if not isinstance(models, list) or len(models) == 0:
+            raise ValueError('"models" must be a non-empty list')
+        campaign = Campaign(spec_path,
+                            {k: v for k, v in spec.items() if k != 'models'},
+                            models)
+        # Studies are built (and thereby checked) once up front, while
+        # their instances are only expanded when they are run
+        for _ in campaign.studies():
+            pass
+        return campaign
+
+    def _path(self, file_path: str) -> str:
+        return path.join(path.dirname(path.abspath(self.spec_path)),
+                         path.expanduser(file_path))
+
+    def _study(self, model: Dict[str, Any]) -> Study:
+        if not isinstance(model, dict) or \
+                not isinstance(model.get('model', None), str):
+            raise ValueError('each of "models" must be an object with a '
+                             '"model" file')
+        unknown = set(model) - set(MODEL_KEYS)
+        if len(unknown) > 0:
+            raise ValueError(f'unknown keys {", ".join(sorted(unknown))} of '
+                             f'model {model["model"]}')
+        model_path = self._path(model['model'])
+        if not path.isfile(model_path):
+            raise ValueError(f'model {model["model"]} is not a file')
+        if 'data' in model and 'params' in model:
+            raise ValueError(f'model {model["model"]} has both "data" and '
+                             '"params"')
+        spec = dict(self.defaults, **model)
+
+        data = None
+        if 'data' in model:
+            data = [self._path(d) for d in
+                    check_strings(model['data'], 'data')]
+        grid = None
+        if 'params' in model:
+            grid = self._grid(model['params'])
+
+        timeout = None
+        if 'timeout' in spec:
+            timeout = to_ms(spec['timeout'], 'timeout')
+        timeouts = spec.get('timeouts', dict())
+        if not isinstance(timeouts, dict):
+            raise ValueError('"timeouts" must map backends to timeouts')
+        backends = None
+        if 'backends' in spec:
+            backends = check_strings(spec['backends'], 'backends')
+        variants = spec.get('variants', dict())
+        if not isinstance(variants, dict) or \
+                not all(isinstance(v, str) for v in variants.values()):
+            raise ValueError('"variants" must map names to flags')
+        extra = spec.get('extra', None)
+        if extra is not None and not isinstance(extra, str):
+            raise ValueError('"extra" must be a string of flags')
+        repetitions = spec.get('repetitions', 1)
+        if not isinstance(repetitions, int) or isinstance(repetitions, bool) \
+                or repetitions < 1:
+            raise ValueError('"repetitions" must be a positive integer')
+        return Study(model_path, data, grid, timeout,
+                     {b: to_ms(t, f'timeouts.{b}')
+                      for b, t in timeouts.items()},
+                     backends, variants, extra, repetitions)
+
+    def _grid(self, params: Any) -> ParamGrid:
+        # The params of a model are [[<param>, <start>, <stop>, <inc>], ...]
+        # as given by -r (--param)
+        if not isinstance(params, list) or len(params) == 0:
+            raise ValueError('"params" must be a non-empty list')
+        ranges: List[ParamRange] = []
+        for param in params:
+            if not isinstance(param, list) or len(param) != 4 or \
+                    not isinstance(param[0], str) or \
+                    not all(isinstance(p, int) and not isinstance(p, bool)
+                            for p in param[1:]):
+                raise ValueError('each of "params" must be [<param>, '
+                                 '<start>, <stop>, <inc>] with integers')
+            name, start, stop, increment = param
+            if (start < stop and increment <= 0) or \
+                    (start > stop and increment >= 0):
+                raise ValueError(f'the param {name} is not bounded')
+            if any(r.name == name for r in ranges):
+                raise ValueError(f'the param {name} is given twice')
+            ranges.append(ParamRange(name, start, stop, increment))
+        return ParamGrid(ranges)
+
+    def studies(self) -> Iterator[Study]:
+        for model in self.models:
+            yield self._study(model)
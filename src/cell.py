@@ -0,0 +1,78 @@
+from typing import Union, Tuple, Dict, NamedTuple
+from copy import copy
+from .param_grid import ParamPoint
+from .result import Result
+
+
+class Cell:
+    instance_index: int = 0
+    num_instances: int = 0
+    param_names: Union[None, Tuple[str, ...]] = None
+    param: Union[None, ParamPoint] = None
+    data_file: Union[None, str] = None
+    backend_index: int = 0
+    backend_id: str = ''
+    backend_name: str = ''
+    num_backends: int = 0
+    timeout: Union[None, int] = None
+    # A cell is run as is: its model, solve flags and timeout are resolved
+    # when it is expanded
+    model: Union[None, str] = None
+    flags: Dict[str, str] = {}
+    repetition: int = 0
+    # The level of a timeout ladder the cell runs at, whose runs are
+    # reported by the ladder once the cell reached its last level
+    ladder_level: Union[None, int] = None
+
+    def __init__(self, instance_index: int, num_instances: int,
+                 param_names: Union[None, Tuple[str, ...]],
+                 param: Union[None, ParamPoint], data_file: Union[None, str],
+                 backend_index: int, backend_id: str, backend_name: str,
+                 num_backends: int, timeout: Union[None, int] = None,
+                 model: Union[None, str] = None,
+                 flags: Union[None, Dict[str, str]] = None,
+                 repetition: int = 0):
+        self.instance_index = instance_index
+        self.num_instances = num_instances
+        self.param_names = param_names
+        self.param = param
+        self.data_file = data_file
+        self.backend_index = backend_index
+        self.backend_id = backend_id
+        self.backend_name = backend_name
+        self.num_backends = num_backends
+        self.timeout = timeout
+        self.model = model
+        self.flags = dict() if flags is None else flags
+        self.repetition = repetition
+
+    def repeat(self, repetition: int) -> 'Cell':
+        # The repetitions of an instance are the rows following its first
+        cell = copy(self)
+        cell.instance_index += repetition - self.repetition
+        cell.repetition = repetition
+        return cell
+
+
+class RunRecord(NamedTuple):
+    # The immutable record of a run that BackendRunner.iter_results yields
+    instance_index: int
+    num_instances: int
+    repetition: int
+    param: Union[None, ParamPoint]
+    data_file: Union[None, str]
+    model: Union[None, str]
+    backend_index: int
+    backend_id: str
+    backend_name: str
+    flags: Tuple[Tuple[str, str], ...]
+    timeout: Union[None, int]
+    result: Result
+
+    @staticmethod
+    def from_cell(cell: Cell, result: Result) -> 'RunRecord':
+        return RunRecord(cell.instance_index, cell.num_instances,
+                         cell.repetition, cell.param, cell.data_file,
+                         cell.model, cell.backend_index, cell.backend_id,
+                         cell.backend_name, tuple(sorted(cell.flags.items())),
+                         cell.timeout, result)
@@ -0,0 +1,83 @@
+from typing import Union
+from subprocess import CalledProcessError
+import minizinc
+from .param_grid import ParamPoint
+
+# What a run that keeps failing does: end the campaign, or be recorded as
+# an ERR cell while the other cells run on
+ON_ERROR_POLICIES = ('abort', 'continue')
+
+# Seconds before the first retry of a failed run, doubled for each further
+# retry up to MAX_BACKOFF
+RETRY_BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+
+# Errors of the model or its data, which fail the same way on every retry
+PERSISTENT_ERRORS = (minizinc.error.SyntaxError, minizinc.error.TypeError,
+                     minizinc.error.EvaluationError,
+                     minizinc.error.IncludeError,
+                     minizinc.error.CyclicIncludeError)
+
+
+def is_transient(e: Exception) -> bool:
+    # A license check, a crashed driver or a lost file may pass on a retry
+    return not isinstance(e, PERSISTENT_ERRORS)
+
+
+def retry_backoff(retry: int, backoff: float = RETRY_BACKOFF) -> float:
+    return min(MAX_BACKOFF, backoff * 2 ** (retry - 1))
+
+
+def error_message(e: Exception) -> str:
+    # The message of a MiniZinc error is the stderr of the driver
+    if isinstance(e, CalledProcessError) and e.stderr:
+        stderr = e.stderr
+        stderr = (stderr.decode(errors='replace') if isinstance(stderr, bytes)
+                  else stderr).strip()
+        if stderr:
+            return stderr
+    message = str(e).strip()
+    return (f'{type(e).__name__}: {message}' if message
+            else type(e).__name__)
+
+
+class FailedInstance(str):
+    # The data file of an instance that could not be made, such as one
+    # --generator failed on, whose runs fail with its error
+    error: Union[None, Exception] = None
+
+    def __new__(cls, name: str, error: Exception) -> 'FailedInstance':
+        instance = super().__new__(cls, name)
+        instance.error = error
+        return instance
+
+
+class Backoff(Exception):
+    # Raised instead of sleeping by a parallel run that backs off before its
+    # next retry, so that its job and cores are free while it waits
+    attempts: int = 0
+    delay: float = 0.0
+
+    def __init__(self, attempts: int, delay: float):
+        super().__init__(f'retry {attempts + 1} in {delay:.1f}s')
+        self.attempts = attempts
+        self.delay = delay
+
+
+class Failure:
+    backend_name: str = ''
+    instance_index: int = 0
+    param: Union[None, ParamPoint] = None
+    data_file: Union[None, str] = None
+    attempts: int = 1
+    message: str = ''
+
+    def __init__(self, backend_name: str, instance_index: int,
+                 param: Union[None, ParamPoint], data_file: Union[None, str],
+                 attempts: int, message: str):
+        self.backend_name = backend_name
+        self.instance_index = instance_index
+        self.param = param
+        self.data_file = data_file
+        self.attempts = attempts
+        self.message = message
@@ -0,0 +1,84 @@
+from typing import Dict, Any, Tuple
+from datetime import timedelta
+from math import log2
+from re import compile
+
+var_re = compile(r'^var\s+(.+?)\s*:\s*[A-Za-z_]')
+range_re = compile(r'^(-?\d+)\s*\.\.\s*(-?\d+)$')
+float_range_re = compile(r'^-?[\d.eE+-]+\s*\.\.\s*-?[\d.eE+-]+$')
+constraint_re = compile(r'^constraint\s+([A-Za-z_]\w*)\s*\(')
+solve_re = compile(r'^solve\b.*\b(satisfy|minimize|maximize)\b')
+
+# Constraint families by predicate prefix, the first match is used
+constraint_families: Tuple[Tuple[str, str], ...] = (
+  ('int_lin_', 'int_lin'), ('int_', 'int'), ('bool_clause', 'bool_clause'),
+  ('bool_lin_', 'bool_lin'), ('bool_', 'bool'), ('float_lin_', 'float_lin'),
+  ('float_', 'float'), ('set_', 'set'), ('array_', 'array'))
+
+
+def constraint_family(predicate: str) -> str:
+    for prefix, family in constraint_families:
+        if predicate.startswith(prefix):
+            return family
+    return 'global'
+
+
+def var_type(domain: str) -> Tuple[str, float]:
+    # The type and the log2 of the domain size of a FlatZinc variable
+    if domain.startswith('set of'):
+        return 'set', 0.0
+    if domain == 'bool':
+        return 'bool', 1.0
+    if domain == 'int':
+        return 'unbounded_int', 32.0
+    match = range_re.match(domain)
+    if match is not None:
+        size = int(match.group(2)) - int(match.group(1)) + 1
+        return 'int', log2(max(1, size))
+    if domain == 'float' or float_range_re.match(domain):
+        return 'float', 0.0
+    if domain.startswith('{'):
+        return 'int', log2(max(1, domain.count(',') + 1))
+    return 'int', 32.0
+
+
+def fzn_features(fzn_path: str) -> Dict[str, float]:
+    features: Dict[str, float] = {
+      'vars': 0, 'constraints': 0, 'domain_log2_sum': 0.0,
+      'domain_log2_max': 0.0, 'objective': 0}
+    with open(fzn_path, 'r') as fzn_file:
+        for line in fzn_file:
+            line = line.strip()
+            match = var_re.match(line)
+            if match is not None:
+                kind, size = var_type(match.group(1))
+                features['vars'] += 1
+                features[f'vars_{kind}'] = features.get(f'vars_{kind}', 0) + 1
+                features['domain_log2_sum'] += size
+                features['domain_log2_max'] = max(
+                  features['domain_log2_max'], size)
+                continue
+            match = constraint_re.match(line)
+            if match is not None:
+                family = constraint_family(match.group(1))
+                features['constraints'] += 1
+                features[f'constraints_{family}'] = features.get(
+                  f'constraints_{family}', 0) + 1
+                continue
+            match = solve_re.match(line)
+            if match is not None:
+                features['objective'] = int(match.group(1) != 'satisfy')
+    features['domain_log2_mean'] = (features['domain_log2_sum'] /
+                                    max(1, features['vars']))
+    return features
+
+
+def statistics_features(statistics: Dict[str, Any]) -> Dict[str, float]:
+    features: Dict[str, float] = dict()
+    for key, value in statistics.items():
+        if isinstance(value, timedelta):
+            value = value.total_seconds()
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        features[f'stat_{key}'] = float(value)
+    return features
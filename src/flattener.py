@@ -0,0 +1,322 @@
+import minizinc
+from minizinc.result import set_stat
+from minizinc.error import parse_error
+from typing import List, Dict, Any, Union, Callable, Deque
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from subprocess import CompletedProcess
+from datetime import timedelta
+from tempfile import NamedTemporaryFile
+from types import SimpleNamespace
+from re import compile
+from json import loads
+from .param_grid import ParamPoint
+from .resource_limits import ResourceLimits
+from .supervisor import get_supervisor
+
+stat_re = compile(r'%%%mzn-stat:? (\w*)=([^\r\n]*)')
+# The output section of a lean run, which holds its vars and objective
+VARS_SECTION = 'run_backends_vars'
+# The type of a line of --json-stream, read without decoding the line
+type_re = compile(rb'\s*\{\s*"type"\s*:\s*"(\w+)"')
+
+
+def flags_to_args(flags: Dict[str, Union[bool, str]]) -> List[str]:
+    args = []
+    for flag, value in flags.items():
+        if not flag.startswith('-'):
+            flag = f'--{flag}'
+        if isinstance(value, bool):
+            if value:
+                args.append(flag)
+        else:
+            args += [flag, str(value)]
+    return args
+
+
+class FlattenTimeout(Exception):
+    # A flattening that did not finish within the timeout of its run, which
+    # thereby timed out
+    method: minizinc.Method = None
+
+    def __init__(self, method: minizinc.Method):
+        super().__init__('flattening timed out')
+        self.method = method
+
+
+class FlatInstance:
+    backend_id: str = ''
+    method: minizinc.Method = None
+    fzn_path: str = ''
+    ozn_path: str = ''
+    statistics: Dict[str, Any] = {}
+
+    def __init__(self, backend_id: str, method: minizinc.Method,
+                 fzn_path: str, ozn_path: str, statistics: Dict[str, Any]):
+        self.backend_id = backend_id
+        self.method = method
+        self.fzn_path = fzn_path
+        self.ozn_path = ozn_path
+        self.statistics = statistics
+
+    def remove(self) -> None:
+        get_supervisor().remove_files([self.fzn_path, self.ozn_path])
+
+
+class Flattener:
+    executor: ThreadPoolExecutor = None
+
+    @property
+    def executable(self) -> str:
+        return minizinc_executable()
+
+    def __init__(self, num_workers: int):
+        self.executor = ThreadPoolExecutor(max_workers=num_workers,
+                                           thread_name_prefix='flattener')
+
+    def submit(self, fn: Callable[..., FlatInstance], *args) -> Future:
+        return self.executor.submit(fn, *args)
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def flatten(self, model: str, backend_id: str, method: minizinc.Method,
+                flags: Dict[str, Union[bool, str]],
+                param: Union[None, ParamPoint] = None,
+                data_file: Union[None, str] = None,
+                constraint: Union[None, str] = None,
+                timeout: Union[None, int] = None,
+                vars: Union[None, List[str]] = None) -> FlatInstance:
+        files = []
+        for suffix in ('.fzn', '.ozn'):
+            with NamedTemporaryFile(prefix='run_backends_', suffix=suffix,
+                                    delete=False) as tmp_file:
+                files.append(tmp_file.name)
+        # The files are removed on shutdown unless removed before
+        get_supervisor().track_files(files)
+        flat = FlatInstance(backend_id, method, files[0], files[1], dict())
+
+        cmd = [self.executable, '--solver', backend_id, '--compile',
+               '--statistics'] + output_args(vars) + [
+               '--fzn', flat.fzn_path, '--ozn', flat.ozn_path] + \
+            flags_to_args(flags)
+        if param is not None:
+            cmd += ['-D', ' '.join(f'{name} = {value};'
+                                   for name, value in param)]
+        cmd.append(model)
+        if data_file is not None:
+            cmd.append(data_file)
+        items = model_items(method, constraint, vars)
+        constraint_path = None
+        if items is not None:
+            constraint_path = constraint_file(items)
+            cmd.append(constraint_path)
+
+        try:
+            output, expired = get_supervisor().run(
+              cmd, None if timeout is None else timeout / 1000)
+        except BaseException:
+            flat.remove()
+            raise
+        finally:
+            if constraint_path is not None:
+                get_supervisor().remove_files([constraint_path])
+        if expired:
+            flat.remove()
+            raise FlattenTimeout(method)
+        if output.returncode != 0:
+            flat.remove()
+            raise parse_error(output.stderr)
+
+        for match in stat_re.finditer(output.stdout.decode()):
+            set_stat(flat.statistics, match.group(1), match.group(2))
+        return flat
+
+    def solve(self, flat: FlatInstance, flags: Dict[str, Union[bool, str]],
+              timeout: int, limits: Union[None, ResourceLimits] = None,
+              vars: Union[None, List[str]] = None) -> minizinc.Result:
+        cmd = solve_cmd(flat.backend_id, flat.method, flags, timeout, vars)
+        cmd += [flat.fzn_path, flat.ozn_path]
+        result = run_solver(cmd, timeout, limits, flat.statistics, vars)
+
+        # Running FlatZinc reports its own (near zero) flattening time
+        if 'flatTime' in flat.statistics:
+            result.statistics['flatTime'] = flat.statistics['flatTime']
+        return result
+
+
+def minizinc_executable() -> str:
+    return str(minizinc.default_driver._executable)
+
+
+def constraint_file(constraint: str) -> str:
+    # A model file of the given items, removed on shutdown unless removed
+    # before
+    with NamedTemporaryFile('w', prefix='run_backends_', suffix='.mzn',
+                            delete=False) as tmp_file:
+        tmp_file.write(constraint)
+    get_supervisor().track_files([tmp_file.name])
+    return tmp_file.name
+
+
+def vars_output(method: minizinc.Method, vars: List[str]) -> str:
+    # An output item in its own section that prints the given vars and the
+    # objective as a JSON object, so that a lean run outputs nothing else
+    fields = [f'"\\"{var}\\": ", showJSON({var})' for var in vars]
+    if method != minizinc.Method.SATISFY:
+        fields.append('"\\"_objective\\": ", showJSON(_objective)')
+    return (f'output :: "{VARS_SECTION}" ["{{", ' +
+            ', ", ", '.join(fields) + (', ' if len(fields) > 0 else '') +
+            '"}"];\n')
+
+
+def model_items(method: minizinc.Method, constraint: Union[None, str],
+                vars: Union[None, List[str]]) -> Union[None, str]:
+    # The items added to the model of a run, if any
+    items = [] if constraint is None else [constraint]
+    if vars is not None:
+        items.append(vars_output(method, vars))
+    return None if len(items) == 0 else '\n'.join(items)
+
+
+def output_args(vars: Union[None, List[str]]) -> List[str]:
+    # A lean run outputs the section of its vars, the others the JSON of
+    # all output variables
+    if vars is None:
+        return ['--output-mode', 'json', '--output-objective']
+    return ['--output-objective']
+
+
+def solve_cmd(backend_id: str, method: minizinc.Method,
+              flags: Dict[str, Union[bool, str]], timeout: int,
+              vars: Union[None, List[str]] = None) -> List[str]:
+    cmd = [minizinc_executable(), '--solver', backend_id, '--json-stream',
+           '--statistics', '--output-time', '--time-limit', str(int(timeout))]
+    if method != minizinc.Method.SATISFY:
+        cmd.append('--intermediate-solutions')
+    if vars is not None:
+        cmd += ['--only-sections', VARS_SECTION]
+    return cmd + flags_to_args(flags)
+
+
+def solve_model(model: str, backend_id: str, method: minizinc.Method,
+                flags: Dict[str, Union[bool, str]], timeout: int,
+                limits: Union[None, ResourceLimits] = None,
+                param: Union[None, ParamPoint] = None,
+                data_file: Union[None, str] = None,
+                vars: Union[None, List[str]] = None,
+                constraint: Union[None, str] = None) -> minizinc.Result:
+    # Compiles and solves in one call like minizinc-python, but without
+    # the text of the output item of the model in every solution
+    cmd = solve_cmd(backend_id, method, flags, timeout, vars)
+    cmd += output_args(vars)
+    if param is not None:
+        cmd += ['-D', ' '.join(f'{name} = {value};' for name, value in param)]
+    cmd.append(model)
+    if data_file is not None:
+        cmd.append(data_file)
+    items = model_items(method, constraint, vars)
+    if items is None:
+        return run_solver(cmd, timeout, limits, dict(), vars)
+    constraint_path = constraint_file(items)
+    try:
+        return run_solver(cmd + [constraint_path], timeout, limits, dict(),
+                          vars)
+    finally:
+        get_supervisor().remove_files([constraint_path])
+
+
+def solution_values(obj: Dict[str, Any],
+                    vars: Union[None, List[str]] = None) -> SimpleNamespace:
+    # The JSON of a lean run is the text of the section of its vars
+    values = obj['output'].get('json', obj['output'].get(VARS_SECTION, {}))
+    if isinstance(values, str):
+        values = loads(values)
+    if '_objective' in values:
+        values['objective'] = values.pop('_objective')
+    if vars is not None:
+        values = {k: v for k, v in values.items()
+                  if k == 'objective' or k in vars}
+    return SimpleNamespace(**values)
+
+
+def solver_error(output: CompletedProcess, stderr: bytes) -> Exception:
+    # The error keeps the exit status of the solver, which tells whether a
+    # signal ended it
+    error = parse_error(stderr)
+    error.returncode = output.returncode
+    return error
+
+
+def run_solver(cmd: List[str], timeout: int,
+               limits: Union[None, ResourceLimits] = None,
+               statistics: Union[None, Dict[str, Any]] = None,
+               vars: Union[None, List[str]] = None) -> minizinc.Result:
+    # Runs a --json-stream solve under the watchdog. Given the vars of a
+    # lean run, only the last solution is decoded, and only its vars and
+    # objective are kept.
+    #
+    # A solver terminated by the watchdog for ignoring the time limit
+    # timed out, keeping the solutions it reported before
+    if limits is None or limits.empty:
+        output, expired = get_supervisor().run(cmd, timeout / 1000)
+    else:
+        output, expired = get_supervisor().run(
+          limits.wrap(cmd), timeout / 1000, env=limits.env())
+
+    status = minizinc.Status.UNKNOWN
+    solution = None
+    statistics = dict(statistics or dict())
+    # The last two solution lines of a lean run, as the last line of a
+    # terminated solver can be cut off
+    solution_lines: Deque[bytes] = deque(maxlen=2)
+    for line in output.stdout.splitlines():
+        if len(line.strip()) == 0:
+            continue
+        if vars is not None:
+            match = type_re.match(line)
+            if match is not None and match.group(1) == b'solution':
+                solution_lines.append(line)
+                if status == minizinc.Status.UNKNOWN:
+                    status = minizinc.Status.SATISFIED
+                continue
+        try:
+            obj = loads(line)
+        except ValueError:
+            # The last line of a terminated solver can be cut off
+            if expired:
+                continue
+            raise
+        if obj['type'] == 'solution':
+            solution = solution_values(obj)
+            if status == minizinc.Status.UNKNOWN:
+                status = minizinc.Status.SATISFIED
+            if 'time' in obj:
+                statistics['time'] = timedelta(milliseconds=obj['time'])
+        elif obj['type'] == 'time':
+            statistics['time'] = timedelta(milliseconds=obj['time'])
+        elif obj['type'] == 'statistics':
+            for key, value in obj['statistics'].items():
+                set_stat(statistics, key, str(value))
+        elif obj['type'] == 'status':
+            status = minizinc.Status.from_str(obj['status'])
+        elif obj['type'] == 'error':
+            raise solver_error(output,
+                               output.stderr or obj['message'].encode())
+
+    while len(solution_lines) > 0:
+        try:
+            obj = loads(solution_lines.pop())
+        except ValueError:
+            if expired:
+                continue
+            raise
+        solution = solution_values(obj, vars)
+        if 'time' in obj and 'time' not in statistics:
+            statistics['time'] = timedelta(milliseconds=obj['time'])
+        break
+
+    if status == minizinc.Status.ERROR or (output.returncode != 0 and
+                                           not expired):
+        raise solver_error(output, output.stderr)
+    return minizinc.Result(status, solution, statistics)
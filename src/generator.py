@@ -0,0 +1,161 @@
+from typing import List, Dict, Tuple, Union, Iterable, Iterator, Callable, \
+  Deque, Any
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import get_context
+from importlib import import_module
+from importlib.util import spec_from_file_location, module_from_spec
+from inspect import getsource
+from hashlib import sha256
+from json import dumps
+from os import path, makedirs, replace, getpid
+from .faults import FailedInstance
+
+# The instances each worker generates ahead of the solvers
+GENERATOR_LOOKAHEAD = 2
+
+# A generator is called with the params of an instance and its seed, and
+# returns the instance as a dict of its parameters (written as JSON data)
+# or as dzn text
+InstanceGenerator = Callable[[Dict[str, Any], int], Union[str, Dict[str, Any]]]
+
+_generators: Dict[str, InstanceGenerator] = dict()
+
+
+def load_generator(spec: str) -> InstanceGenerator:
+    # A generator is given as <module>:<function> or <file>.py:<function>
+    if spec not in _generators:
+        module_name, _, function_name = spec.rpartition(':')
+        if module_name == '' or function_name == '':
+            raise ValueError(f'"{spec}" is not <module>:<function> or '
+                             '<file>.py:<function>')
+        if module_name.endswith('.py'):
+            module_spec = spec_from_file_location(
+              path.splitext(path.basename(module_name))[0], module_name)
+            if module_spec is None:
+                raise ValueError(f'cannot load {module_name}')
+            module = module_from_spec(module_spec)
+            module_spec.loader.exec_module(module)
+        else:
+            module = import_module(module_name)
+        generator = getattr(module, function_name, None)
+        if not callable(generator):
+            raise ValueError(f'{function_name} of {module_name} is not a '
+                             'function')
+        _generators[spec] = generator
+    return _generators[spec]
+
+
+def generator_id(spec: str) -> str:
+    # Cached instances are keyed by the source of their generator as well,
+    # so that an edited generator does not reuse them
+    try:
+        source = getsource(load_generator(spec))
+    except (OSError, TypeError):
+        source = ''
+    return sha256(f'{spec}\n{source}'.encode()).hexdigest()
+
+
+def json_default(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return {'set': sorted(value)}
+    raise TypeError(f'{type(value).__name__} is not a MiniZinc value')
+
+
+def instance_text(instance: Union[str, Dict[str, Any]]) -> Tuple[str, str]:
+    # The contents of the data file of an instance and its extension
+    if isinstance(instance, str):
+        return instance, '.dzn'
+    if isinstance(instance, dict):
+        return dumps(instance, sort_keys=True, default=json_default), '.json'
+    raise TypeError('a generator must return a dict or dzn text, not '
+                    f'{type(instance).__name__}')
+
+
+def write_file(file_path: str, text: str) -> None:
+    # Written under a temporary name first, so that concurrent campaigns
+    # sharing the cache never read a partial file
+    tmp_path = f'{file_path}.{getpid()}.tmp'
+    with open(tmp_path, 'w') as tmp_file:
+        tmp_file.write(text)
+    replace(tmp_path, file_path)
+
+
+def generate_instance(spec: str, gen_id: str, cache_dir: str,
+                      params: Dict[str, Any], seed: int) -> str:
+    # Runs in a worker process. The data files are named by the hash of
+    # their contents, and the key of each instance points to its file, so
+    # that an instance is generated once and equal instances share a file.
+    key = sha256(dumps([gen_id, params, seed], sort_keys=True).encode()
+                 ).hexdigest()
+    key_path = path.join(cache_dir, 'keys', key)
+    if path.isfile(key_path):
+        with open(key_path, 'r') as key_file:
+            data_file = path.join(cache_dir, key_file.read().strip())
+        if path.isfile(data_file):
+            return data_file
+    text, extension = instance_text(load_generator(spec)(params, seed))
+    name = sha256(text.encode()).hexdigest()[:32] + extension
+    data_file = path.join(cache_dir, name)
+    if not path.isfile(data_file):
+        write_file(data_file, text)
+    write_file(key_path, name)
+    return data_file
+
+
+class Generator:
+    spec: str = ''
+    cache_dir: str = ''
+    workers: int = 1
+    gen_id: str = ''
+
+    def __init__(self, spec: str, cache_dir: str, workers: int = 1):
+        # Loads the generator once here, so that a wrong spec fails before
+        # any solver runs
+        self.spec = spec
+        self.cache_dir = cache_dir
+        self.workers = max(1, workers)
+        self.gen_id = generator_id(spec)
+        makedirs(path.join(cache_dir, 'keys'), exist_ok=True)
+
+    def generate(self, points: Iterable[Tuple[Dict[str, Any], int]]
+                 ) -> Iterator[str]:
+        # Yields the data file of each (params, seed) in order, while the
+        # workers generate up to GENERATOR_LOOKAHEAD instances each ahead.
+        # An instance the generator fails on is a FailedInstance, which the
+        # runner aborts on or records as ERR cells as --on-error says.
+        # The workers are spawned rather than forked, as the runner has
+        # threads of its own.
+        points = iter(points)
+        pending: Deque[Tuple[Future, Dict[str, Any], int]] = deque()
+        pool = ProcessPoolExecutor(self.workers,
+                                   mp_context=get_context('spawn'))
+        try:
+            while True:
+                while len(pending) < self.workers * GENERATOR_LOOKAHEAD:
+                    point = next(points, None)
+                    if point is None:
+                        break
+                    params, seed = point
+                    pending.append((pool.submit(
+                      generate_instance, self.spec, self.gen_id,
+                      self.cache_dir, params, seed), params, seed))
+                if len(pending) == 0:
+                    break
+                future, params, seed = pending.popleft()
+                try:
+                    data_file = future.result()
+                except Exception as e:
+                    data_file = FailedInstance(
+                      f'{self.spec}({dumps(params, sort_keys=True)}, '
+                      f'{seed})', e)
+                yield data_file
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+
+def generator_points(params: Iterable[Dict[str, Any]],
+                     seeds: List[int]) -> Iterator[Tuple[Dict[str, Any], int]]:
+    for param in params:
+        for seed in seeds:
+            yield param, seed
@@ -1,22 +1,61 @@
 from typing import List, Dict, Any, Union, Tuple
 from ..result import Result
+from ..param_grid import ParamPoint
+from ..scores import Scores
+from ..scaling import ScalingEntry
 from .outputter import Outputter
 from json import dump
+from datetime import timedelta
+from os import path
+
+
+def to_ms(time: Union[None, timedelta]) -> Union[None, int]:
+    return None if time is None else int(time.total_seconds() * 1000)
 
 
 class JsonOutputter(Outputter):
     json_data: List[Dict[str, Any]] = []
     json_file_path: Union[None, str] = None
+    # The file of the current model, as the path may have a {model}
+    # placeholder for the name of the model
+    output_path: Union[None, str] = None
+    frontiers: Union[None, Dict[str, Union[None, int]]] = None
+    scores: Union[None, Scores] = None
+    backend_names: List[str] = []
+    timeout: Union[None, int] = None
+    eliminations: List[Dict[str, Any]] = []
+    selections: List[Dict[str, Any]] = []
+    scaling: Union[None, Dict[str, Any]] = None
 
     def __init__(self, json_file_path: Union[None, str] = None):
         self.json_file_path = json_file_path
 
-    def set_up(self, param_name: Union[None, str]) -> None:
+    def set_up(self, param_names: Union[None, Tuple[str, ...]]) -> None:
         self.json_data = []
+        self.frontiers = None
+        self.scores = None
+        self.timeout = None
+        self.eliminations = []
+        self.selections = []
+        self.scaling = None
+        self.output_path = None
+
+    def intro(self, backends: List[Tuple[str, str]], model_name: str,
+              timeout: int, is_csp: bool, vars: List[str],
+              param_names: Union[None, Tuple[str, ...]],
+              is_data_file_run: bool,
+              extra_flags: List[Tuple[str, str]]) -> None:
+        self.scores = Scores(timeout)
+        self.output_path = self.json_file_path.replace(
+          '{model}', path.splitext(path.basename(model_name))[0])
+        self.backend_names = [b_name for _, b_name in backends]
+        # A timeout ladder announces its first timeout before the intro
+        if self.timeout is None:
+            self.timeout = timeout
 
     def post_run(self, backend_id: str, backend_name: str, backend_index: int,
                  num_backends: int, instance_index: int, num_instances: int,
-                 param: Union[None, Tuple[str, int]],
+                 param: Union[None, ParamPoint],
                  data_file: Union[None, str],
                  result: Result) -> None:
         self.json_data.append({
@@ -24,9 +63,11 @@ class JsonOutputter(Outputter):
           'backend_name': backend_name,
           'instance_index': instance_index,
           'data_file': data_file,
-          'param': None if param is None else {param[0]: param[1]},
+          'param': None if param is None else dict(param),
           'objective': result.objective,
           'error': result.error,
+          'error_message': result.error_message,
+          'attempts': result.attempts,
           'unknown': result.unknown,
           'unsat': result.unsat,
           'sat': result.sat,
@@ -35,14 +76,113 @@ class JsonOutputter(Outputter):
           'is_csp': result.is_csp,
           'is_cop': result.is_cop,
           'timed_out': result.timed_out,
+          'mem_out': result.mem_out,
           'time': int(result.time.total_seconds() * 1000),
+          'time_source': result.time_source,
+          'timeout': (self.timeout if result.timeout is None
+                      else result.timeout),
+          # The times are normalized to the reference host of a
+          # calibration by the speed factor of the host of the run
+          'host': result.host,
+          'speed_factor': result.speed_factor,
+          'wall_time': to_ms(result.normalized_wall_time),
+          'flat_time': to_ms(result.flat_time),
+          'solve_time': to_ms(result.solve_time),
           'has_solution': result.has_solution,
+          'search': result.search,
           'vars': result.all_vars()
         })
 
+    def instance(self, results: List[Union[None, Result]],
+                 param: Union[None, ParamPoint],
+                 data_file: Union[None, str], instance_index: int) -> None:
+        for backend_name, result in zip(self.backend_names, results):
+            if result is not None:
+                self.scores.add(backend_name, result)
+
+    def backends_selected(self, instance_index: int,
+                          param: Union[None, ParamPoint],
+                          data_file: Union[None, str],
+                          backend_names: List[str]) -> None:
+        self.selections.append({
+          'param': None if param is None else dict(param),
+          'data_file': data_file,
+          'backend_names': backend_names
+        })
+
+    def backend_eliminated(self, backend_name: str, instance_index: int,
+                           num_instances: int, mean_rank: float,
+                           best_backend_name: str, best_mean_rank: float,
+                           p_value: float) -> None:
+        self.eliminations.append({
+          'backend_name': backend_name,
+          'instance_index': instance_index,
+          'num_instances': num_instances,
+          'mean_rank': mean_rank,
+          'best_backend_name': best_backend_name,
+          'best_mean_rank': best_mean_rank,
+          'p_value': p_value
+        })
+
+    def timeout_level(self, level: int, num_levels: int, timeout: int,
+                      num_cells: int) -> None:
+        self.timeout = timeout
+
+    def scaling_instance(self, entries: List[ScalingEntry],
+                         param: Union[None, ParamPoint],
+                         data_file: Union[None, str]) -> None:
+        if self.scaling is None:
+            self.scaling = {'instances': [], 'summary': []}
+        self.scaling['instances'].append({
+          'param': None if param is None else dict(param),
+          'data_file': data_file,
+          'backends': [{'backend_name': backend_name, 'threads': threads,
+                        'speedup': speedup, 'efficiency': efficiency}
+                       for backend_name, threads, speedup, efficiency
+                       in entries]
+        })
+
+    def scaling_summary(self, summary: List[Tuple[str, int, int,
+                                                  Union[None, float],
+                                                  Union[None, float]]]
+                        ) -> None:
+        if self.scaling is None:
+            self.scaling = {'instances': [], 'summary': []}
+        self.scaling['summary'] = [
+          {'backend_name': backend_name, 'threads': threads,
+           'solved': num_instances, 'speedup': speedup,
+           'efficiency': efficiency}
+          for backend_name, threads, num_instances, speedup, efficiency
+          in summary]
+
+    def sweep_summary(self, param_name: str,
+                      frontiers: List[Tuple[str, Union[None, int]]],
+                      num_runs: int) -> None:
+        self.frontiers = {backend_name: value
+                          for backend_name, value in frontiers}
+
     def outro(self) -> None:
-        with open(self.json_file_path, 'w') as json_output_file:
-            dump({'runs': self.json_data}, json_output_file, indent=2)
+        data: Dict[str, Any] = {'runs': self.json_data}
+        if self.frontiers is not None:
+            data['largest_solved'] = self.frontiers
+        if self.scaling is not None:
+            data['scaling'] = self.scaling
+        if len(self.eliminations) > 0:
+            data['eliminated'] = self.eliminations
+        if len(self.selections) > 0:
+            data['selected'] = self.selections
+        if self.scores is not None:
+            data['scores'] = dict(self.scores.summary())
+        with open(self.output_path or self.json_file_path,
+                  'w') as json_output_file:
+            dump(data, json_output_file, indent=2)
 
     def tear_down(self) -> None:
         self.json_data = []
+        self.frontiers = None
+        self.scores = None
+        self.timeout = None
+        self.eliminations = []
+        self.selections = []
+        self.scaling = None
+        self.output_path = None
@@ -1,15 +1,76 @@
-from typing import Union, List, Tuple
+from typing import Union, List, Tuple, Dict, Any
 from ..result import Result
+from ..param_grid import ParamPoint, param_point_to_str
+from ..scores import Scores, PAR_KS
+from ..progress import Progress, seconds_to_str
+from ..scaling import ScalingEntry
+from ..faults import Failure
+from ..planner import Plan
 from .outputter import Outputter
 import logging
 from sys import stderr
+from threading import Thread, Event, RLock
+from time import monotonic
+
+# Seconds between redrawing the progress line on a terminal
+TTY_PROGRESS_INTERVAL = 0.5
+
+# The level of the progress lines, which --progress shows without
+# --verbose
+PROGRESS = logging.INFO + 5
+logging.addLevelName(PROGRESS, 'PROGRESS')
+
+
+class ProgressStreamHandler(logging.StreamHandler):
+    # Clears the progress line of a terminal and writes the record under
+    # the lock that redraws it, so that the two cannot interleave
+    outputter: 'LogOutputter' = None
+
+    def __init__(self, outputter: 'LogOutputter'):
+        super().__init__(stderr)
+        self.outputter = outputter
+        # A terminal shows the progress in its redrawn line instead. It is
+        # dropped before the handler lock is taken, since _report_progress
+        # logs it while holding _progress_lock
+        self.addFilter(lambda record: record.levelno != PROGRESS)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        with self.outputter._progress_lock:
+            if self.outputter._progress_shown:
+                self.stream.write('\r\x1b[K')
+                self.outputter._progress_shown = False
+            super().emit(record)
 
 
 class LogOutputter(Outputter):
     logger: logging.Logger = None
+    scores: Union[None, Scores] = None
+    backend_names: List[str] = []
+    show_progress: bool = False
+    progress_interval: float = 60.0
+    progress: Union[None, Progress] = None
+    is_tty: bool = False
+    _progress_shown: bool = False
+    _instance_index: Union[None, int] = None
+    _backend_index: Union[None, int] = None
+    _last_progress: float = 0.0
+    _last_logged: float = 0.0
+    # Redraws the progress while runs are in flight, and the lock that
+    # keeps it from interleaving with the log
+    _progress_thread: Union[None, Thread] = None
+    _progress_stop: Union[None, Event] = None
+    _progress_lock: Union[None, RLock] = None
 
-    def __init__(self, level: int, log_file_path: Union[None, str] = None):
+    def __init__(self, level: int, log_file_path: Union[None, str] = None,
+                 show_progress: bool = False,
+                 progress_interval: float = 60.0):
+        self.show_progress = show_progress
+        self.progress_interval = progress_interval
+        self.is_tty = stderr.isatty()
+        self._progress_lock = RLock()
         self.logger = logging.getLogger(__name__)
+        if self.show_progress:
+            level = min(level, PROGRESS)
         self.logger.setLevel(level)
         self.logger.propagate = False
 
@@ -18,7 +79,9 @@ class LogOutputter(Outputter):
             handler.close()
         self.logger.handlers.clear()
 
-        stderr_handler = logging.StreamHandler(stderr)
+        stderr_handler = (
+          ProgressStreamHandler(self) if self.show_progress and self.is_tty
+          else logging.StreamHandler(stderr))
         stderr_handler.setLevel(level)
         stderr_handler.setFormatter(formatter)
         self.logger.addHandler(stderr_handler)
@@ -34,9 +97,14 @@ class LogOutputter(Outputter):
 
     def intro(self, backends: List[Tuple[str, str]], model_name: str,
               timeout: int, is_csp: bool, vars: List[str] = [],
-              param: Union[None, Tuple[str, int]] = None,
+              param_names: Union[None, Tuple[str, ...]] = None,
               is_data_file_run: bool = False,
               extra_flags: List[Tuple[str, str]] = []) -> None:
+        self.scores = Scores(timeout)
+        self.backend_names = [b_name for _, b_name in backends]
+        if self.show_progress:
+            self.progress = Progress(timeout)
+            self._start_progress()
         entries = [
           ('model', model_name),
           ('problem type', ('Constraint Satisfaction Problem (CSP)' if is_csp
@@ -61,36 +129,74 @@ class LogOutputter(Outputter):
 
     def pre_run(self, backend_id: str, backend_name: str, backend_index: int,
                 num_backends: int, instance_index: int, num_instances: int,
-                param: Union[None, Tuple[str, int]],
+                param: Union[None, ParamPoint],
                 data_file: Union[None, str]) -> None:
-        if backend_index == 0:
+        if self.progress is not None:
+            with self._progress_lock:
+                self.progress.started(backend_name,
+                                      num_instances * num_backends)
+        self._log_run(backend_name, backend_index, num_backends,
+                      instance_index, num_instances, param, data_file)
+        self._report_progress()
+
+    def _log_run(self, backend_name: str, backend_index: int,
+                 num_backends: int, instance_index: int, num_instances: int,
+                 param: Union[None, ParamPoint],
+                 data_file: Union[None, str]) -> None:
+        # Reruns of a timeout ladder do not start with the first backend
+        if backend_index == 0 or instance_index != self._instance_index:
+            self._instance_index = instance_index
             header_suffix = (
               '' if num_instances == 0
               else f' ({instance_index + 1} of {num_instances})')
 
             if param is not None:
                 self.logger.info(
-                  f'instance: {param[0]} = {param[1]}{header_suffix}')
+                  f'instance: {param_point_to_str(param)}{header_suffix}')
             elif data_file is not None:
                 self.logger.info(f'instance: {data_file}{header_suffix}')
         run_suffix = ('' if num_backends == 0
                       else f' ({backend_index + 1} of {num_backends})')
 
         self.logger.info(f'  backend: {backend_name}{run_suffix}')
+        self._backend_index = backend_index
 
     def post_run(self, backend_id: str, backend_name: str, backend_index: int,
                  num_backends: int, instance_index: int, num_instances: int,
-                 param: Union[None, Tuple[str, int]],
+                 param: Union[None, ParamPoint],
                  data_file: Union[None, str],
                  result: Result) -> None:
+        if self.progress is not None:
+            with self._progress_lock:
+                self.progress.finished(backend_name, result)
+        # Parallel runs (--jobs) finish in another order than they started
+        if (instance_index, backend_index) != (self._instance_index,
+                                               self._backend_index):
+            self._instance_index = None
+            self._log_run(backend_name, backend_index, num_backends,
+                          instance_index, num_instances, param, data_file)
         padding = '    '
+        if result.error_message is not None:
+            self.logger.warning(
+              f'{padding}ERR after {result.attempts} attempt(s): ' +
+              result.error_message.splitlines()[0])
+            self._report_progress()
+            return
         for var, val in result.vars:
             self.logger.info(f'{padding}{var}: {val}')
-        if result.timed_out:
+        if result.mem_out:
+            time = 'm/o'
+        elif result.timed_out:
             time = 't/o'
         else:
             time = f'{int(result.time.total_seconds() * 1000)}ms'
         self.logger.info(f'{padding}time: {time}')
+        for label, phase_time in (('flatten', result.flat_time),
+                                  ('solve', result.solve_time)):
+            if phase_time is not None:
+                self.logger.info(
+                  f'{padding}{label}: '
+                  f'{int(phase_time.total_seconds() * 1000)}ms')
         if result.is_csp:
             if result.sat:
                 s = 'SAT'
@@ -106,6 +212,199 @@ class LogOutputter(Outputter):
                 result_suffix = ''
             self.logger.info(
                 f'{padding}obj:  {result.objective}{result_suffix}')
+        self._report_progress()
+
+    def instance(self, results: List[Union[None, Result]],
+                 param: Union[None, ParamPoint],
+                 data_file: Union[None, str], instance_index: int) -> None:
+        if self.scores is None:
+            return
+        for backend_name, result in zip(self.backend_names, results):
+            if result is not None:
+                self.scores.add(backend_name, result)
+
+    def backends_selected(self, instance_index: int,
+                          param: Union[None, ParamPoint],
+                          data_file: Union[None, str],
+                          backend_names: List[str]) -> None:
+        instance = (param_point_to_str(param) if param is not None
+                    else data_file)
+        self.logger.info(f'selected for {instance}: ' +
+                         ', '.join(backend_names))
+
+    def files_changed(self, file_paths: List[str],
+                      num_instances: int) -> None:
+        self.logger.warning(f'changed: {", ".join(file_paths)}, rerunning '
+                            f'{num_instances} instance(s)')
+
+    def backend_eliminated(self, backend_name: str, instance_index: int,
+                           num_instances: int, mean_rank: float,
+                           best_backend_name: str, best_mean_rank: float,
+                           p_value: float) -> None:
+        self.logger.warning(
+          f'eliminated backend {backend_name} after {num_instances} '
+          f'instance(s): mean rank {mean_rank:.2f} against '
+          f'{best_mean_rank:.2f} of {best_backend_name} '
+          f'(Friedman test p = {p_value:.4f})')
+
+    def timeout_level(self, level: int, num_levels: int, timeout: int,
+                      num_cells: int) -> None:
+        self._instance_index = None
+        self.logger.info(f'timeout level {level + 1} of {num_levels}: '
+                         f'running {num_cells} cell(s) with timeout '
+                         f'{timeout}ms')
+
+    def _start_progress(self) -> None:
+        # The progress is also redrawn between the runs, so that the ETA
+        # and the CPU utilisation stay live during a long solve
+        self._progress_stop = Event()
+        interval = (TTY_PROGRESS_INTERVAL if self.is_tty
+                    else self.progress_interval)
+
+        def refresh(stop: Event) -> None:
+            while not stop.wait(interval):
+                self._report_progress()
+        self._progress_thread = Thread(target=refresh,
+                                       args=(self._progress_stop, ),
+                                       name='progress', daemon=True)
+        self._progress_thread.start()
+
+    def _stop_progress(self) -> None:
+        if self._progress_thread is None:
+            return
+        self._progress_stop.set()
+        self._progress_thread.join()
+        self._progress_thread = None
+
+    def _report_progress(self, force: bool = False) -> None:
+        # The line of a terminal is redrawn in place, while the log gets a
+        # progress record every progress_interval
+        with self._progress_lock:
+            if self.progress is None:
+                return
+            now = monotonic()
+            if self.is_tty and (force or not self._progress_shown or
+                                now - self._last_progress >=
+                                TTY_PROGRESS_INTERVAL):
+                stderr.write(f'\r\x1b[K{self.progress}')
+                stderr.flush()
+                self._progress_shown = True
+                self._last_progress = now
+            if force or now - self._last_logged >= self.progress_interval:
+                self.logger.log(PROGRESS, f'progress: {self.progress}')
+                self._last_logged = now
+
+    def scaling_instance(self, entries: List[ScalingEntry],
+                         param: Union[None, ParamPoint],
+                         data_file: Union[None, str]) -> None:
+        padding = '    '
+        for backend_name, threads, speedup, efficiency in entries:
+            if speedup is None:
+                continue
+            self.logger.info(
+              f'{padding}{backend_name} p={threads}: speedup '
+              f'{speedup:.2f}, efficiency {efficiency:.2f}')
+
+    def scaling_summary(self, summary: List[Tuple[str, int, int,
+                                                  Union[None, float],
+                                                  Union[None, float]]]
+                        ) -> None:
+        self.logger.info('thread scaling (geometric mean):')
+        for backend_name, threads, num_instances, speedup, efficiency in (
+              summary):
+            scaling = ('--' if speedup is None else
+                       f'speedup {speedup:.2f}, efficiency {efficiency:.2f}')
+            self.logger.info(
+              f'  backend: {backend_name} p={threads}: {scaling} '
+              f'({num_instances} instance(s) solved)')
+
+    def sweep_summary(self, param_name: str,
+                      frontiers: List[Tuple[str, Union[None, int]]],
+                      num_runs: int) -> None:
+        self.logger.info(
+          f'adaptive sweep over {param_name} ({num_runs} runs):')
+        name_padding = 1 + max((len(name) for name, _ in frontiers),
+                               default=0)
+        for backend_name, value in frontiers:
+            solved = '--' if value is None else f'{param_name} = {value}'
+            self.logger.info(
+              '  backend: ' + f'{backend_name}:'.ljust(name_padding) +
+              f' largest solved: {solved}')
+
+    def selector_summary(self, num_instances: int,
+                         evaluation: Dict[str, Any]) -> None:
+        self.logger.info(f'trained selector on {num_instances} instance(s), '
+                         f'{evaluation["instances"]} with runs of all '
+                         'backends')
+        if evaluation['instances'] == 0:
+            return
+        gap_closed = evaluation['gap_closed']
+        self.logger.info(
+          f'  selector PAR-10: {evaluation["selector_par10"]:.3f}s')
+        self.logger.info(
+          f'  virtual best PAR-10: {evaluation["virtual_best_par10"]:.3f}s')
+        self.logger.info(
+          f'  single best ({evaluation["single_best"]}) PAR-10: '
+          f'{evaluation["single_best_par10"]:.3f}s')
+        self.logger.info('  gap closed: ' +
+                         ('--' if gap_closed is None else f'{gap_closed:.1%}'))
+
+    def plan_summary(self, plans: List[Plan]) -> None:
+        self.logger.info(f'plan of {plans[0].num_cells} run(s), '
+                         f'{plans[0].num_unseen} of them estimated from '
+                         'other instances:')
+        for p in plans:
+            self.logger.info(
+              f'  --jobs {p.num_jobs} on {p.num_cores} cores: makespan '
+              f'{seconds_to_str(p.makespan)} (90%: '
+              f'{seconds_to_str(p.makespan_quantile(0.9))}), '
+              f'{p.cpu_hours:.2f} CPU-hours, {p.timeout_share:.1%} timeouts')
+
+    def calibration(self, host: str, reference_host: str,
+                    speed_factor: float) -> None:
+        self.logger.info(f'host {host} runs at {speed_factor:.2f} times the '
+                         f'speed of {reference_host}, to which the times '
+                         'are normalized')
+
+    def failure_summary(self, failures: List[Failure]) -> None:
+        self.logger.warning(f'{len(failures)} run(s) failed:')
+        for failure in failures:
+            instance = (param_point_to_str(failure.param)
+                        if failure.param is not None
+                        else failure.data_file or '')
+            message = failure.message.splitlines()[0]
+            self.logger.warning(
+              f'  instance {failure.instance_index + 1}: {instance} '
+              f'backend: {failure.backend_name} ({failure.attempts} '
+              f'attempt(s)): {message}')
+
+    def outro(self) -> None:
+        self._stop_progress()
+        self._report_progress(force=True)
+        with self._progress_lock:
+            if self._progress_shown:
+                stderr.write('\n')
+                self._progress_shown = False
+        if self.scores is None or len(self.scores.backends) == 0:
+            return
+        summary = self.scores.summary()
+        self.logger.info('scores (s):')
+        name_padding = 1 + max(len(name) for name, _ in summary)
+        for backend_name, entry in summary:
+            self.logger.info(
+              '  backend: ' + f'{backend_name}:'.ljust(name_padding) +
+              f' solved: {entry["solved"]}/{entry["runs"]}' +
+              ''.join(f', PAR-{k}: {entry[f"par{k}"]:.3f}' for k in PAR_KS) +
+              f', geometric mean: {entry["geometric_mean"]:.3f}' +
+              ''.join(f', {stat}/s: {entry[f"{stat}_per_s"]:.0f}'
+                      for stat in ('nodes', 'failures')
+                      if f'{stat}_per_s' in entry))
+
+    def tear_down(self) -> None:
+        self._stop_progress()
+        self._instance_index = None
+        self.scores = None
+        self.progress = None
 
     def exception(self, e: Exception) -> None:
         self.logger.exception(e)
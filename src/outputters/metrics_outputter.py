@@ -0,0 +1,234 @@
+from typing import Union, List, Tuple, Dict
+from ..result import Result
+from ..param_grid import ParamPoint
+from ..progress import Progress
+from .outputter import Outputter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from threading import Thread, Lock
+from os import replace
+from bisect import bisect_left
+from time import monotonic
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+PREFIX = 'run_backends'
+DURATION_BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+LATENCY_BUCKETS = (0.0001, 0.001, 0.01, 0.1, 1)
+# Seconds between rewrites of the metrics file while runs are in flight
+WRITE_INTERVAL = 1.0
+
+
+def escape_label(value: str) -> str:
+    return (value.replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+def labels_to_str(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if len(labels) == 0:
+        return ''
+    return '{' + ','.join(f'{k}="{escape_label(v)}"' for k, v in labels) + '}'
+
+
+class Histogram:
+    buckets: Tuple[float, ...] = ()
+    counts: List[int] = []
+    sum: float = 0.0
+    count: int = 0
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name: str,
+              labels: Tuple[Tuple[str, str], ...]) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket' +
+                         labels_to_str(labels + (('le', str(bound)), )) +
+                         f' {cumulative}')
+        lines.append(f'{name}_bucket' +
+                     labels_to_str(labels + (('le', '+Inf'), )) +
+                     f' {self.count}')
+        lines.append(f'{name}_count{labels_to_str(labels)} {self.count}')
+        lines.append(f'{name}_sum{labels_to_str(labels)} {self.sum}')
+        return lines
+
+
+class MetricsOutputter(Outputter):
+    metrics_file_path: Union[None, str] = None
+    server: Union[None, ThreadingHTTPServer] = None
+    lock: Lock = None
+    progress: Union[None, Progress] = None
+    counters: Dict[str, Dict[Tuple[Tuple[str, str], ...], int]] = {}
+    durations: Dict[str, Histogram] = {}
+    latencies: Dict[Tuple[str, str], Histogram] = {}
+    _last_write: Union[None, float] = None
+
+    def __init__(self, port: Union[None, int] = None,
+                 metrics_file_path: Union[None, str] = None,
+                 host: str = ''):
+        self.metrics_file_path = metrics_file_path
+        self.lock = Lock()
+        self.reset()
+        if port is not None:
+            self.server = ThreadingHTTPServer((host, port),
+                                              self._request_handler())
+            self.server.daemon_threads = True
+            Thread(target=self.server.serve_forever, daemon=True,
+                   name='metrics').start()
+
+    @property
+    def port(self) -> Union[None, int]:
+        return None if self.server is None else self.server.server_address[1]
+
+    def reset(self) -> None:
+        # The counters and histograms only grow over the life of the
+        # outputter, across the models of a campaign and the rounds of
+        # --watch, as rate() takes a drop for a restart
+        with self.lock:
+            self.progress = None
+            self.counters = {name: dict() for name in (
+              'runs', 'timeouts', 'memouts', 'errors', 'exceptions')}
+            self.durations = dict()
+            self.latencies = dict()
+
+    def _request_handler(self):
+        outputter = self
+
+        class MetricsRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = outputter.render().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return MetricsRequestHandler
+
+    def _count(self, name: str,
+               labels: Tuple[Tuple[str, str], ...] = ()) -> None:
+        self.counters[name][labels] = self.counters[name].get(labels, 0) + 1
+
+    def render(self) -> str:
+        with self.lock:
+            lines = []
+            for name, series in self.counters.items():
+                lines.append(f'# TYPE {PREFIX}_{name} counter')
+                for labels, value in series.items():
+                    lines.append(f'{PREFIX}_{name}_total'
+                                 f'{labels_to_str(labels)} {value}')
+            for name, value in (
+                  ('queue_depth', 0 if self.progress is None
+                   else self.progress.num_queued),
+                  ('active_solvers', 0 if self.progress is None
+                   else self.progress.num_running)):
+                lines.append(f'# TYPE {PREFIX}_{name} gauge')
+                lines.append(f'{PREFIX}_{name} {value}')
+            name = f'{PREFIX}_run_duration_seconds'
+            lines.append(f'# TYPE {name} histogram')
+            lines.append(f'# UNIT {name} seconds')
+            for backend_name, histogram in self.durations.items():
+                lines += histogram.lines(name, (('backend', backend_name), ))
+            name = f'{PREFIX}_outputter_latency_seconds'
+            lines.append(f'# TYPE {name} histogram')
+            lines.append(f'# UNIT {name} seconds')
+            for (outputter_name, callback), histogram in (
+                  self.latencies.items()):
+                lines += histogram.lines(name, (('outputter', outputter_name),
+                                                ('callback', callback)))
+            lines.append('# EOF')
+            return '\n'.join(lines) + '\n'
+
+    def write(self, force: bool = True) -> None:
+        if self.metrics_file_path is None:
+            return
+        now = monotonic()
+        if not force and self._last_write is not None and (
+              now - self._last_write < WRITE_INTERVAL):
+            return
+        self._last_write = now
+        tmp_file_path = f'{self.metrics_file_path}.tmp'
+        with open(tmp_file_path, 'w') as metrics_file:
+            metrics_file.write(self.render())
+        replace(tmp_file_path, self.metrics_file_path)
+
+    def set_up(self, param_names: Union[None, Tuple[str, ...]]) -> None:
+        # Only the gauges start over with a new session
+        with self.lock:
+            self.progress = None
+
+    def intro(self, backends: List[Tuple[str, str]], model_name: str,
+              timeout: int, is_csp: bool, vars: List[str],
+              param_names: Union[None, Tuple[str, ...]],
+              is_data_file_run: bool,
+              extra_flags: List[Tuple[str, str]]) -> None:
+        with self.lock:
+            self.progress = Progress(timeout)
+
+    def pre_run(self, backend_id: str, backend_name: str, backend_index: int,
+                num_backends: int, instance_index: int, num_instances: int,
+                param: Union[None, ParamPoint],
+                data_file: Union[None, str]) -> None:
+        with self.lock:
+            self.progress.started(backend_name, num_instances * num_backends)
+        self.write(force=False)
+
+    def post_run(self, backend_id: str, backend_name: str, backend_index: int,
+                 num_backends: int, instance_index: int, num_instances: int,
+                 param: Union[None, ParamPoint],
+                 data_file: Union[None, str],
+                 result: Result) -> None:
+        labels = (('backend', backend_name), )
+        with self.lock:
+            self.progress.finished(backend_name, result)
+            self._count('runs', labels)
+            if result.error:
+                self._count('errors', labels)
+            elif result.mem_out:
+                self._count('memouts', labels)
+            elif result.timed_out:
+                self._count('timeouts', labels)
+            if backend_name not in self.durations:
+                self.durations[backend_name] = Histogram(DURATION_BUCKETS)
+            self.durations[backend_name].observe(result.time.total_seconds())
+        self.write(force=False)
+
+    def outputter_latency(self, outputter_name: str, callback: str,
+                          seconds: float) -> None:
+        key = (outputter_name, callback)
+        with self.lock:
+            if key not in self.latencies:
+                self.latencies[key] = Histogram(LATENCY_BUCKETS)
+            self.latencies[key].observe(seconds)
+
+    def outro(self) -> None:
+        self.write()
+
+    def tear_down(self) -> None:
+        self.write()
+
+    def exception(self, e: Exception) -> None:
+        with self.lock:
+            self._count('exceptions')
+        self.write()
+
+    def close(self) -> None:
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
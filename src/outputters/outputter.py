@@ -1,34 +1,85 @@
-from typing import Union, List, Tuple
+from typing import Union, List, Tuple, Dict, Any
 from ..result import Result
+from ..param_grid import ParamPoint
+from ..scaling import ScalingEntry
+from ..faults import Failure
+from ..planner import Plan
 
 
 class Outputter:
-    def set_up(self, param_name: Union[None, str]) -> None:
+    def set_up(self, param_names: Union[None, Tuple[str, ...]]) -> None:
         pass
 
     def intro(self, backends: List[Tuple[str, str]], model_name: str,
               timeout: int, is_csp: bool, vars: List[str],
-              param: Union[None, Tuple[str, int]],
+              param_names: Union[None, Tuple[str, ...]],
               is_data_file_run: bool,
               extra_flags: List[Tuple[str, str]]) -> None:
         pass
 
     def pre_run(self, backend_id: str, backend_name: str, backend_index: int,
                 num_backends: int, instance_index: int, num_instances: int,
-                param: Union[None, Tuple[str, int]],
+                param: Union[None, ParamPoint],
                 data_file: Union[None, str]) -> None:
         pass
 
     def post_run(self, backend_id: str, backend_name: str, backend_index: int,
                  num_backends: int, instance_index: int, num_instances: int,
-                 param: Union[None, Tuple[str, int]],
+                 param: Union[None, ParamPoint],
                  data_file: Union[None, str],
                  result: Result) -> None:
         pass
 
-    def instance(self, results: List[Result],
-                 param: Union[None, Tuple[str, int]],
-                 data_file: Union[None, str]) -> None:
+    def instance(self, results: List[Union[None, Result]],
+                 param: Union[None, ParamPoint],
+                 data_file: Union[None, str], instance_index: int) -> None:
+        pass
+
+    def calibration(self, host: str, reference_host: str,
+                    speed_factor: float) -> None:
+        pass
+
+    def timeout_level(self, level: int, num_levels: int, timeout: int,
+                      num_cells: int) -> None:
+        pass
+
+    def backends_selected(self, instance_index: int,
+                          param: Union[None, ParamPoint],
+                          data_file: Union[None, str],
+                          backend_names: List[str]) -> None:
+        pass
+
+    def files_changed(self, file_paths: List[str],
+                      num_instances: int) -> None:
+        pass
+
+    def backend_eliminated(self, backend_name: str, instance_index: int,
+                           num_instances: int, mean_rank: float,
+                           best_backend_name: str, best_mean_rank: float,
+                           p_value: float) -> None:
+        pass
+
+    def scaling_instance(self, entries: List[ScalingEntry],
+                         param: Union[None, ParamPoint],
+                         data_file: Union[None, str]) -> None:
+        pass
+
+    def scaling_summary(self, summary: List[Tuple[str, int, int,
+                                                  Union[None, float],
+                                                  Union[None, float]]]
+                        ) -> None:
+        pass
+
+    def sweep_summary(self, param_name: str,
+                      frontiers: List[Tuple[str, Union[None, int]]],
+                      num_runs: int) -> None:
+        pass
+
+    def selector_summary(self, num_instances: int,
+                         evaluation: Dict[str, Any]) -> None:
+        pass
+
+    def plan_summary(self, plans: List[Plan]) -> None:
         pass
 
     def outro(self) -> None:
@@ -39,3 +90,10 @@ class Outputter:
 
     def exception(self, e: Exception) -> None:
         pass
+
+    def failure_summary(self, failures: List[Failure]) -> None:
+        pass
+
+    def outputter_latency(self, outputter_name: str, callback: str,
+                          seconds: float) -> None:
+        pass
@@ -1,5 +1,6 @@
 from typing import Union, Tuple
 from ..result import Result
+from ..param_grid import ParamPoint
 from ..plot import Plot
 from .outputter import Outputter
 
@@ -11,20 +12,20 @@ class PlotOutputter(Outputter):
     def __init__(self, plot_file_path: str):
         self.plot_file_path = plot_file_path
 
-    def set_up(self, param_name: Union[None, str]) -> None:
-        if param_name is None:
+    def set_up(self, param_names: Union[None, Tuple[str, ...]]) -> None:
+        if param_names is None:
             self.plot: Plot = Plot()
         else:
-            self.plot: Plot = Plot(param_name)
+            self.plot: Plot = Plot(', '.join(param_names))
 
     def post_run(self, backend_id: str, backend_name: str, backend_index: int,
                  num_backends: int, instance_index: int, num_instances: int,
-                 param: Union[None, Tuple[str, int]],
+                 param: Union[None, ParamPoint],
                  data_file: Union[None, str],
                  result: Result) -> None:
         name: str = ''
         if param is not None:
-            name = str(param[1])
+            name = ', '.join(str(value) for _, value in param)
         elif data_file is not None:
             name = data_file
         self.plot.add_result(backend_name, name, result)
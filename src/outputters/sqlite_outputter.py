@@ -0,0 +1,151 @@
+from typing import Union, List, Tuple, Dict, Any
+from ..result import Result
+from ..param_grid import ParamPoint, param_point_to_str
+from ..warehouse import Warehouse, file_hash, text_hash, log_cost
+from ..aux import get_solver_version
+from .outputter import Outputter
+from datetime import datetime
+from socket import gethostname
+from json import dumps
+from os import path
+
+
+def result_status(result: Result) -> str:
+    if result.error:
+        return 'ERROR'
+    if result.mem_out:
+        return 'MEMOUT'
+    if result.unsat:
+        return 'UNSAT'
+    if result.optimal_solution:
+        return 'OPTIMAL'
+    if result.all_solutions:
+        return 'ALL'
+    if result.sat:
+        return 'SAT'
+    return 'TIMEOUT' if result.timed_out else 'UNKNOWN'
+
+
+class SqliteOutputter(Outputter):
+    db_path: str = ''
+    campaign: Union[None, str] = None
+    host: str = ''
+    backend_config: Dict[str, Any] = {}
+    warehouse: Union[None, Warehouse] = None
+    campaign_id: Union[None, int] = None
+    model_hash: str = ''
+    timeout: Union[None, int] = None
+    extra_flags: Dict[str, str] = {}
+    solver_versions: Dict[str, str] = {}
+    instance_ids: Dict[str, int] = {}
+    runs: List[Tuple[Any, ...]] = []
+
+    def __init__(self, db_path: str, campaign: Union[None, str] = None,
+                 backend_config: Union[None, Dict[str, Any]] = None,
+                 host: Union[None, str] = None):
+        self.db_path = db_path
+        self.campaign = campaign
+        self.backend_config = backend_config or dict()
+        self.host = gethostname() if host is None else host
+        self.solver_versions = dict()
+        self.instance_ids = dict()
+        self.runs = []
+
+    def set_up(self, param_names: Union[None, Tuple[str, ...]]) -> None:
+        self.warehouse = Warehouse(self.db_path)
+        self.campaign_id = None
+        self.timeout = None
+        self.instance_ids = dict()
+        self.runs = []
+
+    def intro(self, backends: List[Tuple[str, str]], model_name: str,
+              timeout: int, is_csp: bool, vars: List[str],
+              param_names: Union[None, Tuple[str, ...]],
+              is_data_file_run: bool,
+              extra_flags: List[Tuple[str, str]]) -> None:
+        started = datetime.now().isoformat(timespec='seconds')
+        self.model_hash = file_hash(model_name)
+        self.extra_flags = dict(extra_flags or dict())
+        self.campaign_id = self.warehouse.add_campaign(
+          self.campaign or f'{path.basename(model_name)} {self.host} '
+                           f'{started}',
+          started, self.host, model_name, self.model_hash)
+        # A timeout ladder announces its first timeout before the intro
+        if self.timeout is None:
+            self.timeout = timeout
+
+    def timeout_level(self, level: int, num_levels: int, timeout: int,
+                      num_cells: int) -> None:
+        self.timeout = timeout
+
+    def _solver_version(self, backend_id: str) -> str:
+        # The virtual backends of a thread scaling study are named
+        # <backend id>@<threads>, those of a proof study
+        # <backend id>#<proof mode>, and those of flag variants
+        # <backend id>~<variant>
+        real_id = backend_id.split('#')[0].split('~')[0].split('@')[0]
+        if real_id not in self.solver_versions:
+            self.solver_versions[real_id] = get_solver_version(real_id)
+        return self.solver_versions[real_id]
+
+    def _flags(self, backend_id: str) -> str:
+        backend_id, _, mode = backend_id.partition('#')
+        backend_id, _, variant = backend_id.partition('~')
+        real_id, _, threads = backend_id.partition('@')
+        flags = dict(self.backend_config.get(real_id, dict()).get('extra',
+                                                                  dict()),
+                     **self.extra_flags)
+        if threads != '':
+            flags.pop('--parallel', None)
+            flags['-p'] = threads
+        if mode != '':
+            flags['bound'] = mode
+        if variant != '':
+            flags['variant'] = variant
+        return dumps(flags, sort_keys=True)
+
+    def _instance_id(self, instance: str, data_file: Union[None, str]) -> int:
+        # Data files are identified by their contents, so that instances
+        # are paired across campaigns that moved or renamed them
+        if instance not in self.instance_ids:
+            self.instance_ids[instance] = self.warehouse.add_instance(
+              self.model_hash,
+              text_hash(instance) if data_file is None or
+              not path.isfile(data_file) else file_hash(data_file),
+              instance)
+        return self.instance_ids[instance]
+
+    def post_run(self, backend_id: str, backend_name: str, backend_index: int,
+                 num_backends: int, instance_index: int, num_instances: int,
+                 param: Union[None, ParamPoint],
+                 data_file: Union[None, str],
+                 result: Result) -> None:
+        instance = ('' if param is None and data_file is None else
+                    param_point_to_str(param) if param is not None
+                    else data_file)
+        time = int(result.time.total_seconds() * 1000)
+        timeout = self.timeout if result.timeout is None else result.timeout
+        objective = result.objective if result.is_cop else None
+        self.runs.append((
+          self.campaign_id, self._instance_id(instance, data_file),
+          backend_id, backend_name,
+          self._solver_version(backend_id), self._flags(backend_id),
+          result.host or self.host, result.method.name.lower(),
+          timeout, result_status(result), int(result.solved), time,
+          log_cost(time, result.solved, timeout),
+          None if objective is None else float(objective),
+          result.speed_factor))
+
+    def instance(self, results: List[Union[None, Result]],
+                 param: Union[None, ParamPoint],
+                 data_file: Union[None, str], instance_index: int) -> None:
+        # The runs of an instance are inserted in one transaction
+        self.warehouse.add_runs(self.runs)
+        self.runs = []
+
+    def tear_down(self) -> None:
+        if self.warehouse is not None:
+            self.warehouse.add_runs(self.runs)
+            self.warehouse.close()
+            self.warehouse = None
+        self.runs = []
@@ -1,5 +1,6 @@
 from typing import Dict, Any, Union, List, Tuple
 from ..result import Result
+from ..param_grid import ParamPoint
 from .outputter import Outputter
 from json import dump
 from datetime import timedelta
@@ -21,12 +22,12 @@ class TestCreatorOutputter(Outputter):
     def __init__(self, json_file_path: Union[None, str] = None):
         self.json_file_path = json_file_path
 
-    def set_up(self, param_name: Union[None, str]) -> None:
+    def set_up(self, param_names: Union[None, Tuple[str, ...]]) -> None:
         self.json_data = dict()
 
     def intro(self, backends: List[Tuple[str, str]], model_name: str,
               timeout: int, is_csp: bool, vars: List[str],
-              param: Union[None, Tuple[str, int]],
+              param_names: Union[None, Tuple[str, ...]],
               is_data_file_run: bool,
               extra_flags: List[Tuple[str, str]]) -> None:
         self.json_data['backends'] = backends.copy()
@@ -34,7 +35,8 @@ class TestCreatorOutputter(Outputter):
         self.json_data['timeout'] = timeout
         self.json_data['is_csp'] = is_csp
         self.json_data['vars'] = vars.copy()
-        self.json_data['param'] = param
+        self.json_data['param_names'] = (
+          None if param_names is None else list(param_names))
         self.json_data['is_data_file_run'] = is_data_file_run
         self.json_data['extra_flags'] = extra_flags.copy()
         self.json_data['runs'] = []
@@ -43,45 +45,45 @@ class TestCreatorOutputter(Outputter):
 
     def pre_run(self, backend_id: str, backend_name: str, backend_index: int,
                 num_backends: int, instance_index: int, num_instances: int,
-                param: Union[None, Tuple[str, int]],
+                param: Union[None, ParamPoint],
                 data_file: Union[None, str]) -> None:
         self.json_data['num_instances'] = num_instances
-        if backend_index == 0:
-            assert len(self.runs) == instance_index
-        else:
-            assert len(self.runs) == instance_index + 1
-        if backend_index == 0:
-            self.runs.append({
-              'instance_index': instance_index,
-              'param_name': None if param is None else param[0],
-              'param_value': None if param is None else param[1],
-              'data_file': data_file,
-              'results': []})
 
-    def instance(self, results: List[Result],
-                 param: Union[None, Tuple[str, int]],
-                 data_file: Union[None, str]) -> None:
-        pn, pv = param if param is not None else (None, None)
-        assert self.last_run['param_name'] == pn
-        assert self.last_run['param_value'] == pv
-        assert self.last_run['data_file'] == data_file
+    def instance(self, results: List[Union[None, Result]],
+                 param: Union[None, ParamPoint],
+                 data_file: Union[None, str], instance_index: int) -> None:
+        # Runs are recorded once their row is complete, as a timeout ladder
+        # completes its rows only after rerunning their cells
+        self.runs.append({
+          'instance_index': instance_index,
+          'params': None if param is None else [list(p) for p in param],
+          'data_file': data_file,
+          'results': []})
 
         results_data = []
         for result in results:
-            results_data.append(result.__dict__)
+            if result is None:
+                results_data.append(None)
+                continue
+            # Copy, as the results are still used after this outputter
+            results_data.append(dict(result.__dict__))
             res_data = results_data[-1]
             assert isinstance(res_data['method'], Method)
             res_data['method'] = res_data['method'].name
+            if isinstance(res_data.get('wall_time', None), timedelta):
+                res_data['wall_time'] = (
+                  res_data['wall_time'].total_seconds() * 1000)
             if result._result is None:
                 continue
-            res_data['_result'] = res_data['_result'].__dict__
+            res_data['_result'] = dict(res_data['_result'].__dict__)
             inner = res_data['_result']
             assert 'status' in inner and isinstance(inner['status'], Status)
             inner['status'] = inner['status'].name
             if inner.get('solution', None) is not None:
-                inner['solution'] = inner['solution'].__dict__
+                inner['solution'] = dict(inner['solution'].__dict__)
             if inner.get('statistics', None) is None:
                 continue
+            inner['statistics'] = dict(inner['statistics'])
             stats: Dict[str, Any] = inner['statistics']
             for key, value in stats.items():
                 if isinstance(value, timedelta):
@@ -1,5 +1,8 @@
-from typing import Union, List, Tuple
+from typing import Union, List, Tuple, Dict, Any
 from ..result import Result
+from ..param_grid import ParamPoint
+from ..planner import Plan
+from ..progress import seconds_to_str
 from .outputter import Outputter
 from datetime import datetime
 from os import path
@@ -27,8 +30,8 @@ def result_to_output(result: Result, best_result: Result,
                   if result.compare(best_result) <= 0 and not single_result
                   else f'{result.objective}')))
 
-    time = 't/o'
-    if not result.timed_out:
+    time = 'm/o' if result.mem_out else 't/o'
+    if not result.limit_reached:
         ms = int(result.time.total_seconds() * 1000)
         time = (f'\\textbf{{{ms}}}'
                 if result.compare_time(best_result) <= 0 and not single_result
@@ -58,7 +61,7 @@ class TexOutputter(Outputter):
 
     def intro(self, backends: List[Tuple[str, str]], model_name: str,
               timeout: int, is_csp: bool, vars: List[str] = [],
-              param: Union[None, Tuple[str, int]] = None,
+              param_names: Union[None, Tuple[str, ...]] = None,
               is_data_file_run: bool = False,
               extra_flags: List[Tuple[str, str]] = []) -> None:
 
@@ -79,9 +82,10 @@ class TexOutputter(Outputter):
 
         # Instance header line (instance or param = value)
         instance_caption = ''
-        if param is not None:
-            assert isinstance(param[0], str)
-            instance_caption = '\\texttt{' + param[0].replace('_', '\\_') + '}'
+        if param_names is not None:
+            instance_caption = ', '.join(
+              '\\texttt{' + name.replace('_', '\\_') + '}'
+              for name in param_names)
         elif is_data_file_run:
             instance_caption = 'instance'
         lines.append(instance_caption)
@@ -106,22 +110,25 @@ class TexOutputter(Outputter):
 
         self.print('\n'.join(lines))
 
-    def instance(self, results: List[Result],
-                 param: Union[None, Tuple[str, int]],
-                 data_file: Union[None, str]) -> None:
+    def instance(self, results: List[Union[None, Result]],
+                 param: Union[None, ParamPoint],
+                 data_file: Union[None, str], instance_index: int) -> None:
         if len(results) == 0:
             return
 
         lines: List[str] = []
 
         if param is not None:
-            lines.append(f'${param[1]}$')
+            lines.append(
+              '$' + ', '.join(str(value) for _, value in param) + '$')
         elif data_file is not None:
             file_name = path.splitext(path.split(data_file)[1])[0]
             lines.append(file_name.replace('_', '\\_'))
 
         best_r: Union[None, Result] = None
         for r in results:
+            if r is None:
+                continue
             if best_r is None:
                 best_r = r
             if r.compare_obj(best_r) < 0:
@@ -129,14 +136,81 @@ class TexOutputter(Outputter):
             elif r.compare_obj(best_r) == 0 and r.compare_time(best_r) < 0:
                 best_r = r
 
-        lines += ['\t& ' + result_to_output(r, best_r, len(results) == 1,
-                                            self.monospace_font)
+        # Backends eliminated by a race span their two columns with a dash
+        em_dash = '-' if self.monospace_font else '--'
+        lines += [(f'\t& \\multicolumn{{2}}{{c}}{{{em_dash}}}' if r is None
+                   else '\t& ' + result_to_output(
+                     r, best_r, len(results) == 1, self.monospace_font))
                   for r in results]
 
         lines.append('\\\\')
 
         self.print('\n'.join(lines))
 
+    def files_changed(self, file_paths: List[str],
+                      num_instances: int) -> None:
+        # The table of a rerun replaces the previous one
+        if self.tex_file_path is not None:
+            open(self.tex_file_path, 'w').close()
+
+    def backend_eliminated(self, backend_name: str, instance_index: int,
+                           num_instances: int, mean_rank: float,
+                           best_backend_name: str, best_mean_rank: float,
+                           p_value: float) -> None:
+        self.print(f'% {backend_name} eliminated after {num_instances} '
+                   f'instances: mean rank {mean_rank:.2f} against '
+                   f'{best_mean_rank:.2f} of {best_backend_name} '
+                   f'(Friedman test p = {p_value:.4f})')
+
+    def scaling_summary(self, summary: List[Tuple[str, int, int,
+                                                  Union[None, float],
+                                                  Union[None, float]]]
+                        ) -> None:
+        lines = ['% thread scaling (geometric mean over solved instances)']
+        lines += [f'% {backend_name} p={threads}: ' +
+                  ('--' if speedup is None else
+                   f'speedup {speedup:.2f}, efficiency {efficiency:.2f}')
+                  for backend_name, threads, _, speedup, efficiency
+                  in summary]
+        self.print('\n'.join(lines))
+
+    def sweep_summary(self, param_name: str,
+                      frontiers: List[Tuple[str, Union[None, int]]],
+                      num_runs: int) -> None:
+        lines = [f'% adaptive sweep over {param_name} ({num_runs} runs)']
+        lines += [f'% largest {param_name} solved by {backend_name}: ' +
+                  ('--' if value is None else str(value))
+                  for backend_name, value in frontiers]
+        self.print('\n'.join(lines))
+
+    def selector_summary(self, num_instances: int,
+                         evaluation: Dict[str, Any]) -> None:
+        lines = [f'% selector trained on {num_instances} instances, '
+                 f'{evaluation["instances"]} with runs of all backends']
+        if evaluation['instances'] > 0:
+            gap_closed = evaluation['gap_closed']
+            lines += [
+              f'% selector PAR-10: {evaluation["selector_par10"]:.3f}s',
+              '% virtual best PAR-10: '
+              f'{evaluation["virtual_best_par10"]:.3f}s',
+              f'% single best ({evaluation["single_best"]}) PAR-10: '
+              f'{evaluation["single_best_par10"]:.3f}s',
+              '% gap closed: ' +
+              ('--' if gap_closed is None else f'{gap_closed:.1%}')]
+        self.print('\n'.join(lines))
+
+    def plan_summary(self, plans: List[Plan]) -> None:
+        lines = [f'% plan of {plans[0].num_cells} runs, '
+                 f'{plans[0].num_unseen} of them estimated from other '
+                 'instances']
+        lines += [f'% --jobs {p.num_jobs} on {p.num_cores} cores: makespan '
+                  f'{seconds_to_str(p.makespan)} (90%: '
+                  f'{seconds_to_str(p.makespan_quantile(0.9))}), '
+                  f'{p.cpu_hours:.2f} CPU-hours, '
+                  f'{p.timeout_share:.1%} timeouts'
+                  for p in plans]
+        self.print('\n'.join(lines))
+
     def outro(self) -> None:
         self.print('% table generation ended ' +
                    datetime.today().strftime('%Y-%m-%d %H:%M:%S'))
@@ -0,0 +1,50 @@
+from typing import List, Tuple, Iterator
+from itertools import product
+from functools import reduce
+
+ParamPoint = Tuple[Tuple[str, int], ...]
+
+
+class ParamRange:
+    name: str = ''
+    start: int = 0
+    stop: int = 0
+    increment: int = 1
+
+    def __init__(self, name: str, start: int, stop: int, increment: int):
+        self.name = name
+        self.start = start
+        self.stop = stop
+        self.increment = increment
+
+    @property
+    def values(self) -> range:
+        increment = 1 if self.start == self.stop else self.increment
+        stop = (self.stop - 1) if increment < 0 else (self.stop + 1)
+        return range(self.start, stop, increment)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class ParamGrid:
+    ranges: List[ParamRange] = []
+
+    def __init__(self, ranges: List[ParamRange]):
+        self.ranges = ranges
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return tuple(r.name for r in self.ranges)
+
+    def __len__(self) -> int:
+        return reduce(lambda n, r: n * len(r), self.ranges, 1)
+
+    def __iter__(self) -> Iterator[ParamPoint]:
+        names = self.names
+        for values in product(*(r.values for r in self.ranges)):
+            yield tuple(zip(names, values))
+
+
+def param_point_to_str(param: ParamPoint, separator: str = ', ') -> str:
+    return separator.join(f'{name} = {value}' for name, value in param)
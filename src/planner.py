@@ -0,0 +1,236 @@
+from typing import List, Dict, Set, Tuple, Union, Iterable, Any
+from math import inf, ceil
+from random import Random
+from heapq import heappush, heappop
+from json import load
+from os import path
+from .param_grid import ParamPoint
+from .selector import InstanceKey
+from .scheduler import CoreScheduler
+
+# A planned cell is (cores, possible runtimes in seconds)
+PlanCell = Tuple[int, List[float]]
+
+
+def run_runtime(run: Dict[str, Any]) -> float:
+    # The wall time in seconds of a run of the JSON output. A run that
+    # reached its timeout is infinite, as it is not known whether it would
+    # have finished within a larger timeout.
+    if run['timed_out']:
+        return inf
+    time = run.get('wall_time', None)
+    return (run['time'] if time is None else time) / 1000
+
+
+class History:
+    runtimes: Dict[InstanceKey, Dict[str, List[float]]] = {}
+    named_runtimes: Dict[InstanceKey, Dict[str, List[float]]] = {}
+    backend_runtimes: Dict[str, List[float]] = {}
+    all_runtimes: List[float] = []
+
+    def __init__(self, json_paths: Iterable[str] = ()):
+        self.runtimes = dict()
+        self.named_runtimes = dict()
+        self.backend_runtimes = dict()
+        self.all_runtimes = []
+        for json_path in json_paths:
+            self.load(json_path)
+
+    @staticmethod
+    def _key(param: Union[None, ParamPoint], data_file: Union[None, str]
+             ) -> InstanceKey:
+        return None if param is None else tuple(param), data_file
+
+    @staticmethod
+    def _named_key(param: Union[None, ParamPoint],
+                   data_file: Union[None, str]) -> InstanceKey:
+        # Data files are also matched by their names, so that the runs of a
+        # campaign in another directory are found
+        return (None if param is None else tuple(param),
+                None if data_file is None else path.basename(data_file))
+
+    def load(self, json_path: str) -> None:
+        # Later runs of the same instance and backend of a file (as of a
+        # timeout ladder) replace earlier ones, while the runs of several
+        # files are all kept as possible runtimes
+        with open(json_path, 'r') as json_file:
+            runs = load(json_file)['runs']
+        latest: Dict[Tuple[InstanceKey, str], Dict[str, Any]] = dict()
+        for run in runs:
+            param = run.get('param', None)
+            param = None if param is None else tuple(param.items())
+            latest[(param, run['data_file']), run['backend_name']] = run
+        for ((param, data_file), backend_name), run in latest.items():
+            self.add(param, data_file, backend_name, run_runtime(run))
+
+    def add(self, param: Union[None, ParamPoint],
+            data_file: Union[None, str], backend_name: str,
+            runtime: float) -> None:
+        self.runtimes.setdefault(self._key(param, data_file), dict()
+                                 ).setdefault(backend_name, []).append(runtime)
+        self.named_runtimes.setdefault(
+          self._named_key(param, data_file), dict()
+        ).setdefault(backend_name, []).append(runtime)
+        self.backend_runtimes.setdefault(backend_name, []).append(runtime)
+        self.all_runtimes.append(runtime)
+
+    def estimate(self, param: Union[None, ParamPoint],
+                 data_file: Union[None, str], backend_name: str
+                 ) -> Tuple[List[float], bool]:
+        # The possible runtimes of a cell, and whether they are runs of its
+        # instance. Otherwise, the runs of its backend (or of all backends)
+        # on other instances are used, and a cell without any history is
+        # expected to reach its timeout.
+        for runtimes, key in (
+              (self.runtimes, self._key(param, data_file)),
+              (self.named_runtimes, self._named_key(param, data_file))):
+            if backend_name in runtimes.get(key, dict()):
+                return runtimes[key][backend_name], True
+        if backend_name in self.backend_runtimes:
+            return self.backend_runtimes[backend_name], False
+        if len(self.all_runtimes) > 0:
+            return self.all_runtimes, False
+        return [inf], False
+
+
+class Plan:
+    num_jobs: int = 1
+    num_cores: int = 1
+    num_cells: int = 0
+    num_unseen: int = 0
+    makespans: List[float] = []
+    cpu_seconds: float = 0.0
+    timeout_share: float = 0.0
+
+    def __init__(self, num_jobs: int, num_cores: int, num_cells: int,
+                 num_unseen: int, makespans: List[float],
+                 cpu_seconds: float, timeout_share: float):
+        self.num_jobs = num_jobs
+        self.num_cores = num_cores
+        self.num_cells = num_cells
+        self.num_unseen = num_unseen
+        self.makespans = sorted(makespans)
+        self.cpu_seconds = cpu_seconds
+        self.timeout_share = timeout_share
+
+    @property
+    def makespan(self) -> float:
+        return sum(self.makespans) / max(1, len(self.makespans))
+
+    def makespan_quantile(self, q: float) -> float:
+        if len(self.makespans) == 0:
+            return 0.0
+        return self.makespans[min(len(self.makespans) - 1,
+                                  max(0, ceil(q * len(self.makespans)) - 1))]
+
+    @property
+    def cpu_hours(self) -> float:
+        return self.cpu_seconds / 3600
+
+
+def replay(cells: List[PlanCell], runtimes: List[float],
+           indices: List[int], limits: List[float],
+           scheduler: CoreScheduler, now: float) -> Tuple[float, float]:
+    # Replays the scheduling of BackendRunner._run_cells_parallel for the
+    # given cells from now on: after every finished cell, the scheduler
+    # picks from the upcoming cells of the lookahead window. Returns the
+    # time the last cell finished and the core seconds.
+    upcoming = iter(indices)
+    core_seconds = 0.0
+    # (position, cell index) of the waiting cells
+    waiting: List[Tuple[int, int]] = []
+    # (actual end, cores, expected end, position) of the running cells
+    running: List[Tuple[float, int, float, int]] = []
+    # The positions of the cells read and of the first one that did not
+    # finish yet, as the runner reports the cells in order
+    num_read = 0
+    next_position = 0
+    finished: Set[int] = set()
+    exhausted = False
+    while True:
+        for _ in range(scheduler.admit(len(waiting),
+                                       num_read - next_position)):
+            cell_index = next(upcoming, None)
+            if cell_index is None:
+                exhausted = True
+                break
+            waiting.append((num_read, cell_index))
+            num_read += 1
+        selected = scheduler.select(
+          [(cells[i][0], limits[i]) for _, i in waiting],
+          [(cores, end) for _, cores, end, _ in running], now)
+        for index in selected:
+            position, cell_index = waiting[index]
+            cores = cells[cell_index][0]
+            duration = min(runtimes[cell_index], limits[cell_index])
+            heappush(running, (now + duration, cores,
+                               now + limits[cell_index], position))
+            core_seconds += duration * cores
+        selected = set(selected)
+        waiting = [c for i, c in enumerate(waiting) if i not in selected]
+        if len(running) == 0:
+            if len(waiting) == 0 and exhausted:
+                break
+            continue
+        now = running[0][0]
+        while len(running) > 0 and running[0][0] <= now:
+            finished.add(heappop(running)[3])
+        while next_position in finished:
+            finished.remove(next_position)
+            next_position += 1
+    return now, core_seconds
+
+
+def simulate(cells: List[PlanCell], timeouts: List[float],
+             scheduler: CoreScheduler, rng: Random,
+             cell_timeouts: Union[None, List[float]] = None,
+             chunk_sizes: Union[None, List[int]] = None
+             ) -> Tuple[float, float, int]:
+    # Draws a runtime for each cell and replays the runs of
+    # BackendRunner._run_rows. A ladder runs a chunk of cells (of the given
+    # sizes, all of them by default) with each timeout in turn, rerunning
+    # the cells that timed out, before the next chunk. cell_timeouts are
+    # the timeouts of the backends of the cells, which scale the ladder
+    # that ends at the largest of the timeouts.
+    # Returns the makespan, the core seconds and the number of timeouts.
+    runtimes = [rng.choice(r) for _, r in cells]
+    now = 0.0
+    core_seconds = 0.0
+    num_timeouts = 0
+    start = 0
+    for chunk_size in (chunk_sizes or [len(cells)]):
+        pending = list(range(start, start + chunk_size))
+        start += chunk_size
+        for timeout in timeouts:
+            limits = ([timeout] * len(cells) if cell_timeouts is None else
+                      [timeout * t / timeouts[-1] for t in cell_timeouts])
+            now, seconds = replay(cells, runtimes, pending, limits,
+                                  scheduler, now)
+            core_seconds += seconds
+            pending = [i for i in pending if runtimes[i] > limits[i]]
+        num_timeouts += len(pending)
+    return now, core_seconds, num_timeouts
+
+
+def plan(cells: List[PlanCell], num_unseen: int, timeouts: List[float],
+         num_jobs: int, num_cores: int, num_simulations: int = 20,
+         seed: int = 0,
+         cell_timeouts: Union[None, List[float]] = None,
+         chunk_sizes: Union[None, List[int]] = None) -> Plan:
+    # Monte Carlo estimate over num_simulations draws of the runtimes
+    scheduler = CoreScheduler(num_jobs, num_cores)
+    rng = Random(seed)
+    makespans: List[float] = []
+    core_seconds = 0.0
+    num_timeouts = 0
+    for _ in range(max(1, num_simulations)):
+        makespan, seconds, timeouts_reached = simulate(
+          cells, timeouts, scheduler, rng, cell_timeouts, chunk_sizes)
+        makespans.append(makespan)
+        core_seconds += seconds
+        num_timeouts += timeouts_reached
+    num_runs = max(1, num_simulations) * max(1, len(cells))
+    return Plan(scheduler.num_jobs, scheduler.num_cores, len(cells),
+                num_unseen, makespans,
+                core_seconds / max(1, num_simulations),
+                num_timeouts / num_runs)
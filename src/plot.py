@@ -1,7 +1,6 @@
 from typing import List, Tuple, Union, Dict
 from .result import Result
 import logging
-import matplotlib.pyplot as plt
 from math import log10
 
 
@@ -83,6 +82,8 @@ class Plot:
     def save_plt(self, plot_filename: str) -> None:
         if len(self.plot_lines) == 0:
             return
+        # Importing matplotlib is slow, so it is only done when plotting
+        import matplotlib.pyplot as plt
         plt.rcParams['figure.figsize'] = (10, 4)
         if len(self.xlabel) > 0:
             plt.xlabel(self.xlabel, fontsize=10)
@@ -0,0 +1,131 @@
+from typing import List, Dict, Union, Callable
+from time import monotonic
+from os import times
+from .result import Result
+
+
+def seconds_to_str(seconds: float) -> str:
+    seconds = int(seconds)
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    if days > 0:
+        return f'{days}d{hours:02d}h{minutes:02d}m'
+    if hours > 0:
+        return f'{hours}h{minutes:02d}m'
+    return f'{minutes}m{seconds:02d}s'
+
+
+class BackendProgress:
+    num_runs: int = 0
+    num_limit_reached: int = 0
+    solved_time: float = 0.0
+    # The timeouts of the runs that reached their own timeout, as backends
+    # can have their own, and their number
+    limit_time: float = 0.0
+    num_own_limits: int = 0
+
+    def add(self, result: Result) -> None:
+        self.num_runs += 1
+        if not result.limit_reached:
+            self.solved_time += result.time.total_seconds()
+            return
+        self.num_limit_reached += 1
+        if result.timeout is not None:
+            self.limit_time += result.timeout / 1000
+            self.num_own_limits += 1
+
+    def expected_time(self, timeout: float) -> float:
+        # Unobserved backends, and runs without their own timeout, are
+        # assumed to run into the given timeout
+        if self.num_runs == 0:
+            return timeout
+        return ((self.num_limit_reached - self.num_own_limits) * timeout +
+                self.limit_time + self.solved_time) / self.num_runs
+
+
+class Progress:
+    timeout: float = 0.0
+    num_cells: int = 0
+    num_completed: int = 0
+    num_running: int = 0
+    backends: Dict[str, BackendProgress] = {}
+    start_time: float = 0.0
+    start_cpu_time: float = 0.0
+    # The start times of the running cells, oldest first
+    running_since: List[float] = []
+    clock: Callable[[], float] = monotonic
+
+    def __init__(self, timeout: int, clock: Callable[[], float] = monotonic):
+        # The timeout is given in milliseconds
+        self.timeout = timeout / 1000
+        self.backends = dict()
+        self.running_since = []
+        self.clock = clock
+        self.start_time = clock()
+        self.start_cpu_time = self.cpu_time()
+
+    @staticmethod
+    def cpu_time() -> float:
+        t = times()
+        return t.user + t.system + t.children_user + t.children_system
+
+    @property
+    def elapsed(self) -> float:
+        return self.clock() - self.start_time
+
+    @property
+    def num_queued(self) -> int:
+        return max(0, self.num_cells - self.num_completed - self.num_running)
+
+    @property
+    def throughput(self) -> float:
+        return 3600 * self.num_completed / max(self.elapsed, 0.001)
+
+    @property
+    def cpu_utilisation(self) -> float:
+        return ((self.cpu_time() - self.start_cpu_time) /
+                max(self.elapsed, 0.001))
+
+    @property
+    def eta(self) -> Union[None, float]:
+        # The expected work of the cells left, less the work the running
+        # cells did so far, so that the ETA counts down during long runs
+        if self.num_cells == 0 or len(self.backends) == 0:
+            return None
+        remaining = self.num_cells - self.num_completed
+        work = sum(b.expected_time(self.timeout)
+                   for b in self.backends.values()) / len(self.backends)
+        now = self.clock()
+        done = sum(min(now - since, work) for since in self.running_since)
+        return max(0.0, remaining * work - done) / max(1, self.num_running)
+
+    def started(self, backend_name: str, num_cells: int) -> None:
+        self.num_cells = max(self.num_cells, num_cells)
+        self.num_running += 1
+        self.running_since.append(self.clock())
+        if backend_name not in self.backends:
+            self.backends[backend_name] = BackendProgress()
+
+    def finished(self, backend_name: str, result: Result) -> None:
+        # Parallel cells finish in any order, which counts the oldest as
+        # finished
+        self.num_running = max(0, self.num_running - 1)
+        if len(self.running_since) > 0:
+            self.running_since.pop(0)
+        self.num_completed += 1
+        self.backends[backend_name].add(result)
+
+    def __str__(self) -> str:
+        total = '?' if self.num_cells == 0 else str(self.num_cells)
+        timeouts = ', '.join(
+          f'{name} {100 * b.num_limit_reached // max(1, b.num_runs)}%'
+          for name, b in self.backends.items())
+        eta = self.eta
+        return (f'{self.num_completed}/{total} done, '
+                f'{self.num_running} running, {self.num_queued} queued | '
+                f'{self.throughput:.1f} cells/h | '
+                f'CPU {self.cpu_utilisation:.2f} | '
+                f't/o: {timeouts} | '
+                f'elapsed {seconds_to_str(self.elapsed)}, ETA ' +
+                ('?' if eta is None else seconds_to_str(eta)))
@@ -0,0 +1,103 @@
+from typing import List, Dict, Tuple, Union, Any
+from re import compile, DOTALL
+from json import load
+from os import path
+from .param_grid import ParamPoint, param_point_to_str
+from .watcher import model_includes
+
+comment_re = compile(r'%[^\n]*|/\*.*?\*/', DOTALL)
+string_re = compile(r'"(?:[^"\\\n]|\\.)*"')
+solve_re = compile(r'(?:^|;)\s*solve\b([^;]*);')
+objective_re = compile(r'\b(minimize|maximize)\b(.*)$', DOTALL)
+
+# The modes of a run with its objective bounded by the best known one:
+# a proof run is constrained to that value, so that it spends no time on
+# worse solutions and times finding and proving an optimum, and a gap run
+# is constrained to beat it, which times closing the gap to the optimum
+# (or proving it unsatisfiable, which proves the best known one optimal)
+PROOF_MODES = ('proof', 'gap')
+
+BOUND_OPERATORS = {('minimize', 'proof'): '<=', ('minimize', 'gap'): '<',
+                   ('maximize', 'proof'): '>=', ('maximize', 'gap'): '>'}
+
+
+def model_objective(model_path: str) -> Union[None, Tuple[str, str]]:
+    # The method and the objective expression of the solve item of a model
+    # or the files it includes, or None for a satisfaction model. String
+    # literals are blanked out first, as output items can contain ';'.
+    for file_path in [model_path] + model_includes(model_path):
+        with open(file_path, 'r') as model_file:
+            text = string_re.sub('""', comment_re.sub('', model_file.read()))
+        match = solve_re.search(text)
+        if match is None:
+            continue
+        objective = objective_re.search(match.group(1))
+        if objective is None:
+            return None
+        return objective.group(1), ' '.join(objective.group(2).split())
+    return None
+
+
+def instance_names(param: Union[None, ParamPoint],
+                   data_file: Union[None, str]) -> List[str]:
+    # The names an instance is looked up by, most specific first
+    if param is not None:
+        return [param_point_to_str(param)]
+    if data_file is None:
+        return ['']
+    return [data_file, path.basename(data_file)]
+
+
+class Bounds:
+    method: str = 'minimize'
+    expression: str = ''
+    best: Dict[str, Any] = {}
+
+    def __init__(self, method: str, expression: str):
+        self.method = method
+        self.expression = expression
+        self.best = dict()
+
+    def is_better(self, value: Any, other: Any) -> bool:
+        return value < other if self.method == 'minimize' else value > other
+
+    def add(self, param: Union[None, ParamPoint],
+            data_file: Union[None, str], value: Any) -> None:
+        for name in instance_names(param, data_file):
+            if name not in self.best or self.is_better(value, self.best[name]):
+                self.best[name] = value
+
+    def load(self, bounds_path: str) -> None:
+        # Either the --json-output of earlier runs, or a bounds file that
+        # maps data files (or their names) and param points (as "n = 5")
+        # to the best known objective
+        with open(bounds_path, 'r') as bounds_file:
+            data = load(bounds_file)
+        if 'runs' not in data:
+            for name, value in data.items():
+                if not isinstance(value, (int, float)) or \
+                        isinstance(value, bool):
+                    raise ValueError(f'The bound of "{name}" is not a number')
+                self.add(None, name, value)
+            return
+        for run in data['runs']:
+            if run['objective'] is None or run['error']:
+                continue
+            param = run.get('param', None)
+            self.add(None if param is None else tuple(param.items()),
+                     run['data_file'], run['objective'])
+
+    def get(self, param: Union[None, ParamPoint],
+            data_file: Union[None, str]) -> Any:
+        for name in instance_names(param, data_file):
+            if name in self.best:
+                return self.best[name]
+        return None
+
+    def constraint(self, param: Union[None, ParamPoint],
+                   data_file: Union[None, str], mode: str) -> Union[None, str]:
+        value = self.get(param, data_file)
+        if value is None:
+            return None
+        return (f'constraint ({self.expression}) '
+                f'{BOUND_OPERATORS[self.method, mode]} {value};\n')
@@ -0,0 +1,75 @@
+from typing import List, Union
+from .result import Result
+from .stats import rank, friedman, friedman_critical_difference
+
+
+class Elimination:
+    backend_index: int = 0
+    num_instances: int = 0
+    mean_rank: float = 0.0
+    best_backend_index: int = 0
+    best_mean_rank: float = 0.0
+    p_value: float = 1.0
+
+    def __init__(self, backend_index: int, num_instances: int,
+                 mean_rank: float, best_backend_index: int,
+                 best_mean_rank: float, p_value: float):
+        self.backend_index = backend_index
+        self.num_instances = num_instances
+        self.mean_rank = mean_rank
+        self.best_backend_index = best_backend_index
+        self.best_mean_rank = best_mean_rank
+        self.p_value = p_value
+
+
+class Race:
+    block_size: int = 1
+    alpha: float = 0.05
+    alive: List[int] = []
+    rows: List[List[Union[None, Result]]] = []
+
+    def __init__(self, num_backends: int, block_size: int = 1,
+                 alpha: float = 0.05):
+        self.block_size = max(1, block_size)
+        self.alpha = alpha
+        self.alive = list(range(num_backends))
+        self.rows = []
+
+    def add(self, results: List[Union[None, Result]]) -> List[Elimination]:
+        self.rows.append(results)
+        if len(self.rows) % self.block_size != 0:
+            return []
+        return self.test()
+
+    def test(self) -> List[Elimination]:
+        # F-race: a Friedman test over the instances seen so far, ranking
+        # the backends that are still alive by Result.compare, followed by
+        # eliminating every backend whose rank sum is significantly worse
+        # than that of the best backend. The instances that some backend
+        # still alive did not run, like those that --select or --proof left
+        # out, are not blocks of the test.
+        if len(self.alive) < 2:
+            return []
+        rows = [row for row in self.rows
+                if all(row[i] is not None for i in self.alive)]
+        if len(rows) < 2:
+            return []
+        blocks = [rank([row[i] for i in self.alive],
+                       lambda a, b: a.compare(b))
+                  for row in rows]
+        statistic, p_value = friedman(blocks)
+        if p_value >= self.alpha:
+            return []
+        difference = friedman_critical_difference(blocks, statistic,
+                                                  self.alpha)
+        sums = [sum(block[j] for block in blocks)
+                for j in range(len(self.alive))]
+        best = min(range(len(self.alive)), key=lambda j: sums[j])
+        eliminations = [
+          Elimination(self.alive[j], len(rows),
+                      sums[j] / len(rows), self.alive[best],
+                      sums[best] / len(rows), p_value)
+          for j in range(len(self.alive)) if sums[j] - sums[best] > difference]
+        eliminated = set(e.backend_index for e in eliminations)
+        self.alive = [i for i in self.alive if i not in eliminated]
+        return eliminations
@@ -0,0 +1,198 @@
+import minizinc
+from typing import List, Dict, Any, Union, Set
+from asyncio import create_subprocess_exec
+from asyncio.subprocess import Process, PIPE
+from os import environ
+from shutil import which
+from signal import SIGKILL, SIGABRT, SIGSEGV
+from threading import local
+from re import compile
+from .supervisor import get_supervisor, signal_group, group_kwargs, \
+  ProcessGroup
+
+memory_re = compile(r'^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)I?B?\s*$')
+memory_units = {'': 1, 'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30, 'T': 1 << 40}
+
+# Messages of solvers (and the MiniZinc driver) that ran out of memory
+out_of_memory_messages = ('bad_alloc', 'out of memory', 'MemoryError',
+                          'Cannot allocate memory', 'OutOfMemory')
+
+# The signals that end a process out of memory: the abort of an uncaught
+# bad_alloc, a failed allocation that was not checked, and the OOM killer
+out_of_memory_signals = (SIGABRT, SIGSEGV, SIGKILL)
+
+# Environment variables honoured by the threading libraries of solvers
+thread_env_vars = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS',
+                   'MKL_NUM_THREADS')
+
+
+def parse_memory(memory: Union[None, int, str]) -> Union[None, int]:
+    if memory is None or isinstance(memory, int):
+        return memory
+    match = memory_re.match(memory.upper())
+    if match is None:
+        raise ValueError(f'Cannot parse memory limit "{memory}"')
+    return int(float(match.group(1)) * memory_units[match.group(2)])
+
+
+def parse_cpus(cpus: Union[None, str, List[int]]) -> Union[None, Set[int]]:
+    if cpus is None:
+        return None
+    if not isinstance(cpus, str):
+        return set(int(cpu) for cpu in cpus)
+    cpu_set = set()
+    for part in cpus.split(','):
+        bounds = part.split('-')
+        if len(bounds) > 2 or not all(b.strip().isdigit() for b in bounds):
+            raise ValueError(f'Cannot parse CPU set "{cpus}"')
+        cpu_set.update(range(int(bounds[0]), int(bounds[-1]) + 1))
+    return cpu_set
+
+
+class ResourceLimits:
+    memory: Union[None, int] = None
+    cpus: Union[None, Set[int]] = None
+    threads: Union[None, int] = None
+
+    def __init__(self, memory: Union[None, int, str] = None,
+                 cpus: Union[None, str, List[int]] = None,
+                 threads: Union[None, int] = None):
+        self.memory = parse_memory(memory)
+        self.cpus = parse_cpus(cpus)
+        self.threads = None if threads is None else int(threads)
+
+    @staticmethod
+    def from_config(config: Dict[str, Any]) -> 'ResourceLimits':
+        unknown = set(config.keys()) - {'memory', 'cpus', 'threads'}
+        if len(unknown) > 0:
+            raise TypeError('Unknown resource limit(s): ' +
+                            ', '.join(sorted(unknown)))
+        return ResourceLimits(config.get('memory', None),
+                              config.get('cpus', None),
+                              config.get('threads', None))
+
+    @property
+    def empty(self) -> bool:
+        return self.memory is None and self.cpus is None and (
+          self.threads is None)
+
+    def merge(self, other: 'ResourceLimits') -> 'ResourceLimits':
+        limits = ResourceLimits()
+        for attr in ('memory', 'cpus', 'threads'):
+            value = getattr(other, attr)
+            setattr(limits, attr,
+                    getattr(self, attr) if value is None else value)
+        return limits
+
+    def env(self) -> Union[None, Dict[str, str]]:
+        if self.threads is None:
+            return None
+        env = dict(environ)
+        for var in thread_env_vars:
+            env[var] = str(self.threads)
+        return env
+
+    def wrap(self, cmd: List[str]) -> List[str]:
+        # The command run under prlimit and taskset, which exec it with the
+        # limits, so that everything the solver process spawns inherits
+        # them. Setting them in the child with a preexec_fn is not safe in
+        # the threads of the runner.
+        prefix = []
+        if self.memory is not None:
+            prefix += [limit_tool('prlimit'), f'--as={self.memory}', '--']
+        if self.cpus is not None:
+            prefix += [limit_tool('taskset'), '-c',
+                       ','.join(str(cpu) for cpu in sorted(self.cpus))]
+        return prefix + cmd
+
+    def is_out_of_memory(self, e: Exception,
+                         returncode: Union[None, int] = None) -> bool:
+        # A process killed by a signal is out of memory unless the watchdog
+        # killed it, which is checked first. Solvers that handle running
+        # out of memory are recognized by their messages.
+        if self.memory is None:
+            return False
+        if returncode is None:
+            returncode = getattr(e, 'returncode', None)
+        if returncode is not None and -returncode in out_of_memory_signals:
+            return True
+        message = str(e)
+        return any(m in message for m in out_of_memory_messages)
+
+
+def limit_tool(name: str) -> str:
+    tool = which(name)
+    if tool is None:
+        raise OSError(f'{name} (of util-linux) is required to limit runs')
+    return tool
+
+
+class LimitedDriver(minizinc.Driver):
+    limits: ResourceLimits = None
+    # The running processes and their groups
+    processes: Dict[Process, ProcessGroup] = {}
+    _local: Union[None, local] = None
+
+    @staticmethod
+    def from_driver(driver: minizinc.Driver,
+                    limits: ResourceLimits) -> 'LimitedDriver':
+        # Share the state of the driver instead of initialising a new one,
+        # which would query the MiniZinc executable again
+        limited_driver = LimitedDriver.__new__(LimitedDriver)
+        limited_driver.__dict__.update(driver.__dict__)
+        limited_driver.limits = limits
+        limited_driver.processes = dict()
+        limited_driver._local = local()
+        return limited_driver
+
+    async def _create_process(self, args: List[Any],
+                              solver: Union[None, str] = None) -> Process:
+        args.append('--json-stream')
+        cmd = [str(self._executable)]
+        if solver is not None:
+            cmd += ['--solver', solver]
+        cmd += ['--allow-multiple-assignments'] + [str(arg) for arg in args]
+        cmd = self.limits.wrap(cmd)
+        minizinc.logger.debug(
+          f'LimitedDriver:create_process -> command: "{" ".join(cmd)}"')
+        # The process runs in a held process group under the watchdog, so
+        # that the solver processes the MiniZinc driver spawns are
+        # terminated along with it, even after asyncio reaped the process
+        timeout = None
+        if '--time-limit' in cmd:
+            timeout = int(cmd[cmd.index('--time-limit') + 1]) / 1000
+        supervisor = get_supervisor()
+        group = supervisor.hold_group(timeout)
+        try:
+            process = await create_subprocess_exec(
+              *cmd, stdin=None, stdout=PIPE, stderr=PIPE,
+              env=self.limits.env(), **group_kwargs(group.pgid))
+        except BaseException:
+            supervisor.unregister(group)
+            raise
+        group.is_done = lambda: process.returncode is not None
+        # The solve runs the event loop in the calling thread, which can
+        # then look up the group of its last run
+        self._local.group = group
+        self._local.process = process
+        self.processes = {p: g for p, g in self.processes.items()
+                          if p.returncode is None}
+        self.processes[process] = group
+        return process
+
+    def expired(self) -> bool:
+        # Whether the watchdog terminated the last run of this thread
+        group = getattr(self._local, 'group', None)
+        return group is not None and group.expired
+
+    def returncode(self) -> Union[None, int]:
+        # The exit status of the last run of this thread
+        process = getattr(self._local, 'process', None)
+        return None if process is None else process.returncode
+
+    def kill(self) -> None:
+        # Kills the running solver processes, which can be called from
+        # another thread than the one solving
+        for process, group in list(self.processes.items()):
+            if process.returncode is None:
+                signal_group(group.pgid, SIGKILL)
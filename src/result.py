@@ -1,13 +1,34 @@
 import minizinc
 from typing import List, Tuple, Any, Union, Dict
 from datetime import timedelta
+from .time_source import TIME_SOURCES
+from .search_stats import SearchStats, search_stats
 
 
 class Result:
     method: minizinc.Method = None
     _result: minizinc.Result = None
     _all_solutions: bool = False
+    _out_of_memory: bool = False
     vars: List[Tuple[str, Any]] = None
+    wall_time: Union[None, timedelta] = None
+    time_source: str = 'solver'
+    # The names the backend reports the search statistics by
+    stat_names: Union[None, Dict[str, List[str]]] = None
+    # Whether the objective was constrained to beat the best known one, so
+    # that proving it unsatisfiable proves the best known one optimal
+    proof: bool = False
+    # The error of a run that failed with an exception (the stderr of the
+    # driver for a MiniZinc error), and the number of times it was tried
+    error_message: Union[None, str] = None
+    attempts: int = 1
+    # The host of the run, and its speed relative to the reference host of
+    # the calibration, by which the times are normalized to that host
+    host: Union[None, str] = None
+    speed_factor: float = 1.0
+    # The timeout of the run in milliseconds on the reference host, which
+    # differs between backends with their own timeouts
+    timeout: Union[None, int] = None
 
     @property
     def objective(self) -> Any: return self._result.objective
@@ -47,31 +68,96 @@ class Result:
         return (self.method == minizinc.Method.MINIMIZE or
                 self.method == minizinc.Method.MAXIMIZE)
 
+    @property
+    def mem_out(self) -> bool:
+        return self._out_of_memory
+
     @property
     def timed_out(self) -> bool:
+        if self.mem_out:
+            return False
         if self.is_cop:
-            return not self.optimal_solution
+            return not (self.optimal_solution or (self.proof and self.unsat))
         if self._all_solutions:
             return not self.all_solutions
         return self.unknown
 
+    @property
+    def solved(self) -> bool:
+        return not self.error and not self.limit_reached
+
+    @property
+    def limit_reached(self) -> bool:
+        return self.timed_out or self.mem_out
+
+    @property
+    def host_time(self) -> timedelta:
+        # The time as measured on the host of the run
+        solve_time = self._stat_time('solveTime')
+        if self.time_source == 'wall' and self.wall_time is not None:
+            return self.wall_time
+        if self.time_source == 'solve' and solve_time is not None:
+            return solve_time
+        time = self._stat_time('time')
+        if time is not None:
+            return time
+        if self.wall_time is not None:
+            return self.wall_time
+        return timedelta(0)
+
     @property
     def time(self) -> timedelta:
-        if 'time' not in self._result.statistics:
-            return timedelta(
-              milliseconds=(int(pow(2, 32)) if self.timed_out else 0))
-        time: Union[int, timedelta] = self._result.statistics['time']
-        return timedelta(milliseconds=time) if isinstance(time, int) else time
+        return self.host_time * self.speed_factor
+
+    @property
+    def normalized_wall_time(self) -> Union[None, timedelta]:
+        return self._normalize(self.wall_time)
+
+    @property
+    def flat_time(self) -> Union[None, timedelta]:
+        return self._normalize(self._stat_time('flatTime'))
+
+    @property
+    def solve_time(self) -> Union[None, timedelta]:
+        return self._normalize(self._stat_time('solveTime'))
+
+    @property
+    def search_time(self) -> timedelta:
+        # Search rates are per second of solving on the host of the run,
+        # without flattening
+        return self._stat_time('solveTime') or self.host_time
+
+    @property
+    def search(self) -> SearchStats:
+        # The normalized search statistics, with their rates
+        return search_stats(self._result.statistics, self.stat_names,
+                            self.search_time.total_seconds())
 
     @property
     def has_solution(self) -> bool:
         return len(self._result) > 0
 
     def __init__(self, method: minizinc.Method, result: minizinc.Result,
-                 all_solutions: bool, vars: List[Tuple[str, Any]]):
+                 all_solutions: bool, vars: List[Tuple[str, Any]],
+                 wall_time: Union[None, timedelta] = None,
+                 time_source: str = 'solver',
+                 out_of_memory: bool = False,
+                 stat_names: Union[None, Dict[str, List[str]]] = None,
+                 proof: bool = False,
+                 error_message: Union[None, str] = None,
+                 attempts: int = 1):
+        if time_source not in TIME_SOURCES:
+            raise ValueError(f'Unknown time source "{time_source}"')
         self.method: minizinc.Method = method
         self._result: minizinc.Result = result
         self._all_solutions: bool = all_solutions
+        self._out_of_memory: bool = out_of_memory
+        self.wall_time: Union[None, timedelta] = wall_time
+        self.time_source: str = time_source
+        self.stat_names = stat_names
+        self.proof = proof
+        self.error_message = error_message
+        self.attempts = attempts
         self.vars: List[Tuple[str, Any]] = []
         if vars is not None:
             for var in vars:
@@ -83,12 +169,22 @@ class Result:
                     val = '--'
                 self.vars.append((var, val))
 
+    def _normalize(self, time: Union[None, timedelta]
+                   ) -> Union[None, timedelta]:
+        return None if time is None else time * self.speed_factor
+
+    def _stat_time(self, key: str) -> Union[None, timedelta]:
+        time = self._result.statistics.get(key, None)
+        if time is None or isinstance(time, timedelta):
+            return time
+        return timedelta(milliseconds=time)
+
     def compare_time(self, other: 'Result') -> int:
-        if self.timed_out and other.timed_out:
+        if self.limit_reached and other.limit_reached:
             return 0
-        if other.timed_out:
+        if other.limit_reached:
             return -1
-        if self.timed_out:
+        if self.limit_reached:
             return 1
         if self.time < other.time:
             return -1
@@ -142,3 +238,14 @@ class Result:
             else:
                 sol = self._result.solution.__dict__
         return {**sol, **{k: v for (k, v) in self.vars}}
+
+
+def best_result(results: List[Result]) -> Result:
+    # The best of the runs of a cell with increasing timeouts, which is the
+    # last one unless an earlier one did better, for example when the last
+    # one failed or found a worse objective before its timeout
+    best = results[-1]
+    for result in reversed(results[:-1]):
+        if result.compare(best) < 0:
+            best = result
+    return best
@@ -0,0 +1,63 @@
+from typing import List, Dict, Tuple, Union
+from math import log, exp
+from .result import Result
+
+# Scaling entries are (backend name, threads, speedup, efficiency)
+ScalingEntry = Tuple[str, int, Union[None, float], Union[None, float]]
+
+
+def seconds(result: Result) -> float:
+    # Clamp to a millisecond so that instant runs do not divide by zero
+    return max(result.time.total_seconds(), 0.001)
+
+
+class Scaling:
+    groups: List[Tuple[str, List[Tuple[int, int]]]] = []
+    log_speedups: Dict[Tuple[str, int], List[float]] = {}
+
+    def __init__(self, backends: List[Tuple[str, str]],
+                 thread_backends: Dict[str, Tuple[str, str, int]]):
+        # Group the virtual backends by their real backend, the first entry
+        # of each group having the fewest threads is the baseline
+        groups: Dict[str, List[Tuple[int, int]]] = dict()
+        for b_index, (b_id, _) in enumerate(backends):
+            _, real_name, threads = thread_backends[b_id]
+            groups.setdefault(real_name, []).append((b_index, threads))
+        self.groups = [(name, sorted(group, key=lambda g: g[1]))
+                       for name, group in groups.items()]
+        self.log_speedups = dict()
+
+    def add(self, results: List[Union[None, Result]]) -> List[ScalingEntry]:
+        entries = []
+        for name, group in self.groups:
+            base_index, base_threads = group[0]
+            base = results[base_index]
+            for b_index, threads in group:
+                result = results[b_index]
+                if (base is None or result is None or not base.solved or
+                        not result.solved):
+                    entries.append((name, threads, None, None))
+                    continue
+                speedup = seconds(base) / seconds(result)
+                self.log_speedups.setdefault((name, threads), []).append(
+                  log(speedup))
+                entries.append((name, threads, speedup,
+                                speedup * base_threads / threads))
+        return entries
+
+    def summary(self) -> List[Tuple[str, int, int, Union[None, float],
+                                    Union[None, float]]]:
+        # The geometric mean of the speedups over the instances solved with
+        # both the baseline and the thread count
+        summary = []
+        for name, group in self.groups:
+            base_threads = group[0][1]
+            for _, threads in group:
+                log_speedups = self.log_speedups.get((name, threads), [])
+                if len(log_speedups) == 0:
+                    summary.append((name, threads, 0, None, None))
+                    continue
+                speedup = exp(sum(log_speedups) / len(log_speedups))
+                summary.append((name, threads, len(log_speedups), speedup,
+                                speedup * base_threads / threads))
+        return summary
@@ -0,0 +1,90 @@
+from typing import List, Tuple, Union
+
+# A waiting cell is (cores, expected duration in seconds),
+# a running cell is (cores, expected end time in seconds)
+WaitingCell = Tuple[int, float]
+RunningCell = Tuple[int, float]
+
+# The number of upcoming cells per job the scheduler can choose from
+SCHEDULER_LOOKAHEAD = 4
+# The number of cells per job that may be read ahead of the oldest one
+# that is not reported yet, which bounds the finished cells held back
+# behind a slow cell, as the cells are reported in order
+SCHEDULER_WINDOW = 2 * SCHEDULER_LOOKAHEAD
+
+
+class CoreScheduler:
+    num_jobs: int = 1
+    num_cores: int = 1
+
+    def __init__(self, num_jobs: int, num_cores: int):
+        self.num_jobs = max(1, num_jobs)
+        self.num_cores = max(1, num_cores)
+
+    def demand(self, threads: int) -> int:
+        # A cell wider than the core budget runs on its own
+        return min(max(1, threads), self.num_cores)
+
+    def admit(self, num_waiting: int, num_unreported: int) -> int:
+        # The number of upcoming cells to read: the waiting cells are
+        # topped up to the lookahead while the cells read but not reported
+        # (waiting, running or finished) stay within the window
+        return max(0, min(SCHEDULER_LOOKAHEAD * self.num_jobs - num_waiting,
+                          SCHEDULER_WINDOW * self.num_jobs - num_unreported))
+
+    def idle_wait(self, num_waiting: int, num_unreported: int,
+                  exhausted: bool, retry_in: Union[None, float]
+                  ) -> Union[None, float]:
+        # The seconds to wait while no cell runs: none while cells wait or
+        # more can be read, else until the next cell backing off before a
+        # retry is due, or None when no cells are left
+        if num_waiting > 0 or (not exhausted and
+                               self.admit(num_waiting, num_unreported) > 0):
+            return 0.0
+        return retry_in
+
+    def select(self, waiting: List[WaitingCell], running: List[RunningCell],
+               now: float) -> List[int]:
+        # EASY backfilling: the waiting cells start in order while they fit
+        # into the free cores. The first cell that does not fit reserves
+        # the cores it needs at the time the running cells free them (using
+        # the timeout as the worst case duration), and later cells are only
+        # started ahead of it when they do not delay that reservation.
+        free = self.num_cores - sum(cores for cores, _ in running)
+        slots = self.num_jobs - len(running)
+        running = sorted(running, key=lambda r: r[1])
+        selected: List[int] = []
+        shadow_time: Union[None, float] = None
+        extra_cores = 0
+        for index, (cores, duration) in enumerate(waiting):
+            if slots <= 0 or free <= 0:
+                break
+            if shadow_time is None:
+                if cores <= free:
+                    selected.append(index)
+                    free -= cores
+                    slots -= 1
+                    running.append((cores, now + duration))
+                    running.sort(key=lambda r: r[1])
+                    continue
+                available = free
+                shadow_time = now
+                for running_cores, end in running:
+                    available += running_cores
+                    shadow_time = end
+                    if available >= cores:
+                        break
+                extra_cores = available - cores
+                continue
+            if cores > free:
+                continue
+            if now + duration <= shadow_time:
+                selected.append(index)
+            elif cores <= extra_cores:
+                selected.append(index)
+                extra_cores -= cores
+            else:
+                continue
+            free -= cores
+            slots -= 1
+        return selected
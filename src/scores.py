@@ -0,0 +1,93 @@
+from typing import List, Dict, Tuple
+from math import log, exp
+from .result import Result
+from .search_stats import RATE_STATS
+
+PAR_KS = (2, 10)
+
+
+class BackendScores:
+    num_runs: int = 0
+    num_solved: int = 0
+    solved_time: float = 0.0
+    solved_log_time: float = 0.0
+    # The timeouts of the unsolved runs, which backends with their own
+    # timeouts are penalized by
+    unsolved_time: float = 0.0
+    unsolved_log_time: float = 0.0
+    # The totals of the search statistics, and the number and search
+    # seconds of the runs that reported them
+    search_totals: Dict[str, float] = {}
+    search_runs: Dict[str, int] = {}
+    search_seconds: Dict[str, float] = {}
+
+    def __init__(self):
+        self.search_totals = dict()
+        self.search_runs = dict()
+        self.search_seconds = dict()
+
+    def add(self, result: Result, timeout: float) -> None:
+        # The timeout in seconds of a result that does not have its own
+        self.num_runs += 1
+        search = result.search
+        seconds = result.search_time.total_seconds()
+        for stat in RATE_STATS:
+            if stat not in search:
+                continue
+            self.search_totals[stat] = (self.search_totals.get(stat, 0) +
+                                        search[stat])
+            self.search_runs[stat] = self.search_runs.get(stat, 0) + 1
+            self.search_seconds[stat] = (self.search_seconds.get(stat, 0.0) +
+                                         seconds)
+        if not result.solved:
+            if result.timeout is not None:
+                timeout = result.timeout / 1000
+            self.unsolved_time += timeout
+            self.unsolved_log_time += log(max(timeout, 0.001))
+            return
+        seconds = result.time.total_seconds()
+        self.num_solved += 1
+        self.solved_time += seconds
+        # Clamp to a millisecond so that instant runs do not zero the mean
+        self.solved_log_time += log(max(seconds, 0.001))
+
+    def par(self, k: int) -> float:
+        if self.num_runs == 0:
+            return 0.0
+        return (self.solved_time + k * self.unsolved_time) / self.num_runs
+
+    def geometric_mean(self) -> float:
+        if self.num_runs == 0:
+            return 0.0
+        return exp((self.solved_log_time + self.unsolved_log_time) /
+                   self.num_runs)
+
+
+class Scores:
+    timeout: float = 0.0
+    backends: Dict[str, BackendScores] = {}
+
+    def __init__(self, timeout: int):
+        # The timeout is given in milliseconds, scores are in seconds
+        self.timeout = timeout / 1000
+        self.backends = dict()
+
+    def add(self, backend_name: str, result: Result) -> None:
+        if backend_name not in self.backends:
+            self.backends[backend_name] = BackendScores()
+        self.backends[backend_name].add(result, self.timeout)
+
+    def summary(self) -> List[Tuple[str, Dict[str, float]]]:
+        summary = []
+        for backend_name, scores in self.backends.items():
+            entry = {'runs': scores.num_runs, 'solved': scores.num_solved}
+            for k in PAR_KS:
+                entry[f'par{k}'] = scores.par(k)
+            entry['geometric_mean'] = scores.geometric_mean()
+            for stat, total in scores.search_totals.items():
+                entry[f'mean_{stat}'] = total / scores.search_runs[stat]
+                if scores.search_seconds[stat] > 0:
+                    entry[f'{stat}_per_s'] = (total /
+                                              scores.search_seconds[stat])
+            summary.append((backend_name, entry))
+        return summary
@@ -0,0 +1,72 @@
+from typing import List, Dict, Any, Union
+from re import sub
+
+# The common names of the search statistics, and the names backends report
+# them by, tried in order. The first names are the standard statistics of
+# MiniZinc.
+STAT_NAMES: Dict[str, List[str]] = {
+  'nodes': ['nodes', 'nNodes', 'branches', 'decisions'],
+  'failures': ['failures', 'fails', 'conflicts'],
+  'propagations': ['propagations', 'propagate'],
+  'restarts': ['restarts'],
+  'peak_depth': ['peakDepth', 'peak_depth', 'maxDepth']
+}
+
+# The names that differ from the above, by a word in the id or the name of
+# the backend, compared in lower case without punctuation. For example,
+# CP-SAT (id sat, name OR-Tools CP-SAT) reports nodes as branches and
+# failures as conflicts.
+BACKEND_STAT_NAMES: Dict[str, Dict[str, List[str]]] = {
+  'cpsat': {'nodes': ['branches'], 'failures': ['conflicts']},
+  'ortools': {'nodes': ['branches'], 'failures': ['conflicts']},
+  'chuffed': {'failures': ['failures', 'conflicts']},
+  'gurobi': {'nodes': ['nodes', 'nodeCount']},
+  'cplex': {'nodes': ['nodes', 'nodeCount']},
+  'yuck': {'nodes': ['moves']}
+}
+
+# The statistics whose rates per second of search are derived
+RATE_STATS = ('nodes', 'failures', 'propagations')
+
+SearchStats = Dict[str, Union[int, float]]
+
+
+def stat_names(backend_id: str,
+               overrides: Union[None, Dict[str, Union[str, List[str]]]] = None,
+               backend_name: str = '') -> Dict[str, List[str]]:
+    # The statistics field of a backend config overrides the names, for
+    # example {"statistics": {"nodes": "numBranches"}}
+    names = {stat: list(aliases) for stat, aliases in STAT_NAMES.items()}
+    backend = sub(r'[^a-z0-9 ]', '', f'{backend_id} {backend_name}'.lower())
+    for word, backend_names in BACKEND_STAT_NAMES.items():
+        if word in backend:
+            for stat, aliases in backend_names.items():
+                names[stat] = aliases + [a for a in names[stat]
+                                         if a not in aliases]
+    for stat, aliases in (overrides or dict()).items():
+        if stat not in names:
+            raise ValueError(f'Unknown search statistic "{stat}", expected '
+                             f'one of {", ".join(STAT_NAMES)}')
+        names[stat] = ([aliases] if isinstance(aliases, str)
+                       else list(aliases)) + names[stat]
+    return names
+
+
+def search_stats(statistics: Dict[str, Any],
+                 names: Union[None, Dict[str, List[str]]] = None,
+                 seconds: Union[None, float] = None) -> SearchStats:
+    # The statistics of a run under their common names, and their rates
+    # (as nodes_per_s) given the seconds of search
+    stats: SearchStats = dict()
+    for stat, aliases in (names or STAT_NAMES).items():
+        for alias in aliases:
+            value = statistics.get(alias, None)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            stats[stat] = value
+            break
+    if seconds is not None and seconds > 0:
+        for stat in RATE_STATS:
+            if stat in stats:
+                stats[f'{stat}_per_s'] = stats[stat] / seconds
+    return stats
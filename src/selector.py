@@ -0,0 +1,154 @@
+from typing import List, Dict, Tuple, Union, Any, Iterable
+from math import log1p, sqrt, inf
+from json import load, dump
+from .param_grid import ParamPoint
+
+# Instances of earlier campaigns are identified by their parameters or
+# data file
+InstanceKey = Tuple[Union[None, ParamPoint], Union[None, str]]
+
+# The penalty factor of unsolved runs, as in PAR-10
+PENALTY_FACTOR = 10
+
+
+def run_cost(run: Dict[str, Any], timeout: float) -> float:
+    # The PAR-10 cost in seconds of a run of the JSON output
+    timeout = run.get('timeout', None) or timeout
+    if run['error'] or run['timed_out'] or run.get('mem_out', False):
+        return PENALTY_FACTOR * timeout / 1000
+    return run['time'] / 1000
+
+
+def load_campaign_costs(json_paths: Iterable[str], timeout: float
+                        ) -> Dict[InstanceKey, Dict[str, float]]:
+    # Reads the runs of earlier --json-output files; later runs of the
+    # same instance and backend (as of a timeout ladder) replace earlier ones
+    costs: Dict[InstanceKey, Dict[str, float]] = dict()
+    for json_path in json_paths:
+        with open(json_path, 'r') as json_file:
+            runs = load(json_file)['runs']
+        for run in runs:
+            param = run.get('param', None)
+            key = (None if param is None else tuple(param.items()),
+                   run['data_file'])
+            costs.setdefault(key, dict())[run['backend_name']] = run_cost(
+              run, timeout)
+    return costs
+
+
+class Selector:
+    k: int = 5
+    feature_backend_id: str = ''
+    feature_names: List[str] = []
+    backend_names: List[str] = []
+    instances: List[Tuple[Dict[str, float], Dict[str, float]]] = []
+    means: List[float] = []
+    stds: List[float] = []
+    vectors: List[List[float]] = []
+
+    def __init__(self, instances: List[Tuple[Dict[str, float],
+                                             Dict[str, float]]],
+                 k: int = 5, feature_backend_id: str = ''):
+        self.k = max(1, k)
+        self.feature_backend_id = feature_backend_id
+        self.instances = instances
+        self.feature_names = sorted(set(
+          name for features, _ in instances for name in features))
+        self.backend_names = sorted(set(
+          name for _, costs in instances for name in costs))
+        columns = [[self._scale(features.get(name, 0.0))
+                    for features, _ in instances]
+                   for name in self.feature_names]
+        self.means = [sum(c) / max(1, len(c)) for c in columns]
+        self.stds = [sqrt(sum((v - m) ** 2 for v in c) / max(1, len(c))) or 1.0
+                     for c, m in zip(columns, self.means)]
+        self.vectors = [self.vector(features) for features, _ in instances]
+
+    @staticmethod
+    def _scale(value: float) -> float:
+        # Counts span orders of magnitude, so compare their logarithms
+        return log1p(max(0.0, value))
+
+    @staticmethod
+    def load(selector_path: str) -> 'Selector':
+        with open(selector_path, 'r') as selector_file:
+            data = load(selector_file)
+        return Selector([(i['features'], i['costs'])
+                         for i in data['instances']],
+                        data['k'], data['feature_backend_id'])
+
+    def save(self, selector_path: str) -> None:
+        with open(selector_path, 'w') as selector_file:
+            dump({'k': self.k,
+                  'feature_backend_id': self.feature_backend_id,
+                  'instances': [{'features': features, 'costs': costs}
+                                for features, costs in self.instances]},
+                 selector_file, indent=2)
+
+    def vector(self, features: Dict[str, float]) -> List[float]:
+        return [(self._scale(features.get(name, 0.0)) - mean) / std
+                for name, mean, std in zip(self.feature_names, self.means,
+                                           self.stds)]
+
+    def predict(self, features: Dict[str, float],
+                exclude: Union[None, int] = None) -> Dict[str, float]:
+        # The cost of each backend predicted as the mean cost of the k
+        # nearest instances, weighted by their inverse distance
+        vector = self.vector(features)
+        distances = sorted(
+          (sqrt(sum((a - b) ** 2 for a, b in zip(vector, other))), index)
+          for index, other in enumerate(self.vectors) if index != exclude)
+        predicted = dict()
+        for backend_name in self.backend_names:
+            total = weights = 0.0
+            for distance, index in distances[:self.k]:
+                cost = self.instances[index][1].get(backend_name, None)
+                if cost is None:
+                    continue
+                weight = 1 / (distance + 1e-6)
+                total += weight * cost
+                weights += weight
+            predicted[backend_name] = inf if weights == 0 else total / weights
+        return predicted
+
+    def rank(self, features: Dict[str, float],
+             backend_names: List[str]) -> List[str]:
+        # Backends without any training runs are ranked last
+        predicted = self.predict(features)
+        return sorted(backend_names, key=lambda name: predicted.get(name, inf))
+
+    def evaluate(self, num_selected: int = 1) -> Dict[str, Any]:
+        # Leave-one-out evaluation on the training instances that have runs
+        # of all backends, against the virtual best solver (the best backend
+        # of each instance) and the single best solver (the best backend
+        # over all instances)
+        complete = [index for index, (_, costs) in enumerate(self.instances)
+                    if all(name in costs for name in self.backend_names)]
+        if len(complete) == 0 or len(self.backend_names) == 0:
+            return {'instances': 0}
+        selected_cost = virtual_best_cost = 0.0
+        totals = {name: 0.0 for name in self.backend_names}
+        for index in complete:
+            features, costs = self.instances[index]
+            predicted = self.predict(features, exclude=index)
+            selected = sorted(self.backend_names,
+                              key=lambda name: predicted[name])[:num_selected]
+            selected_cost += min(costs[name] for name in selected)
+            virtual_best_cost += min(costs.values())
+            for name in self.backend_names:
+                totals[name] += costs[name]
+        single_best = min(self.backend_names, key=lambda name: totals[name])
+        single_best_cost = totals[single_best]
+        gap = single_best_cost - virtual_best_cost
+        return {
+          'instances': len(complete),
+          'selected': num_selected,
+          'selector_par10': selected_cost / len(complete),
+          'virtual_best_par10': virtual_best_cost / len(complete),
+          'single_best': single_best,
+          'single_best_par10': single_best_cost / len(complete),
+          # The share of the gap between the single and virtual best solver
+          # that the selector closes
+          'gap_closed': (None if gap <= 0 else
+                         (single_best_cost - selected_cost) / gap)
+        }
@@ -0,0 +1,187 @@
+from typing import List, Sequence, Tuple, Callable, Any
+from math import lgamma, exp, log, sqrt, erfc, comb, copysign, inf
+from functools import cmp_to_key
+
+# Iteration limit and precision of the continued fractions and series
+MAX_ITERATIONS = 300
+EPSILON = 1e-12
+TINY = 1e-300
+
+
+def _gamma_series(a: float, x: float) -> float:
+    # Regularised lower incomplete gamma function P(a, x) for x < a + 1
+    term = total = 1.0 / a
+    n = a
+    for _ in range(MAX_ITERATIONS):
+        n += 1
+        term *= x / n
+        total += term
+        if abs(term) < abs(total) * EPSILON:
+            break
+    return total * exp(-x + a * log(x) - lgamma(a))
+
+
+def _gamma_fraction(a: float, x: float) -> float:
+    # Regularised upper incomplete gamma function Q(a, x) for x >= a + 1
+    b = x + 1 - a
+    c = 1 / TINY
+    d = 1 / b
+    h = d
+    for i in range(1, MAX_ITERATIONS):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = TINY if abs(d) < TINY else d
+        c = b + an / c
+        c = TINY if abs(c) < TINY else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < EPSILON:
+            break
+    return exp(-x + a * log(x) - lgamma(a)) * h
+
+
+def gamma_q(a: float, x: float) -> float:
+    if x <= 0:
+        return 1.0
+    if x < a + 1:
+        return 1.0 - _gamma_series(a, x)
+    return _gamma_fraction(a, x)
+
+
+def _beta_fraction(a: float, b: float, x: float) -> float:
+    qab = a + b
+    qap = a + 1
+    qam = a - 1
+    c = 1.0
+    d = 1 - qab * x / qap
+    d = 1 / (TINY if abs(d) < TINY else d)
+    h = d
+    for m in range(1, MAX_ITERATIONS):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1 + aa * d
+        d = 1 / (TINY if abs(d) < TINY else d)
+        c = 1 + aa / c
+        c = TINY if abs(c) < TINY else c
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1 + aa * d
+        d = 1 / (TINY if abs(d) < TINY else d)
+        c = 1 + aa / c
+        c = TINY if abs(c) < TINY else c
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < EPSILON:
+            break
+    return h
+
+
+def beta_i(a: float, b: float, x: float) -> float:
+    # Regularised incomplete beta function I_x(a, b)
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    front = exp(lgamma(a + b) - lgamma(a) - lgamma(b) +
+                a * log(x) + b * log(1 - x))
+    if x < (a + 1) / (a + b + 2):
+        return front * _beta_fraction(a, b, x) / a
+    return 1 - front * _beta_fraction(b, a, 1 - x) / b
+
+
+def chi2_sf(x: float, df: float) -> float:
+    return gamma_q(df / 2, x / 2)
+
+
+def t_sf(t: float, df: float) -> float:
+    tail = beta_i(df / 2, 0.5, df / (df + t * t)) / 2
+    return tail if t >= 0 else 1 - tail
+
+
+def t_ppf(p: float, df: float) -> float:
+    # Quantile of Student's t distribution by bisection on its tail
+    low, high = -1e3, 1e3
+    for _ in range(200):
+        mid = (low + high) / 2
+        if 1 - t_sf(mid, df) < p:
+            low = mid
+        else:
+            high = mid
+    return (low + high) / 2
+
+
+def rank(values: Sequence[Any],
+         compare: Callable[[Any, Any], float]) -> List[float]:
+    # Ranks starting at 1 for the smallest value, ties share their mean rank
+    order = sorted(range(len(values)),
+                   key=cmp_to_key(lambda i, j: compare(values[i], values[j])))
+    ranks = [0.0] * len(values)
+    start = 0
+    while start < len(order):
+        end = start + 1
+        while end < len(order) and compare(values[order[start]],
+                                           values[order[end]]) == 0:
+            end += 1
+        for i in order[start:end]:
+            ranks[i] = (start + end + 1) / 2
+        start = end
+    return ranks
+
+
+def friedman(blocks: List[List[float]]) -> Tuple[float, float]:
+    # The Friedman statistic corrected for ties of ranked blocks, and its
+    # p-value; the blocks must all rank the same k >= 2 candidates
+    b = len(blocks)
+    k = len(blocks[0])
+    sums = [sum(block[j] for block in blocks) for j in range(k)]
+    a1 = sum(r * r for block in blocks for r in block)
+    c1 = b * k * (k + 1) ** 2 / 4
+    if a1 - c1 <= 0:
+        return 0.0, 1.0
+    t = (k - 1) * sum((s - b * (k + 1) / 2) ** 2 for s in sums) / (a1 - c1)
+    return t, chi2_sf(t, k - 1)
+
+
+def friedman_critical_difference(blocks: List[List[float]], statistic: float,
+                                 alpha: float) -> float:
+    # The difference in rank sums above which two candidates differ, by
+    # the post-hoc test of Conover used by F-race
+    b = len(blocks)
+    k = len(blocks[0])
+    if b < 2:
+        return float('inf')
+    a1 = sum(r * r for block in blocks for r in block)
+    c1 = b * k * (k + 1) ** 2 / 4
+    df = (b - 1) * (k - 1)
+    variance = (2 * b * (1 - statistic / (b * (k - 1))) * (a1 - c1) / df)
+    if variance <= 0:
+        return 0.0
+    return t_ppf(1 - alpha / 2, df) * sqrt(variance)
+
+
+def paired_t_test(n: int, total: float,
+                  total_squares: float) -> Tuple[float, float]:
+    # The paired t statistic of n differences given by their sum and sum of
+    # squares, and its two-sided p-value
+    if n < 2:
+        return 0.0, 1.0
+    mean = total / n
+    variance = max(0.0, (total_squares - n * mean * mean) / (n - 1))
+    if variance == 0:
+        return (0.0, 1.0) if mean == 0 else (copysign(inf, mean), 0.0)
+    t = mean / sqrt(variance / n)
+    return t, 2 * t_sf(abs(t), n - 1)
+
+
+def sign_test(k: int, n: int) -> float:
+    # The two-sided p-value of k of n paired differences being positive,
+    # approximated by the normal distribution for large n
+    if n == 0:
+        return 1.0
+    k = min(k, n - k)
+    if n > 1000:
+        z = (n / 2 - k - 0.5) / sqrt(n / 4)
+        return min(1.0, erfc(z / sqrt(2)))
+    return min(1.0, 2 * sum(comb(n, i) for i in range(k + 1)) / 2 ** n)
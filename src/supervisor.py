@@ -0,0 +1,215 @@
+from typing import List, Dict, Set, Union, Callable, Any, Tuple
+from threading import Thread, RLock
+from subprocess import Popen, CompletedProcess, DEVNULL
+from signal import signal, SIGINT, SIGTERM, SIGKILL, default_int_handler
+from tempfile import TemporaryFile
+from time import monotonic, sleep
+from os import killpg, path, remove, setpgid, waitid, P_PID, WEXITED, \
+  WNOWAIT
+import atexit
+import sys
+
+# Seconds a process group gets between SIGTERM and SIGKILL
+GRACE_PERIOD = 5.0
+# Seconds between the checks of the watchdog
+WATCHDOG_INTERVAL = 0.05
+# Seconds a process group gets between SIGTERM and SIGKILL on shutdown, so
+# that an interrupted runner exits within a second
+SHUTDOWN_GRACE_PERIOD = 0.5
+
+
+def signal_group(pgid: int, signal_number: int) -> bool:
+    # Whether the group still had a process to signal
+    try:
+        killpg(pgid, signal_number)
+        return True
+    except (ProcessLookupError, PermissionError):
+        return False
+
+
+def group_kwargs(pgid: int) -> Dict[str, Any]:
+    # The arguments of Popen that start a process in the group pgid, or in
+    # a new group for 0
+    if sys.version_info >= (3, 11):
+        return {'process_group': pgid}
+    return {'preexec_fn': lambda: setpgid(0, pgid)}
+
+
+class ProcessGroup:
+    pgid: int = 0
+    deadline: Union[None, float] = None
+    is_done: Union[None, Callable[[], bool]] = None
+    terminated: Union[None, float] = None
+    expired: bool = False
+    # The process that holds the id of a group whose processes are reaped
+    # by others, until the group is killed
+    holder: Union[None, Popen] = None
+
+    def __init__(self, pgid: int, deadline: Union[None, float] = None,
+                 is_done: Union[None, Callable[[], bool]] = None,
+                 holder: Union[None, Popen] = None):
+        self.pgid = pgid
+        self.deadline = deadline
+        self.is_done = is_done
+        self.holder = holder
+
+
+class Supervisor:
+    grace_period: float = GRACE_PERIOD
+    groups: Dict[int, ProcessGroup] = {}
+    files: Set[str] = set()
+    lock: Union[None, RLock] = None
+    _thread: Union[None, Thread] = None
+
+    def __init__(self, grace_period: float = GRACE_PERIOD):
+        # Every solver run leads its own process group, which the watchdog
+        # terminates once the timeout and the grace period passed. A group
+        # is killed as a whole when its leader exits, so that no solver
+        # process spawned by the MiniZinc driver outlives its run. The lock
+        # is reentrant, as the shutdown hook takes it in the main thread,
+        # which may already hold it.
+        self.grace_period = grace_period
+        self.groups = dict()
+        self.files = set()
+        self.lock = RLock()
+        self._thread = None
+
+    def register(self, pgid: int, timeout: Union[None, float] = None,
+                 is_done: Union[None, Callable[[], bool]] = None,
+                 holder: Union[None, Popen] = None) -> ProcessGroup:
+        # The timeout is in seconds, None lets the group run until it is
+        # unregistered or the supervisor shuts down
+        deadline = (None if timeout is None
+                    else monotonic() + timeout + self.grace_period)
+        group = ProcessGroup(pgid, deadline, is_done, holder)
+        with self.lock:
+            self.groups[pgid] = group
+            if self._thread is None:
+                self._thread = Thread(target=self._watch, name='watchdog',
+                                      daemon=True)
+                self._thread.start()
+        return group
+
+    def hold_group(self, timeout: Union[None, float] = None,
+                   is_done: Union[None, Callable[[], bool]] = None
+                   ) -> ProcessGroup:
+        # A new group for processes that others reap, such as the asyncio
+        # child watcher as soon as they exit. It is led by a holder that
+        # this supervisor only reaps once it killed the group, so that the
+        # id of the group cannot be reused by another run before. The
+        # group is in the session of the runner, which processes can only
+        # join within their session, but does not receive the signals of
+        # the terminal, as it is not in the foreground.
+        holder = Popen(['sleep', 'infinity'], stdin=DEVNULL, stdout=DEVNULL,
+                       stderr=DEVNULL, **group_kwargs(0))
+        return self.register(holder.pid, timeout, is_done, holder)
+
+    def unregister(self, group: ProcessGroup) -> None:
+        # Kills what is left of the group, for example a solver that its
+        # driver did not wait for
+        with self.lock:
+            if self.groups.get(group.pgid) is group:
+                del self.groups[group.pgid]
+                signal_group(group.pgid, SIGKILL)
+                if group.holder is not None:
+                    group.holder.wait()
+
+    def _signal(self, group: ProcessGroup, signal_number: int) -> None:
+        # Only a group that is still registered is signalled: once its
+        # leader was reaped, its id may have been reused, and registering
+        # it again replaces the group that is gone
+        with self.lock:
+            if self.groups.get(group.pgid) is group:
+                signal_group(group.pgid, signal_number)
+
+    def track_files(self, file_paths: List[str]) -> None:
+        with self.lock:
+            self.files.update(file_paths)
+
+    def remove_files(self, file_paths: List[str]) -> None:
+        with self.lock:
+            self.files.difference_update(file_paths)
+        for file_path in file_paths:
+            if path.isfile(file_path):
+                remove(file_path)
+
+    def _watch(self) -> None:
+        while True:
+            sleep(WATCHDOG_INTERVAL)
+            now = monotonic()
+            with self.lock:
+                groups = list(self.groups.values())
+            for group in groups:
+                if group.is_done is not None and group.is_done():
+                    self.unregister(group)
+                elif group.terminated is not None:
+                    if now >= group.terminated + self.grace_period:
+                        self._signal(group, SIGKILL)
+                elif group.deadline is not None and now >= group.deadline:
+                    group.expired = True
+                    group.terminated = now
+                    self._signal(group, SIGTERM)
+
+    def run(self, cmd: List[str], timeout: Union[None, float] = None,
+            **kwargs: Any) -> Tuple[CompletedProcess, bool]:
+        # subprocess.run in its own process group under the watchdog, and
+        # whether the watchdog terminated it. The output goes to temporary
+        # files, so that the leader can be waited for without reaping it:
+        # until it is reaped, the id of its group cannot be reused by
+        # another run, and what is left of the group is killed safely.
+        with TemporaryFile() as stdout, TemporaryFile() as stderr:
+            with Popen(cmd, stdin=None, stdout=stdout, stderr=stderr,
+                       start_new_session=True, **kwargs) as process:
+                group = self.register(process.pid, timeout)
+                try:
+                    waitid(P_PID, process.pid, WEXITED | WNOWAIT)
+                finally:
+                    self.unregister(group)
+            stdout.seek(0)
+            stderr.seek(0)
+            return (CompletedProcess(cmd, process.returncode, stdout.read(),
+                                     stderr.read()),
+                    group.expired)
+
+    def shutdown(self) -> None:
+        # Terminates all process groups, kills those still alive after the
+        # shutdown grace period, and removes the temporary files
+        with self.lock:
+            groups = list(self.groups.values())
+            self.groups = dict()
+            files = list(self.files)
+            self.files = set()
+        for group in groups:
+            signal_group(group.pgid, SIGTERM)
+        end = monotonic() + SHUTDOWN_GRACE_PERIOD
+        while (monotonic() < end and
+               any(signal_group(g.pgid, 0) for g in groups)):
+            sleep(WATCHDOG_INTERVAL)
+        for group in groups:
+            signal_group(group.pgid, SIGKILL)
+        for file_path in files:
+            if path.isfile(file_path):
+                remove(file_path)
+
+
+_supervisor: Union[None, Supervisor] = None
+
+
+def get_supervisor() -> Supervisor:
+    global _supervisor
+    if _supervisor is None:
+        _supervisor = Supervisor()
+        atexit.register(_supervisor.shutdown)
+    return _supervisor
+
+
+def install_shutdown_hook() -> None:
+    # Ctrl-C and SIGTERM first tear down the solver process groups, which
+    # do not receive the signal of the terminal as they run in their own
+    # sessions or background groups, and then interrupt the runner
+    def handler(signal_number: int, frame: Any) -> None:
+        get_supervisor().shutdown()
+        default_int_handler(signal_number, frame)
+
+    signal(SIGINT, handler)
+    signal(SIGTERM, handler)
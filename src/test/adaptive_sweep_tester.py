@@ -0,0 +1,45 @@
+import unittest
+from minizinc import Status
+from ..adaptive_sweep import AdaptiveSweep
+from ..param_grid import ParamRange
+from .results import make_result
+
+
+class AdaptiveSweepTester(unittest.TestCase):
+    def test_bisection(self):
+        sweep = AdaptiveSweep(ParamRange('n', 0, 100, 50), resolution=10)
+        self.assertEqual(sweep.coarse_values(), [0, 50, 100])
+        sweep.add(0, [make_result(Status.SATISFIED, 10, 10),
+                      make_result(Status.SATISFIED, 10, 10)])
+        sweep.add(50, [make_result(Status.SATISFIED, 20, 20),
+                       make_result(Status.SATISFIED, 10, 10)])
+        sweep.add(100, [make_result(Status.SATISFIED, 20, 20),
+                        make_result(Status.UNKNOWN, 5000, 5000)])
+        self.assertEqual(sweep.next_values(), [75])
+        # A jump in time is a change as well
+        sweep.add(75, [make_result(Status.SATISFIED, 20, 20),
+                       make_result(Status.SATISFIED, 1000, 1000)])
+        self.assertEqual(sweep.next_values(), [62, 87])
+        # Intervals within the resolution are not bisected
+        sweep.add(62, [make_result(Status.SATISFIED, 20, 20),
+                       make_result(Status.SATISFIED, 1000, 1000)])
+        sweep.add(87, [make_result(Status.SATISFIED, 20, 20),
+                       make_result(Status.SATISFIED, 1000, 1000)])
+        self.assertEqual(sweep.next_values(), [56, 93])
+        sweep.add(56, [make_result(Status.SATISFIED, 20, 20),
+                       make_result(Status.SATISFIED, 1000, 1000)])
+        sweep.add(93, [make_result(Status.SATISFIED, 20, 20),
+                       make_result(Status.SATISFIED, 1000, 1000)])
+        self.assertEqual(sweep.next_values(), [])
+
+    def test_frontier(self):
+        sweep = AdaptiveSweep(ParamRange('n', 0, 100, 50))
+        sweep.add(0, [make_result(Status.SATISFIED, 10, 10), None])
+        sweep.add(50, [make_result(Status.SATISFIED, 10, 10),
+                       make_result(Status.SATISFIED, 10, 10)])
+        sweep.add(100, [make_result(Status.UNKNOWN, 5000, 5000), None])
+        self.assertEqual(sweep.frontier(0), 50)
+        self.assertEqual(sweep.frontier(1), 50)
+        # Backends that did not run do not change
+        self.assertFalse(sweep.changes(
+          None, make_result(Status.UNKNOWN, 10, 10)))
@@ -0,0 +1,51 @@
+import unittest
+from os import path, utime, symlink, stat, environ
+from tempfile import TemporaryDirectory
+from ..aux import load_minizinc_backends, save_minizinc_backends
+
+BACKENDS = [('gecode', 'Gecode'), ('sat', 'OR-Tools CP-SAT')]
+
+
+class AuxTester(unittest.TestCase):
+    def test_solver_cache(self):
+        with TemporaryDirectory() as tmp_dir:
+            executable = path.join(tmp_dir, 'minizinc')
+            with open(executable, 'w'):
+                pass
+            cache_path = path.join(tmp_dir, 'cache', 'solvers.json')
+            self.assertIsNone(load_minizinc_backends(executable, cache_path))
+            save_minizinc_backends(executable, BACKENDS, cache_path)
+            self.assertEqual(load_minizinc_backends(executable, cache_path),
+                             BACKENDS)
+            # The executable is keyed by its real path
+            link = path.join(tmp_dir, 'minizinc-link')
+            symlink(executable, link)
+            self.assertEqual(load_minizinc_backends(link, cache_path),
+                             BACKENDS)
+
+            # A changed solver path invalidates the cache
+            solver_path = environ.get('MZN_SOLVER_PATH', None)
+            environ['MZN_SOLVER_PATH'] = path.join(tmp_dir, 'solvers')
+            try:
+                self.assertIsNone(load_minizinc_backends(executable,
+                                                         cache_path))
+            finally:
+                if solver_path is None:
+                    del environ['MZN_SOLVER_PATH']
+                else:
+                    environ['MZN_SOLVER_PATH'] = solver_path
+
+            # So does an updated executable
+            mtime = stat(executable).st_mtime
+            utime(executable, (mtime + 10, mtime + 10))
+            self.assertIsNone(load_minizinc_backends(executable, cache_path))
+
+            # A corrupt cache is a miss, and is replaced
+            for text in ('{"key": ', '[]', '{"key": 1}'):
+                with open(cache_path, 'w') as cache_file:
+                    cache_file.write(text)
+                self.assertIsNone(load_minizinc_backends(executable,
+                                                         cache_path))
+            save_minizinc_backends(executable, BACKENDS, cache_path)
+            self.assertEqual(load_minizinc_backends(executable, cache_path),
+                             BACKENDS)
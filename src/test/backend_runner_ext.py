@@ -1,8 +1,8 @@
-
-from typing import Callable, Union, Tuple
+from typing import Callable
 import minizinc
 from ..backend_runner import BackendRunner
 from ..result import Result
+from ..cell import Cell
 
 
 class BackendRunnerExt(BackendRunner):
@@ -13,10 +13,8 @@ class BackendRunnerExt(BackendRunner):
         self.next_instance = instance
         self.next_result = result
 
-    def _get_instance(self, backend_id: str,
-                      data_file: Union[None, str] = None) -> minizinc.Instance:
+    def _get_instance(self, cell: Cell) -> minizinc.Instance:
         return self.next_instance()
 
-    def _get_result(self, backend_id: str, instance: minizinc.Instance,
-                    param: Union[None, Tuple[str, int]] = None) -> Result:
+    def _get_result(self, cell: Cell, instance: minizinc.Instance) -> Result:
         return self.next_result()
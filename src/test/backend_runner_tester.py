@@ -7,6 +7,7 @@ from json import loads
 from ..outputters.json_outputter import JsonOutputter
 from ..outputters.log_outputter import LogOutputter
 from ..outputters.tex_outputter import TexOutputter
+from ..param_grid import ParamRange, ParamGrid
 from os import path
 from glob import glob
 import logging
@@ -105,7 +106,11 @@ class BackendRunnerTester(unittest.TestCase):
             solution,
             result_data['_result']['statistics']),
           result_data['_all_solutions'],
-          self.json_data['vars'])
+          self.json_data['vars'],
+          (None if result_data.get('wall_time', None) is None
+           else timedelta(milliseconds=result_data['wall_time'])),
+          result_data.get('time_source', 'solver'),
+          result_data.get('_out_of_memory', False))
 
     def init_test_file(self, json_file_name: str):
         with open(json_file_name) as json_file:
@@ -162,11 +167,10 @@ class BackendRunnerTester(unittest.TestCase):
 
                 for run in self.json_data['runs']:
                     self.assertIn('data_file', run)
-                    self.assertIn('param_name', run)
-                    self.assertIn('param_value', run)
+                    self.assertIn('params', run)
 
                 has_data_file = first_run['data_file'] is not None
-                has_param = first_run['param_name'] is not None
+                has_param = first_run['params'] is not None
                 self.assertFalse(has_data_file and has_param)
                 if has_data_file:
                     for run in self.json_data['runs']:
@@ -175,16 +179,18 @@ class BackendRunnerTester(unittest.TestCase):
                       [r['data_file'] for r in self.json_data['runs']])
                 elif has_param:
                     for run in self.json_data['runs']:
-                        self.assertIsNotNone(run['param_name'], run)
-                        self.assertIsNotNone(run['param_value'], run)
-                    param_name = first_run['param_name']
-                    start = first_run['param_value']
-                    stop = self.json_data['runs'][-1]['param_value']
-                    increment = 1
-                    if len(self.json_data['runs']) > 1:
-                        increment = (
-                          self.json_data['runs'][1]['param_value'] - start)
-                    self.backend_runner.run_with_param(param_name, start,
-                                                       stop, increment)
+                        self.assertIsNotNone(run['params'], run)
+                    ranges = []
+                    for i, (param_name, _) in enumerate(first_run['params']):
+                        values = []
+                        for run in self.json_data['runs']:
+                            value = run['params'][i][1]
+                            if value not in values:
+                                values.append(value)
+                        increment = (1 if len(values) == 1
+                                     else values[1] - values[0])
+                        ranges.append(ParamRange(param_name, values[0],
+                                                 values[-1], increment))
+                    self.backend_runner.run_with_params(ParamGrid(ranges))
                 else:
                     self.backend_runner.run()
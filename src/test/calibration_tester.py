@@ -0,0 +1,75 @@
+import unittest
+import minizinc
+from datetime import timedelta
+from json import dump, load
+from os import path
+from tempfile import TemporaryDirectory
+from threading import Thread
+from time import sleep
+from .. import calibration as calibration_module
+from ..calibration import Calibration, calibrate
+from ..result import Result
+
+
+class CalibrationTester(unittest.TestCase):
+    def test_speed_factor(self):
+        calibration = Calibration('slow', 'fast', 4.0, 2.0)
+        self.assertEqual(calibration.speed_factor, 0.5)
+        self.assertEqual(calibration.scale_timeout(120000), 240000)
+        self.assertEqual(Calibration('fast', 'fast', 2.0, 2.0
+                                     ).scale_timeout(1000), 1000)
+
+    def test_calibrate(self):
+        # Hosts in the file are not measured again
+        with TemporaryDirectory() as tmp_dir:
+            calibration_path = path.join(tmp_dir, 'calibration.json')
+            with open(calibration_path, 'w') as calibration_file:
+                dump({'reference': 'a', 'backend': 'gecode',
+                      'hosts': {'a': {'time': 3.0}, 'b': {'time': 2.0}}},
+                     calibration_file)
+            calibration = calibrate(calibration_path, host='b')
+            self.assertEqual(calibration.reference_host, 'a')
+            self.assertEqual(calibration.speed_factor, 1.5)
+            with self.assertRaises(ValueError):
+                calibrate(calibration_path, 'chuffed', 'b')
+
+    def test_concurrent_calibrate(self):
+        # Hosts that calibrate at once all end up in the file, with the
+        # same reference host
+        def measure(backend):
+            sleep(0.1)
+            return 2.0
+        measure_host = calibration_module.measure
+        calibration_module.measure = measure
+        try:
+            with TemporaryDirectory() as tmp_dir:
+                calibration_path = path.join(tmp_dir, 'calibration.json')
+                calibrations = dict()
+
+                def run(host):
+                    calibrations[host] = calibrate(calibration_path,
+                                                   host=host)
+                threads = [Thread(target=run, args=(host, ))
+                           for host in 'abcd']
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                with open(calibration_path) as calibration_file:
+                    written = load(calibration_file)
+        finally:
+            calibration_module.measure = measure_host
+        self.assertEqual(sorted(written['hosts']), list('abcd'))
+        self.assertEqual({c.reference_host for c in calibrations.values()},
+                         {written['reference']})
+
+    def test_normalized_time(self):
+        result = Result(minizinc.Method.SATISFY,
+                        minizinc.Result(minizinc.Status.SATISFIED, None,
+                                        {'solveTime': 1000.0}),
+                        False, [], timedelta(seconds=4), 'wall')
+        result.speed_factor = 0.5
+        self.assertEqual(result.host_time, timedelta(seconds=4))
+        self.assertEqual(result.time, timedelta(seconds=2))
+        self.assertEqual(result.solve_time, timedelta(seconds=0.5))
+        self.assertEqual(result.search_time, timedelta(seconds=1))
@@ -0,0 +1,62 @@
+import unittest
+from json import dump
+from os import path, mkdir
+from tempfile import TemporaryDirectory
+from ..campaign import Campaign
+
+
+class CampaignTester(unittest.TestCase):
+    def write_spec(self, tmp_dir, spec):
+        spec_path = path.join(tmp_dir, 'campaign.json')
+        with open(spec_path, 'w') as spec_file:
+            dump(spec, spec_file)
+        return spec_path
+
+    def test_studies(self):
+        with TemporaryDirectory() as tmp_dir:
+            mkdir(path.join(tmp_dir, 'data'))
+            for name in ('a.mzn', 'b.mzn', 'data/1.dzn', 'data/2.dzn',
+                         'data/2.json'):
+                open(path.join(tmp_dir, name), 'w').close()
+            spec_path = self.write_spec(tmp_dir, {
+              'timeout': '1m', 'backends': ['gecode', 'chuffed'],
+              'timeouts': {'chuffed': '30s'}, 'variants': {'lns': '--lns'},
+              'models': [
+                {'model': 'a.mzn', 'data': ['data/*.dzn', 'data/2.*']},
+                {'model': 'b.mzn', 'params': [['n', 1, 5, 2], ['m', 0, 1, 1]],
+                 'timeout': 2000, 'backends': ['gecode'], 'repetitions': 3}
+              ]})
+            a, b = Campaign.load(spec_path).studies()
+
+            self.assertEqual(a.model, path.join(tmp_dir, 'a.mzn'))
+            self.assertEqual(a.timeout, 60000)
+            self.assertEqual(a.backend_timeouts, {'chuffed': 30000})
+            self.assertEqual(a.variants, {'lns': '--lns'})
+            self.assertEqual(a.repetitions, 1)
+            self.assertEqual(a.num_instances, 3)
+            self.assertEqual(
+              [path.relpath(d, tmp_dir) for _, d in a.instances()],
+              ['data/1.dzn', 'data/2.dzn', 'data/2.json'])
+
+            self.assertEqual(b.timeout, 2000)
+            self.assertEqual(b.backends, ['gecode'])
+            self.assertEqual(b.repetitions, 3)
+            self.assertEqual(b.param_names, ('n', 'm'))
+            self.assertEqual(b.num_instances, 6)
+            self.assertEqual(next(b.instances()),
+                             ((('n', 1), ('m', 0)), None))
+
+    def test_invalid(self):
+        with TemporaryDirectory() as tmp_dir:
+            open(path.join(tmp_dir, 'a.mzn'), 'w').close()
+            for spec in ({'models': []},
+                         {'models': [{'model': 'missing.mzn'}]},
+                         {'models': [{'model': 'a.mzn'}], 'timeout': 'x'},
+                         {'models': [{'model': 'a.mzn', 'data': ['*.dzn'],
+                                      'params': [['n', 1, 2, 1]]}]},
+                         {'models': [{'model': 'a.mzn',
+                                      'params': [['n', 1, 5, -1]]}]},
+                         {'models': [{'model': 'a.mzn', 'repetitions': 0}]},
+                         {'models': [{'model': 'a.mzn', 'solver': 'x'}]}):
+                with self.assertRaises(ValueError):
+                    Campaign.load(self.write_spec(tmp_dir, spec))
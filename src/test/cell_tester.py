@@ -0,0 +1,31 @@
+import unittest
+import minizinc
+from datetime import timedelta
+from ..cell import Cell, RunRecord
+from ..result import Result
+
+
+class CellTester(unittest.TestCase):
+    def test_repeat(self):
+        cell = Cell(4, 10, ('n', ), (('n', 3), ), None, 1, 'gecode~lns',
+                    'Gecode lns', 2, 1000, 'm.mzn', {'--lns': 'on'})
+        repeated = cell.repeat(2)
+        self.assertEqual((repeated.instance_index, repeated.repetition),
+                         (6, 2))
+        self.assertEqual((cell.instance_index, cell.repetition), (4, 0))
+        repeated.timeout = 2000
+        self.assertEqual(cell.timeout, 1000)
+
+    def test_run_record(self):
+        cell = Cell(0, 1, None, None, 'a.dzn', 0, 'gecode', 'Gecode', 1,
+                    1000, 'm.mzn', {'-p': '2', '-f': True})
+        result = Result(minizinc.Method.SATISFY,
+                        minizinc.Result(minizinc.Status.SATISFIED, None, {}),
+                        False, [], timedelta(seconds=1), 'wall')
+        record = RunRecord.from_cell(cell, result)
+        self.assertEqual(record.flags, (('-f', True), ('-p', '2')))
+        self.assertEqual((record.data_file, record.timeout, record.model),
+                         ('a.dzn', 1000, 'm.mzn'))
+        self.assertIs(record.result, result)
+        with self.assertRaises(AttributeError):
+            record.timeout = 2000
@@ -0,0 +1,27 @@
+import unittest
+import minizinc
+from subprocess import CalledProcessError
+from ..faults import is_transient, retry_backoff, error_message, MAX_BACKOFF
+
+
+class FaultsTester(unittest.TestCase):
+    def test_is_transient(self):
+        self.assertTrue(is_transient(
+          minizinc.error.MiniZincError(None, 'license check failed')))
+        self.assertTrue(is_transient(OSError('driver crashed')))
+        self.assertFalse(is_transient(
+          minizinc.error.TypeError(None, 'MiniZinc: type error: x')))
+        self.assertFalse(is_transient(
+          minizinc.error.SyntaxError(None, 'Error: syntax error')))
+
+    def test_retry_backoff(self):
+        self.assertEqual([retry_backoff(r, 0.5) for r in (1, 2, 3)],
+                         [0.5, 1.0, 2.0])
+        self.assertEqual(retry_backoff(20), MAX_BACKOFF)
+
+    def test_error_message(self):
+        self.assertEqual(error_message(CalledProcessError(
+          1, ['minizinc'], stderr=b'  license expired\n')), 'license expired')
+        self.assertEqual(error_message(RuntimeError('no solver')),
+                         'RuntimeError: no solver')
+        self.assertEqual(error_message(RuntimeError()), 'RuntimeError')
@@ -0,0 +1,119 @@
+import unittest
+import sys
+import minizinc
+from json import dumps, load
+from os import chmod, path
+from tempfile import TemporaryDirectory
+from ..flattener import Flattener, FlattenTimeout, run_solver, \
+  solution_values, VARS_SECTION
+from ..supervisor import get_supervisor
+
+# A minizinc --compile that writes its arguments and the items added to the
+# model to the FlatZinc file, or hangs given the flag --hang
+FAKE_COMPILE = '''import sys, json, time, os
+args = sys.argv[1:]
+if '--hang' in args:
+    time.sleep(30)
+items = [open(arg).read() for arg in args
+         if arg.endswith('.mzn') and os.path.isfile(arg)]
+with open(args[args.index('--fzn') + 1], 'w') as fzn:
+    json.dump(args + items, fzn)
+print('%%%mzn-stat: flatTime=0.25')
+'''
+
+
+class ScriptFlattener(Flattener):
+    executable: str = ''
+
+    def __init__(self, executable: str):
+        super().__init__(1)
+        self.executable = executable
+
+
+def solution_line(x: int, y: int, objective: int) -> str:
+    return dumps({'type': 'solution', 'output': {'json': {
+      'x': x, 'y': y, '_objective': objective}}, 'time': objective})
+
+
+class FlattenerTester(unittest.TestCase):
+    def solve(self, lines, vars=None):
+        text = '\n'.join(lines)
+        return run_solver([sys.executable, '-c', f'print({text!r})'], 10000,
+                          vars=vars)
+
+    def test_run_solver(self):
+        lines = [solution_line(1, 2, 30), solution_line(3, 4, 20),
+                 dumps({'type': 'statistics',
+                        'statistics': {'nodes': 5}}),
+                 dumps({'type': 'status', 'status': 'OPTIMAL_SOLUTION'})]
+        full = self.solve(lines)
+        lean = self.solve(lines, ['y'])
+        for result in (full, lean):
+            self.assertEqual(result.status,
+                             minizinc.Status.OPTIMAL_SOLUTION)
+            self.assertEqual(result.objective, 20)
+            self.assertEqual(result['y'], 4)
+            self.assertEqual(result.statistics['nodes'], 5)
+        self.assertEqual(full['x'], 3)
+        self.assertFalse(hasattr(lean.solution, 'x'))
+        self.assertEqual(self.solve(lines[2:], ['y']).solution, None)
+
+    def test_solution_values(self):
+        # The vars of a lean run are the text of their output section
+        values = solution_values({'type': 'solution', 'output': {
+          VARS_SECTION: '{"x": [1, 2], "_objective": 5}', 'raw': ''}},
+          ['x'])
+        self.assertEqual((values.x, values.objective), ([1, 2], 5))
+
+    def test_flatten(self):
+        with TemporaryDirectory() as tmp_dir:
+            script = path.join(tmp_dir, 'minizinc')
+            with open(script, 'w') as script_file:
+                script_file.write(f'#!{sys.executable}\n{FAKE_COMPILE}')
+            chmod(script, 0o755)
+            flattener = ScriptFlattener(script)
+            try:
+                flat = flattener.submit(
+                  flattener.flatten, 'model.mzn', 'gecode',
+                  minizinc.Method.SATISFY, {'-p': '4'}, (('n', 3), ),
+                  None, None, 10000).result()
+                with open(flat.fzn_path) as fzn_file:
+                    args = load(fzn_file)
+                flat.remove()
+                self.assertEqual(args[args.index('-p') + 1], '4')
+                self.assertEqual(args[args.index('-D') + 1], 'n = 3;')
+                self.assertEqual(flat.statistics['flatTime'].total_seconds(),
+                                 0.25)
+                self.assertFalse(path.isfile(flat.fzn_path))
+
+                # A lean flattening outputs the section of its vars
+                flat = flattener.flatten('model.mzn', 'gecode',
+                                         minizinc.Method.MINIMIZE, {},
+                                         constraint='constraint x < 3;',
+                                         timeout=10000, vars=['x'])
+                with open(flat.fzn_path) as fzn_file:
+                    args = load(fzn_file)
+                flat.remove()
+                self.assertNotIn('--output-mode', args)
+                self.assertEqual(args[-1],
+                                 'constraint x < 3;\n'
+                                 f'output :: "{VARS_SECTION}" ["{{", '
+                                 '"\\"x\\": ", showJSON(x), ", ", '
+                                 '"\\"_objective\\": ", '
+                                 'showJSON(_objective), "}"];\n')
+
+                # A hung flattening times out with the timeout of its run
+                supervisor = get_supervisor()
+                grace_period = supervisor.grace_period
+                supervisor.grace_period = 0.1
+                try:
+                    with self.assertRaises(FlattenTimeout) as error:
+                        flattener.flatten('model.mzn', 'gecode',
+                                          minizinc.Method.MINIMIZE,
+                                          {'--hang': True}, timeout=100)
+                finally:
+                    supervisor.grace_period = grace_period
+                self.assertEqual(error.exception.method,
+                                 minizinc.Method.MINIMIZE)
+            finally:
+                flattener.shutdown()
@@ -0,0 +1,74 @@
+import unittest
+from os import listdir, path
+from tempfile import TemporaryDirectory
+from ..generator import Generator, instance_text, generate_instance, \
+  generator_id, generator_points
+from ..faults import FailedInstance
+
+SPEC = 'src.test.generator_tester:make_instance'
+
+
+def make_instance(params, seed):
+    # Equal for the seeds 0 and 2, to share a cached file
+    return {'n': params.get('n', 1), 'parity': seed % 2, 's': {3, 1}}
+
+
+def make_odd_instance(params, seed):
+    if seed % 2 == 0:
+        raise ValueError(f'even seed {seed}')
+    return 'n = 1;'
+
+
+class GeneratorTester(unittest.TestCase):
+    def test_instance_text(self):
+        self.assertEqual(instance_text('n = 3;'), ('n = 3;', '.dzn'))
+        self.assertEqual(instance_text({'s': {2, 1}, 'n': 3}),
+                         ('{"n": 3, "s": {"set": [1, 2]}}', '.json'))
+        with self.assertRaises(TypeError):
+            instance_text([1, 2])
+
+    def test_cache(self):
+        with TemporaryDirectory() as cache_dir:
+            generator = Generator(SPEC, cache_dir)
+            files = [generate_instance(SPEC, generator.gen_id, cache_dir,
+                                       {'n': 4}, seed) for seed in range(3)]
+            self.assertEqual(files[0], files[2])
+            self.assertNotEqual(files[0], files[1])
+            self.assertEqual(len([f for f in listdir(cache_dir)
+                                  if f.endswith('.json')]), 2)
+            # A cached instance is not generated again
+            self.assertEqual(generate_instance(SPEC, generator.gen_id,
+                                               cache_dir, {'n': 4}, 1),
+                             files[1])
+        self.assertNotEqual(generator_id(SPEC),
+                            generator_id('src.generator:instance_text'))
+
+    def test_generate(self):
+        with TemporaryDirectory() as cache_dir:
+            points = list(generator_points(({'n': n} for n in range(3)),
+                                           [0, 1]))
+            self.assertEqual(len(points), 6)
+            files = list(Generator(SPEC, cache_dir, 2).generate(points))
+            self.assertEqual(len(files), 6)
+            for (params, seed), data_file in zip(points, files):
+                self.assertEqual(
+                  data_file, generate_instance(SPEC, generator_id(SPEC),
+                                               cache_dir, params, seed))
+                self.assertTrue(path.isfile(data_file))
+
+    def test_generate_error(self):
+        # An instance the generator fails on is yielded with its error
+        with TemporaryDirectory() as cache_dir:
+            files = list(Generator('src.test.generator_tester:'
+                                   'make_odd_instance', cache_dir).generate(
+              generator_points([{'n': 1}], [0, 1])))
+        self.assertIsInstance(files[0], FailedInstance)
+        self.assertEqual(str(files[0].error), 'even seed 0')
+        self.assertNotIsInstance(files[1], FailedInstance)
+
+    def test_load_error(self):
+        with TemporaryDirectory() as cache_dir:
+            with self.assertRaises(ValueError):
+                Generator('make_instance', cache_dir)
+            with self.assertRaises(ValueError):
+                Generator('src.test.generator_tester:SPEC', cache_dir)
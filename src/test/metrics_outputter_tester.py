@@ -0,0 +1,72 @@
+import unittest
+import minizinc
+from os import path
+from tempfile import TemporaryDirectory
+from urllib.request import urlopen
+from ..outputters.metrics_outputter import MetricsOutputter, CONTENT_TYPE
+from .results import make_result
+
+
+class MetricsOutputterTester(unittest.TestCase):
+    def test_scrape(self):
+        outputter = MetricsOutputter(port=0, host='127.0.0.1')
+        try:
+            outputter.set_up(None)
+            outputter.intro([('a', 'a'), ('b', 'b')], 'model', 1000, True,
+                            [], None, False, [])
+            for backend_name, status, time_ms in (
+                  ('a', minizinc.Status.SATISFIED, 200),
+                  ('b', minizinc.Status.UNKNOWN, 1000)):
+                outputter.pre_run(backend_name, backend_name, 0, 2, 0, 3,
+                                  None, None)
+                outputter.post_run(backend_name, backend_name, 0, 2, 0, 3,
+                                   None, None, make_result(status, time_ms))
+            outputter.outputter_latency('TexOutputter', 'post_run', 0.002)
+            outputter.pre_run('a', 'a', 0, 2, 1, 3, None, None)
+
+            url = f'http://127.0.0.1:{outputter.port}/metrics'
+            with urlopen(url) as response:
+                self.assertEqual(response.headers['Content-Type'],
+                                 CONTENT_TYPE)
+                lines = response.read().decode().splitlines()
+        finally:
+            outputter.close()
+
+        self.assertEqual(lines[-1], '# EOF')
+        self.assertIn('run_backends_runs_total{backend="a"} 1', lines)
+        self.assertIn('run_backends_timeouts_total{backend="b"} 1', lines)
+        self.assertNotIn('run_backends_timeouts_total{backend="a"} 1', lines)
+        self.assertIn('run_backends_queue_depth 3', lines)
+        self.assertIn('run_backends_active_solvers 1', lines)
+        self.assertIn('run_backends_run_duration_seconds_bucket'
+                      '{backend="a",le="0.5"} 1', lines)
+        self.assertIn('run_backends_run_duration_seconds_bucket'
+                      '{backend="b",le="0.5"} 0', lines)
+        self.assertIn('run_backends_outputter_latency_seconds_count'
+                      '{outputter="TexOutputter",callback="post_run"} 1',
+                      lines)
+
+    def test_monotonic(self):
+        # The counters survive new sessions, and the file is only rewritten
+        # once per interval while runs are in flight
+        with TemporaryDirectory() as tmp_dir:
+            metrics_path = path.join(tmp_dir, 'metrics.txt')
+            outputter = MetricsOutputter(metrics_file_path=metrics_path)
+            for _ in range(2):
+                outputter.set_up(None)
+                outputter.intro([('a', 'a')], 'model', 1000, True, [], None,
+                                False, [])
+                for _ in range(3):
+                    outputter.pre_run('a', 'a', 0, 1, 0, 3, None, None)
+                    outputter.post_run('a', 'a', 0, 1, 0, 3, None, None,
+                                       make_result(minizinc.Status.SATISFIED,
+                                                   100))
+                with open(metrics_path) as metrics_file:
+                    self.assertNotIn('runs_total{backend="a"} 6',
+                                     metrics_file.read())
+                outputter.outro()
+                outputter.tear_down()
+            with open(metrics_path) as metrics_file:
+                lines = metrics_file.read().splitlines()
+        self.assertIn('run_backends_runs_total{backend="a"} 6', lines)
+        self.assertIn('run_backends_queue_depth 0', lines)
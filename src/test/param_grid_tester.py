@@ -0,0 +1,26 @@
+import unittest
+from ..param_grid import ParamRange, ParamGrid
+
+
+class ParamGridTester(unittest.TestCase):
+    def test_range(self):
+        self.assertEqual(list(ParamRange('n', 1, 5, 2).values), [1, 3, 5])
+        self.assertEqual(list(ParamRange('n', 5, 1, -2).values), [5, 3, 1])
+        self.assertEqual(list(ParamRange('n', 3, 3, 0).values), [3])
+        self.assertEqual(len(ParamRange('n', 1, 4, 2)), 2)
+
+    def test_grid(self):
+        grid = ParamGrid([ParamRange('n', 1, 2, 1),
+                          ParamRange('d', 10, 30, 10)])
+        self.assertEqual(grid.names, ('n', 'd'))
+        self.assertEqual(len(grid), 6)
+        points = list(grid)
+        self.assertEqual(len(points), 6)
+        self.assertEqual(points[0], (('n', 1), ('d', 10)))
+        self.assertEqual(points[-1], (('n', 2), ('d', 30)))
+
+    def test_large_grid_is_lazy(self):
+        grid = ParamGrid([ParamRange(name, 1, 1000, 1)
+                          for name in ('a', 'b', 'c')])
+        self.assertEqual(len(grid), 1000 ** 3)
+        self.assertEqual(next(iter(grid)), (('a', 1), ('b', 1), ('c', 1)))
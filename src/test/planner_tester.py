@@ -0,0 +1,70 @@
+import unittest
+from json import dump
+from math import inf
+from os import remove
+from tempfile import NamedTemporaryFile
+from ..planner import History, plan
+
+
+class PlannerTester(unittest.TestCase):
+    def test_history(self):
+        run = {'backend_name': 'a', 'param': None, 'timed_out': False,
+               'time': 2000, 'wall_time': 3000}
+        with NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+            # The rerun of a timeout ladder replaces the timed out run
+            dump({'runs': [dict(run, data_file='/x/1.dzn', timed_out=True),
+                           dict(run, data_file='/x/1.dzn'),
+                           dict(run, data_file='/x/2.dzn', timed_out=True)]},
+                 f)
+        try:
+            history = History([f.name])
+        finally:
+            remove(f.name)
+        self.assertEqual(history.estimate(None, '/x/1.dzn', 'a'),
+                         ([3.0], True))
+        self.assertEqual(history.estimate(None, '/y/2.dzn', 'a'),
+                         ([inf], True))
+        self.assertEqual(history.estimate(None, '/x/3.dzn', 'a'),
+                         ([3.0, inf], False))
+        self.assertEqual(history.estimate(None, '/x/3.dzn', 'b'),
+                         ([3.0, inf], False))
+        self.assertEqual(History().estimate(None, None, 'a'), ([inf], False))
+
+    def test_plan(self):
+        cells = [(1, [10.0])] * 4
+        result = plan(cells, 0, [20.0], 2, 2)
+        self.assertEqual(result.makespan, 20.0)
+        self.assertEqual(result.cpu_seconds, 40.0)
+        self.assertEqual(result.timeout_share, 0.0)
+        # A wide cell occupies both cores
+        result = plan([(2, [10.0])] + cells, 0, [20.0], 4, 2)
+        self.assertEqual(result.makespan, 30.0)
+        self.assertEqual(result.cpu_seconds, 60.0)
+        # The second job only runs ahead of a slow cell within the window
+        # of the scheduler, 15 cells, before it waits for it
+        result = plan([(1, [100.0])] + [(1, [1.0])] * 40, 0, [200.0], 2, 2)
+        self.assertEqual(result.makespan, 100.0 + 13.0)
+        # Every cell times out at 5s, and is rerun with the next timeout
+        result = plan(cells, 0, [5.0], 2, 2)
+        self.assertEqual(result.makespan, 10.0)
+        self.assertEqual(result.timeout_share, 1.0)
+        result = plan(cells, 0, [5.0, 20.0], 2, 2)
+        self.assertEqual(result.makespan, 30.0)
+        self.assertEqual(result.cpu_seconds, 60.0)
+        self.assertEqual(result.timeout_share, 0.0)
+        # Backends with their own timeouts cut their cells short
+        result = plan(cells, 0, [20.0], 2, 2,
+                      cell_timeouts=[5.0, 20.0, 5.0, 20.0])
+        self.assertEqual(result.makespan, 20.0)
+        self.assertEqual(result.cpu_seconds, 30.0)
+        self.assertEqual(result.timeout_share, 0.5)
+        # A backend with a timeout of its own scales the ladder to it
+        result = plan(cells[:2], 0, [5.0, 20.0], 1, 1,
+                      cell_timeouts=[10.0, 20.0])
+        self.assertEqual(result.makespan, 2.5 + 5.0 + 10.0 + 10.0)
+        self.assertEqual(result.timeout_share, 0.0)
+        # A chunk of cells climbs the ladder before the next chunk starts
+        cells = [(1, [10.0]), (1, [1.0])]
+        self.assertEqual(plan(cells, 0, [5.0, 20.0], 2, 2).makespan, 15.0)
+        self.assertEqual(plan(cells, 0, [5.0, 20.0], 2, 2,
+                              chunk_sizes=[1, 1]).makespan, 16.0)
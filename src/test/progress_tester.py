@@ -0,0 +1,50 @@
+import unittest
+from minizinc import Status
+from ..progress import Progress, BackendProgress, seconds_to_str
+from .results import make_result
+
+
+class Clock:
+    now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ProgressTester(unittest.TestCase):
+    def test_expected_time(self):
+        backend = BackendProgress()
+        self.assertEqual(backend.expected_time(60), 60)
+        backend.add(make_result(Status.SATISFIED, 10000, 10000))
+        backend.add(make_result(Status.UNKNOWN, 60000, 60000))
+        self.assertEqual(backend.expected_time(60), 35)
+        # A run that reached a timeout of its own backend counts that one
+        result = make_result(Status.UNKNOWN, 20000, 20000)
+        result.timeout = 20000
+        backend.add(result)
+        self.assertEqual(backend.expected_time(60), 30)
+
+    def test_eta(self):
+        clock = Clock()
+        progress = Progress(60000, clock)
+        self.assertIsNone(progress.eta)
+        progress.started('a', 4)
+        # An unobserved backend is expected to take the timeout
+        self.assertEqual(progress.eta, 4 * 60)
+        # The ETA counts down while the cell runs
+        clock.now = 15
+        self.assertEqual(progress.eta, 4 * 60 - 15)
+        progress.finished('a', make_result(Status.SATISFIED, 20000, 20000))
+        self.assertEqual(progress.eta, 3 * 20)
+        progress.started('a', 4)
+        progress.started('a', 4)
+        clock.now = 25
+        # Two cells of 20s run in parallel, and did 10s each
+        self.assertEqual(progress.eta, (3 * 20 - 2 * 10) / 2)
+        self.assertEqual(progress.num_queued, 1)
+        self.assertEqual(progress.throughput, 3600 * 1 / 25)
+
+    def test_seconds_to_str(self):
+        self.assertEqual(seconds_to_str(75), '1m15s')
+        self.assertEqual(seconds_to_str(3 * 3600 + 120), '3h02m')
+        self.assertEqual(seconds_to_str(90000), '1d01h00m')
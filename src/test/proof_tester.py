@@ -0,0 +1,59 @@
+import unittest
+import minizinc
+from json import dump
+from os import remove, path
+from tempfile import TemporaryDirectory
+from ..proof import Bounds, model_objective
+from ..result import Result
+
+
+class ProofTester(unittest.TestCase):
+    def test_model_objective(self):
+        with TemporaryDirectory() as tmp_dir:
+            model = path.join(tmp_dir, 'm.mzn')
+            with open(path.join(tmp_dir, 'inc.mzn'), 'w') as inc:
+                inc.write('% solve satisfy;\n'
+                          'solve :: int_search(x, input_order, indomain_min)\n'
+                          '  minimize sum(x) /* the cost; */ + 1;\n')
+            with open(model, 'w') as m:
+                m.write('include "inc.mzn";\narray[1..3] of var 0..9: x;\n'
+                        'output ["solve; ", show(x)];\n')
+            self.assertEqual(model_objective(model),
+                             ('minimize', 'sum(x) + 1'))
+            with open(model, 'w') as m:
+                m.write('var 0..9: x;\nsolve satisfy;\n')
+            self.assertEqual(model_objective(model), None)
+
+    def test_bounds(self):
+        bounds = Bounds('maximize', 'profit')
+        with TemporaryDirectory() as tmp_dir:
+            results = path.join(tmp_dir, 'results.json')
+            with open(results, 'w') as results_file:
+                dump({'runs': [
+                  {'param': None, 'data_file': '/x/a.dzn', 'objective': 5,
+                   'error': False},
+                  {'param': None, 'data_file': '/x/a.dzn', 'objective': 7,
+                   'error': False},
+                  {'param': {'n': 3}, 'data_file': None, 'objective': 2,
+                   'error': False}]}, results_file)
+            bounds.load(results)
+            bounds_path = path.join(tmp_dir, 'bounds.json')
+            with open(bounds_path, 'w') as bounds_file:
+                dump({'b.dzn': 10, 'a.dzn': 6}, bounds_file)
+            bounds.load(bounds_path)
+            remove(bounds_path)
+        self.assertEqual(bounds.get(None, '/x/a.dzn'), 7)
+        self.assertEqual(bounds.get(None, '/y/b.dzn'), 10)
+        self.assertEqual(bounds.get((('n', 3),), None), 2)
+        self.assertEqual(bounds.get(None, '/y/c.dzn'), None)
+        self.assertEqual(bounds.constraint(None, '/x/a.dzn', 'proof'),
+                         'constraint (profit) >= 7;\n')
+        self.assertEqual(bounds.constraint(None, '/x/a.dzn', 'gap'),
+                         'constraint (profit) > 7;\n')
+
+    def test_proof_result(self):
+        mzn_result = minizinc.Result(minizinc.Status.UNSATISFIABLE, None, {})
+        self.assertTrue(Result(minizinc.Method.MINIMIZE, mzn_result, False,
+                               [], proof=True).solved)
+        self.assertFalse(Result(minizinc.Method.MINIMIZE, mzn_result, False,
+                                []).solved)
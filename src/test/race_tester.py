@@ -0,0 +1,53 @@
+import unittest
+from minizinc import Status
+from ..race import Race
+from ..stats import chi2_sf, t_ppf, rank, friedman
+from .results import make_result
+
+
+class RaceTester(unittest.TestCase):
+    def test_distributions(self):
+        self.assertAlmostEqual(chi2_sf(3.841, 1), 0.05, places=4)
+        self.assertAlmostEqual(chi2_sf(11.070, 5), 0.05, places=4)
+        self.assertAlmostEqual(t_ppf(0.975, 10), 2.228, places=3)
+        self.assertAlmostEqual(t_ppf(0.975, 1), 12.706, places=3)
+
+    def test_friedman(self):
+        self.assertEqual(rank([3, 1, 3, 2], lambda a, b: a - b),
+                         [3.5, 1.0, 3.5, 2.0])
+        statistic, p_value = friedman(
+          [[1, 2, 3], [1, 3, 2], [1, 2, 3], [1, 2, 3]])
+        self.assertAlmostEqual(statistic, 6.5)
+        self.assertAlmostEqual(p_value, 0.0388, places=4)
+        self.assertEqual(friedman([[1.5, 1.5], [1.5, 1.5]]), (0.0, 1.0))
+
+    def test_race(self):
+        race = Race(3, block_size=4)
+        for _ in range(3):
+            self.assertEqual(race.add([make_result(Status.SATISFIED, t, t)
+                                       for t in (10, 12, 5000)]), [])
+        eliminations = race.add([make_result(Status.SATISFIED, t, t)
+                                 for t in (12, 10, 5000)])
+        self.assertEqual([e.backend_index for e in eliminations], [2])
+        self.assertEqual(eliminations[0].best_backend_index, 0)
+        self.assertEqual(race.alive, [0, 1])
+        for _ in range(4):
+            self.assertEqual(race.add([make_result(Status.SATISFIED, 10, 10),
+                                       make_result(Status.SATISFIED, 10, 10),
+                                       None]), [])
+
+    def test_race_missing_results(self):
+        # Rows in which a backend still alive has no result are skipped
+        race = Race(3, block_size=4)
+        for _ in range(4):
+            self.assertEqual(race.add(
+              [make_result(Status.SATISFIED, 10, 10), None,
+               make_result(Status.SATISFIED, 5000, 5000)]), [])
+        self.assertEqual(race.alive, [0, 1, 2])
+        eliminations = []
+        for times in [(10, 12, 5000)] * 3 + [(12, 10, 5000)]:
+            eliminations += race.add([make_result(Status.SATISFIED, t, t)
+                                      for t in times])
+        self.assertEqual([e.backend_index for e in eliminations], [2])
+        self.assertEqual(eliminations[0].num_instances, 4)
+        self.assertEqual(race.alive, [0, 1])
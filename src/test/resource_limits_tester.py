@@ -0,0 +1,53 @@
+import unittest
+import sys
+from shutil import which
+from subprocess import run, PIPE
+from ..resource_limits import ResourceLimits, parse_memory, parse_cpus
+
+
+class ResourceLimitsTester(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(parse_memory('2G'), 2 << 30)
+        self.assertEqual(parse_memory('512 MiB'), 512 << 20)
+        self.assertEqual(parse_memory('1.5k'), 1536)
+        self.assertEqual(parse_memory(1000), 1000)
+        self.assertIsNone(parse_memory(None))
+        with self.assertRaises(ValueError):
+            parse_memory('lots')
+        self.assertEqual(parse_cpus('0-2,5'), {0, 1, 2, 5})
+        self.assertEqual(parse_cpus([3, 1]), {1, 3})
+        with self.assertRaises(ValueError):
+            parse_cpus('0-2-4')
+
+    def test_merge(self):
+        limits = ResourceLimits('1G', '0-3').merge(ResourceLimits(threads=2))
+        self.assertEqual((limits.memory, limits.cpus, limits.threads),
+                         (1 << 30, {0, 1, 2, 3}, 2))
+        limits = limits.merge(ResourceLimits('2G'))
+        self.assertEqual((limits.memory, limits.threads), (2 << 30, 2))
+        self.assertTrue(ResourceLimits().empty)
+        self.assertFalse(limits.empty)
+        with self.assertRaises(TypeError):
+            ResourceLimits.from_config({'disk': '1G'})
+
+    def test_is_out_of_memory(self):
+        limits = ResourceLimits('1G')
+        self.assertTrue(limits.is_out_of_memory(
+          RuntimeError('std::bad_alloc')))
+        self.assertTrue(limits.is_out_of_memory(RuntimeError('crashed'), -6))
+        self.assertFalse(limits.is_out_of_memory(RuntimeError('crashed'), 1))
+        self.assertFalse(ResourceLimits().is_out_of_memory(
+          RuntimeError('std::bad_alloc'), -9))
+
+    def test_wrap(self):
+        cmd = [sys.executable, '-c', 'print(1)']
+        self.assertEqual(ResourceLimits(threads=2).wrap(cmd), cmd)
+        if which('prlimit') is None or which('taskset') is None:
+            return
+        wrapped = ResourceLimits('1G', '0').wrap(
+          [sys.executable, '-c', 'import os, resource; print('
+           'resource.getrlimit(resource.RLIMIT_AS)[0], '
+           'os.sched_getaffinity(0))'])
+        output = run(wrapped, stdout=PIPE, check=True).stdout.decode()
+        self.assertEqual(output.split(maxsplit=1),
+                         [str(1 << 30), '{0}\n'])
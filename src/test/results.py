@@ -0,0 +1,15 @@
+import minizinc
+from datetime import timedelta
+from ..result import Result
+
+
+# A result of a CSP run whose solver reports time_ms, timed by its wall
+# time if one is given
+def make_result(status: minizinc.Status, time_ms: int,
+                wall_ms: int = None) -> Result:
+    return Result(
+      minizinc.Method.SATISFY,
+      minizinc.Result(status, None, {'time': timedelta(milliseconds=time_ms)}),
+      False, [],
+      None if wall_ms is None else timedelta(milliseconds=wall_ms),
+      'wall')
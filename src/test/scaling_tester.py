@@ -0,0 +1,67 @@
+import unittest
+from minizinc import Status
+from ..scaling import Scaling
+from .results import make_result
+
+
+# The virtual backends of a scaling study of Gecode and of the two flag
+# variants of Chuffed, in the order in which the runner lists them
+BACKENDS = [('gecode@4', 'Gecode p=4'), ('gecode@1', 'Gecode p=1'),
+            ('chuffed@1~a', 'Chuffed p=1 a'), ('chuffed@2~a', 'Chuffed p=2 a'),
+            ('chuffed@1~b', 'Chuffed p=1 b')]
+THREAD_BACKENDS = {
+  'gecode@4': ('gecode', 'Gecode', 4), 'gecode@1': ('gecode', 'Gecode', 1),
+  'chuffed@1~a': ('chuffed', 'Chuffed a', 1),
+  'chuffed@2~a': ('chuffed', 'Chuffed a', 2),
+  'chuffed@1~b': ('chuffed', 'Chuffed b', 1)}
+
+
+class ScalingTester(unittest.TestCase):
+    def test_groups(self):
+        scaling = Scaling(BACKENDS, THREAD_BACKENDS)
+        self.assertEqual(scaling.groups,
+                         [('Gecode', [(1, 1), (0, 4)]),
+                          ('Chuffed a', [(2, 1), (3, 2)]),
+                          ('Chuffed b', [(4, 1)])])
+
+    def test_speedup(self):
+        scaling = Scaling(BACKENDS, THREAD_BACKENDS)
+        entries = scaling.add([make_result(Status.SATISFIED, t, t)
+                               for t in (1000, 4000, 600, 500, 0)])
+        self.assertEqual([e[:2] for e in entries],
+                         [('Gecode', 1), ('Gecode', 4), ('Chuffed a', 1),
+                          ('Chuffed a', 2), ('Chuffed b', 1)])
+        self.assertAlmostEqual(entries[0][2], 1.0)
+        self.assertAlmostEqual(entries[1][2], 4.0)
+        self.assertAlmostEqual(entries[1][3], 1.0)
+        self.assertAlmostEqual(entries[3][2], 1.2)
+        self.assertAlmostEqual(entries[3][3], 0.6)
+        # Instant runs are clamped to a millisecond
+        self.assertAlmostEqual(entries[4][2], 1.0)
+
+    def test_unsolved(self):
+        scaling = Scaling(BACKENDS, THREAD_BACKENDS)
+        entries = scaling.add([make_result(Status.SATISFIED, 500, 500),
+                               make_result(Status.UNKNOWN, 1000, 1000),
+                               make_result(Status.SATISFIED, 600, 600), None,
+                               make_result(Status.SATISFIED, 100, 100)])
+        self.assertEqual(entries[1], ('Gecode', 4, None, None))
+        self.assertEqual(entries[3], ('Chuffed a', 2, None, None))
+        self.assertAlmostEqual(entries[2][2], 1.0)
+
+    def test_summary(self):
+        scaling = Scaling(BACKENDS, THREAD_BACKENDS)
+        scaling.add([make_result(Status.SATISFIED, t, t)
+                     for t in (1000, 4000, 600, 300, 100)])
+        scaling.add([None if t is None else make_result(Status.SATISFIED, t, t)
+                     for t in (1000, 1000, 600, None, 100)])
+        summary = {(name, threads): rest
+                   for name, threads, *rest in scaling.summary()}
+        # The geometric mean of the speedups 4 and 1
+        self.assertEqual(summary[('Gecode', 4)][0], 2)
+        self.assertAlmostEqual(summary[('Gecode', 4)][1], 2.0)
+        self.assertAlmostEqual(summary[('Gecode', 4)][2], 0.5)
+        self.assertEqual(summary[('Chuffed a', 2)][0], 1)
+        self.assertAlmostEqual(summary[('Chuffed a', 2)][1], 2.0)
+        self.assertAlmostEqual(summary[('Chuffed a', 2)][2], 1.0)
+        self.assertEqual(summary[('Chuffed b', 1)][:2], [2, 1.0])
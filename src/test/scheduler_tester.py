@@ -0,0 +1,59 @@
+import unittest
+from ..scheduler import CoreScheduler, SCHEDULER_LOOKAHEAD, \
+  SCHEDULER_WINDOW
+
+
+class SchedulerTester(unittest.TestCase):
+    def test_demand(self):
+        scheduler = CoreScheduler(4, 8)
+        self.assertEqual(scheduler.demand(0), 1)
+        self.assertEqual(scheduler.demand(4), 4)
+        self.assertEqual(scheduler.demand(16), 8)
+
+    def test_packing(self):
+        scheduler = CoreScheduler(4, 8)
+        self.assertEqual(scheduler.select([(4, 10), (4, 10), (1, 10)], [], 0),
+                         [0, 1])
+        self.assertEqual(scheduler.select([(1, 10)] * 6, [], 0),
+                         [0, 1, 2, 3])
+
+    def test_backfilling(self):
+        scheduler = CoreScheduler(8, 8)
+        # The 8 core cell waits for both running cells, so only a cell
+        # ending before they do may be backfilled
+        running = [(2, 100), (2, 120)]
+        self.assertEqual(
+          scheduler.select([(8, 100), (1, 150), (1, 50)], running, 0), [2])
+        # A cell waiting for 6 cores leaves 2 spare cores once both running
+        # cells ended, which long cells may occupy
+        running = [(4, 100), (3, 120)]
+        self.assertEqual(
+          scheduler.select([(6, 100), (1, 150), (1, 150)], running, 0), [1])
+        # Here it can already start after the first running cell, with no
+        # spare cores for long cells
+        running = [(4, 100), (2, 120)]
+        self.assertEqual(
+          scheduler.select([(6, 100), (1, 150), (1, 50)], running, 0), [2])
+
+    def test_admit(self):
+        scheduler = CoreScheduler(2, 2)
+        lookahead = SCHEDULER_LOOKAHEAD * 2
+        window = SCHEDULER_WINDOW * 2
+        self.assertEqual(scheduler.admit(0, 0), lookahead)
+        self.assertEqual(scheduler.admit(lookahead - 1, lookahead - 1), 1)
+        # A slow cell holds back the finished cells behind it, up to the
+        # window
+        self.assertEqual(scheduler.admit(0, window - 3), 3)
+        self.assertEqual(scheduler.admit(0, window), 0)
+        self.assertEqual(scheduler.admit(lookahead, window - 1), 0)
+
+    def test_idle_wait(self):
+        scheduler = CoreScheduler(2, 2)
+        window = SCHEDULER_WINDOW * 2
+        self.assertEqual(scheduler.idle_wait(1, 1, True, 2.0), 0.0)
+        self.assertEqual(scheduler.idle_wait(0, 1, False, 2.0), 0.0)
+        # A cell backing off at the head of a full window is waited for,
+        # as no more cells can be read
+        self.assertEqual(scheduler.idle_wait(0, window, False, 2.0), 2.0)
+        self.assertEqual(scheduler.idle_wait(0, 1, True, 2.0), 2.0)
+        self.assertIsNone(scheduler.idle_wait(0, 0, True, None))
@@ -0,0 +1,77 @@
+import unittest
+import minizinc
+from datetime import timedelta
+from ..result import Result, best_result
+from ..scores import Scores
+from ..search_stats import stat_names
+from .results import make_result
+
+
+class ScoresTester(unittest.TestCase):
+    def test_time_source(self):
+        result = make_result(minizinc.Status.SATISFIED, 100, 150)
+        self.assertEqual(result.time, timedelta(milliseconds=150))
+        result.time_source = 'solver'
+        self.assertEqual(result.time, timedelta(milliseconds=100))
+        result = make_result(minizinc.Status.SATISFIED, 100)
+        self.assertEqual(result.time, timedelta(milliseconds=100))
+
+    def test_par_k(self):
+        scores = Scores(10000)
+        scores.add('a', make_result(minizinc.Status.SATISFIED, 0, 1000))
+        scores.add('a', make_result(minizinc.Status.UNKNOWN, 0, 10000))
+        scores.add('b', make_result(minizinc.Status.UNSATISFIABLE, 0, 4000))
+        summary = dict(scores.summary())
+        self.assertEqual(summary['a']['runs'], 2)
+        self.assertEqual(summary['a']['solved'], 1)
+        self.assertAlmostEqual(summary['a']['par2'], (1 + 20) / 2)
+        self.assertAlmostEqual(summary['a']['par10'], (1 + 100) / 2)
+        self.assertAlmostEqual(summary['a']['geometric_mean'], 10 ** 0.5)
+        self.assertAlmostEqual(summary['b']['par10'], 4)
+        self.assertAlmostEqual(summary['b']['geometric_mean'], 4)
+
+        # An unsolved run is penalized by the timeout of its own backend
+        result = make_result(minizinc.Status.UNKNOWN, 0, 5000)
+        result.timeout = 5000
+        scores.add('b', result)
+        summary = dict(scores.summary())
+        self.assertAlmostEqual(summary['b']['par2'], (4 + 10) / 2)
+        self.assertAlmostEqual(summary['b']['geometric_mean'], 20 ** 0.5)
+
+    def test_best_result(self):
+        # The runs of a timeout ladder, of which the last one is reported
+        # unless an earlier one did better
+        short = make_result(minizinc.Status.UNKNOWN, 0, 100)
+        long = make_result(minizinc.Status.SATISFIED, 0, 700)
+        self.assertIs(best_result([short, long]), long)
+        failed = make_result(minizinc.Status.ERROR, 0, 50)
+        self.assertIs(best_result([long, failed]), long)
+        self.assertIs(best_result([short]), short)
+
+    def test_search_stats(self):
+        # The ids of backends are the last part of their solver ids, which
+        # leaves the name to tell CP-SAT apart
+        names = stat_names('sat', backend_name='OR-Tools CP-SAT')
+        self.assertEqual(names['nodes'][0], 'branches')
+        self.assertEqual(names['nodes'].count('branches'), 1)
+        self.assertEqual(stat_names('sat')['nodes'][0], 'nodes')
+        self.assertEqual(stat_names('yuck', backend_name='Yuck')['nodes'][0],
+                         'moves')
+        result = Result(
+          minizinc.Method.SATISFY,
+          minizinc.Result(minizinc.Status.SATISFIED, None, {
+            'time': timedelta(seconds=3), 'solveTime': timedelta(seconds=2),
+            'branches': 100, 'conflicts': 40, 'peakDepth': 7}),
+          False, [], stat_names=names)
+        self.assertEqual(result.search, {
+          'nodes': 100, 'failures': 40, 'peak_depth': 7,
+          'nodes_per_s': 50.0, 'failures_per_s': 20.0})
+        scores = Scores(10000)
+        scores.add('a', result)
+        scores.add('a', make_result(minizinc.Status.SATISFIED, 1000))
+        summary = dict(scores.summary())
+        self.assertEqual(summary['a']['mean_nodes'], 100)
+        self.assertEqual(summary['a']['nodes_per_s'], 50.0)
+        self.assertEqual(stat_names('gecode', {'nodes': 'n'})['nodes'][0],
+                         'n')
+        self.assertRaises(ValueError, stat_names, 'gecode', {'node': 'n'})
@@ -0,0 +1,41 @@
+import unittest
+from os import remove
+from tempfile import NamedTemporaryFile
+from ..features import fzn_features
+from ..selector import Selector
+
+
+class SelectorTester(unittest.TestCase):
+    def test_fzn_features(self):
+        with NamedTemporaryFile('w', suffix='.fzn', delete=False) as fzn:
+            fzn.write('var 1..8: x:: output_var;\n'
+                      'var bool: b;\n'
+                      'constraint int_lin_le([1],[x],4);\n'
+                      'constraint all_different_int([x]);\n'
+                      'solve minimize x;\n')
+        try:
+            features = fzn_features(fzn.name)
+        finally:
+            remove(fzn.name)
+        self.assertEqual(features['vars'], 2)
+        self.assertEqual(features['vars_int'], 1)
+        self.assertEqual(features['vars_bool'], 1)
+        self.assertEqual(features['constraints_int_lin'], 1)
+        self.assertEqual(features['constraints_global'], 1)
+        self.assertEqual(features['domain_log2_max'], 3.0)
+        self.assertEqual(features['objective'], 1)
+
+    def test_selector(self):
+        # Backend a is fast on small instances, backend b on large ones
+        instances = [({'vars': v}, {'a': 1.0, 'b': 50.0}) for v in (1, 2, 3)]
+        instances += [({'vars': v}, {'a': 50.0, 'b': 1.0})
+                      for v in (1000, 2000, 3000)]
+        selector = Selector(instances, k=2)
+        self.assertEqual(selector.rank({'vars': 2}, ['a', 'b']), ['a', 'b'])
+        self.assertEqual(selector.rank({'vars': 2500}, ['a', 'b', 'c']),
+                         ['b', 'a', 'c'])
+        evaluation = selector.evaluate(1)
+        self.assertEqual(evaluation['instances'], 6)
+        self.assertAlmostEqual(evaluation['selector_par10'], 1.0)
+        self.assertAlmostEqual(evaluation['virtual_best_par10'], 1.0)
+        self.assertAlmostEqual(evaluation['gap_closed'], 1.0)
@@ -0,0 +1,81 @@
+import unittest
+from os import path, kill, getpid
+from signal import signal, SIGINT, SIGTERM, SIG_DFL, default_int_handler
+from subprocess import Popen, PIPE
+from tempfile import NamedTemporaryFile
+from time import monotonic, sleep
+from ..supervisor import Supervisor, signal_group, get_supervisor, \
+  install_shutdown_hook, group_kwargs
+
+# A solver that ignores SIGTERM and leaves a child process behind
+STUBBORN = ['sh', '-c', 'trap "" TERM; sleep 30 & echo started; wait']
+
+
+class SupervisorTester(unittest.TestCase):
+    def test_watchdog(self):
+        supervisor = Supervisor(0.2)
+        start = monotonic()
+        output, expired = supervisor.run(STUBBORN, 0.1)
+        self.assertTrue(expired)
+        self.assertLess(monotonic() - start, 5)
+        self.assertEqual(output.stdout, b'started\n')
+        self.assertEqual(len(supervisor.groups), 0)
+
+        output, expired = supervisor.run(['sh', '-c', 'exit 3'], 10)
+        self.assertFalse(expired)
+        self.assertEqual(output.returncode, 3)
+
+    def test_shutdown(self):
+        supervisor = Supervisor(10)
+        with NamedTemporaryFile(delete=False) as tmp_file:
+            supervisor.track_files([tmp_file.name])
+        group = supervisor.register(0x7fffffff)
+        start = monotonic()
+        supervisor.shutdown()
+        self.assertLess(monotonic() - start, 1)
+        self.assertFalse(path.isfile(tmp_file.name))
+        self.assertEqual(len(supervisor.groups), 0)
+        self.assertFalse(signal_group(group.pgid, 0))
+
+    def test_reused_group(self):
+        # A group whose id a later run registered again is not killed when
+        # it is unregistered
+        supervisor = Supervisor(10)
+        with Popen(['sleep', '30'], start_new_session=True) as process:
+            stale = supervisor.register(process.pid)
+            group = supervisor.register(process.pid)
+            supervisor.unregister(stale)
+            self.assertTrue(signal_group(process.pid, 0))
+            self.assertIs(supervisor.groups[process.pid], group)
+            supervisor.unregister(group)
+            self.assertEqual(process.wait(), -9)
+
+    def test_held_group(self):
+        # A held group keeps its id after its processes were reaped, until
+        # it is killed with what is left of it
+        supervisor = Supervisor(10)
+        group = supervisor.hold_group()
+        with Popen(['sh', '-c', 'sleep 30 & echo $!'], stdout=PIPE,
+                   **group_kwargs(group.pgid)) as process:
+            straggler = int(process.stdout.readline())
+        self.assertTrue(signal_group(group.pgid, 0))
+        supervisor.unregister(group)
+        self.assertIsNotNone(group.holder.returncode)
+        end = monotonic() + 5
+        while monotonic() < end and signal_group(group.pgid, 0):
+            sleep(0.05)
+        self.assertFalse(signal_group(group.pgid, 0))
+        with self.assertRaises(ProcessLookupError):
+            kill(straggler, 0)
+
+    def test_shutdown_hook(self):
+        # Ctrl-C while the main thread holds the lock of the supervisor
+        install_shutdown_hook()
+        try:
+            with self.assertRaises(KeyboardInterrupt):
+                with get_supervisor().lock:
+                    kill(getpid(), SIGINT)
+                    sleep(1)
+        finally:
+            signal(SIGINT, default_int_handler)
+            signal(SIGTERM, SIG_DFL)
@@ -0,0 +1,32 @@
+import unittest
+from minizinc import Status
+from json import load
+from os import path
+from tempfile import TemporaryDirectory
+from ..outputters.test_creator_outputter import TestCreatorOutputter
+from .results import make_result
+
+
+class TestCreatorOutputterTester(unittest.TestCase):
+    def test_repetitions(self):
+        # With --repetitions 2 and --jobs 2, both repetitions of an
+        # instance start before either row is complete
+        with TemporaryDirectory() as tmp_dir:
+            json_file_path = path.join(tmp_dir, 'test.json')
+            outputter = TestCreatorOutputter(json_file_path)
+            outputter.set_up(None)
+            outputter.intro([('a', 'a')], 'model.mzn', 1000, True, [], None,
+                            True, [])
+            for instance_index in (0, 1):
+                outputter.pre_run('a', 'a', 0, 1, instance_index, 2, None,
+                                  'x.dzn')
+            for instance_index in (1, 0):
+                outputter.instance([make_result(Status.SATISFIED,
+                                                100 * instance_index,
+                                                100 * instance_index)],
+                                   None, 'x.dzn', instance_index)
+            outputter.outro()
+            with open(json_file_path) as json_file:
+                runs = load(json_file)['runs']
+        self.assertEqual([r['instance_index'] for r in runs], [1, 0])
+        self.assertEqual([r['data_file'] for r in runs], ['x.dzn'] * 2)
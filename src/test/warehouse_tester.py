@@ -0,0 +1,47 @@
+import unittest
+from math import log
+from ..warehouse import Warehouse
+from ..stats import paired_t_test, sign_test
+
+
+class WarehouseTester(unittest.TestCase):
+    def test_tests(self):
+        self.assertEqual(paired_t_test(1, 1.0, 1.0), (0.0, 1.0))
+        t, p_value = paired_t_test(4, 4.0, 6.0)
+        self.assertAlmostEqual(t, 6 ** 0.5)
+        self.assertAlmostEqual(p_value, 0.0917, places=4)
+        self.assertAlmostEqual(sign_test(0, 5), 0.0625)
+        self.assertEqual(sign_test(0, 0), 1.0)
+
+    def test_compare(self):
+        warehouse = Warehouse(':memory:')
+        runs = []
+        for name, factor in (('base', 1), ('cand', 2)):
+            campaign_id = warehouse.add_campaign(name, '', 'host', 'model',
+                                                 'hash')
+            for i in range(10):
+                instance_id = warehouse.add_instance('hash', str(i), str(i))
+                # Two repetitions of each run, and a faster backend b with
+                # better objectives in the candidate campaign
+                for time in (100 + i, 110 + i):
+                    for b_name, b_time, objective in (
+                            ('a', time * factor, i),
+                            ('b', time // factor, i - (name == 'cand'))):
+                        runs.append((campaign_id, instance_id, b_name, b_name,
+                                     name, '{}', 'host', 'minimize', 1000,
+                                     'SAT', 1, b_time,
+                                     log(b_time / 1000), objective, 1.0))
+        warehouse.add_runs(runs)
+        self.assertEqual([c[-1] for c in warehouse.campaigns()], [40, 40])
+        for by, baseline, candidate in (('campaign', 'base', 'cand'),
+                                        ('version', 'base', 'cand')):
+            a, b = warehouse.compare(baseline, candidate, by)
+            self.assertEqual((a.backend_name, a.num_instances), ('a', 10))
+            self.assertAlmostEqual(a.time_ratio, 2)
+            self.assertTrue(a.slower(0.05))
+            self.assertFalse(a.worse_objective(0.05))
+            self.assertLess(b.time_ratio, 1)
+            self.assertFalse(b.slower(0.05))
+            self.assertEqual((b.num_worse, b.num_better), (0, 10))
+        self.assertEqual(warehouse.compare('base', 'cand', 'host'), [])
+        warehouse.close()
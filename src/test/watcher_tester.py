@@ -0,0 +1,36 @@
+import unittest
+from os import path
+from tempfile import TemporaryDirectory
+from ..watcher import Watcher, model_includes
+
+
+class WatcherTester(unittest.TestCase):
+    def test_model_includes(self):
+        with TemporaryDirectory() as tmp_dir:
+            model = path.join(tmp_dir, 'model.mzn')
+            with open(model, 'w') as model_file:
+                model_file.write('include "globals.mzn";\n'
+                                 'include "a.mzn";\n')
+            with open(path.join(tmp_dir, 'a.mzn'), 'w') as a_file:
+                a_file.write('include "b.mzn"; include "model.mzn";\n')
+            with open(path.join(tmp_dir, 'b.mzn'), 'w') as b_file:
+                b_file.write('include "a.mzn";\n')
+            self.assertEqual(model_includes(model),
+                             [path.join(tmp_dir, 'a.mzn'),
+                              path.join(tmp_dir, 'b.mzn')])
+
+    def test_watcher(self):
+        with TemporaryDirectory() as tmp_dir:
+            data_file = path.join(tmp_dir, 'data.dzn')
+            with open(data_file, 'w') as dzn_file:
+                dzn_file.write('n = 1;\n')
+            changes = []
+            watcher = Watcher([data_file], 0.01,
+                              lambda: changes.append(True))
+            try:
+                with open(data_file, 'a') as dzn_file:
+                    dzn_file.write('m = 2;\n')
+                self.assertEqual(watcher.wait(), {data_file})
+                self.assertTrue(len(changes) > 0)
+            finally:
+                watcher.stop()
@@ -0,0 +1,3 @@
+# wall: measured by the runner, solver: reported by MiniZinc,
+# solve: reported by MiniZinc excluding flattening
+TIME_SOURCES = ('wall', 'solver', 'solve')
@@ -0,0 +1,272 @@
+from typing import List, Any, Union, Tuple
+from math import log, exp
+from hashlib import sha256
+import sqlite3
+from .stats import paired_t_test, sign_test
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS campaigns (
+  id INTEGER PRIMARY KEY,
+  name TEXT NOT NULL UNIQUE,
+  started TEXT NOT NULL,
+  host TEXT NOT NULL,
+  model TEXT NOT NULL,
+  model_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS instances (
+  id INTEGER PRIMARY KEY,
+  model_hash TEXT NOT NULL,
+  instance_hash TEXT NOT NULL,
+  instance TEXT NOT NULL,
+  UNIQUE (model_hash, instance_hash)
+);
+CREATE TABLE IF NOT EXISTS runs (
+  id INTEGER PRIMARY KEY,
+  campaign_id INTEGER NOT NULL REFERENCES campaigns(id),
+  instance_id INTEGER NOT NULL REFERENCES instances(id),
+  backend_id TEXT NOT NULL,
+  backend_name TEXT NOT NULL,
+  solver_version TEXT NOT NULL,
+  flags TEXT NOT NULL,
+  host TEXT NOT NULL,
+  method TEXT NOT NULL,
+  timeout INTEGER,
+  status TEXT NOT NULL,
+  solved INTEGER NOT NULL,
+  time INTEGER NOT NULL,
+  log_cost REAL NOT NULL,
+  objective REAL,
+  speed_factor REAL NOT NULL DEFAULT 1.0
+);
+CREATE INDEX IF NOT EXISTS runs_campaign ON runs (campaign_id, backend_name);
+CREATE INDEX IF NOT EXISTS runs_instance ON runs (instance_id);
+CREATE INDEX IF NOT EXISTS runs_version ON runs (solver_version);
+CREATE INDEX IF NOT EXISTS runs_host ON runs (host);
+-- The mean of the repetitions of each backend on each instance of a
+-- campaign, kept up to date by add_runs. Comparisons join these cells on
+-- their primary key instead of aggregating the runs.
+CREATE TABLE IF NOT EXISTS cells (
+  campaign_id INTEGER NOT NULL,
+  backend_name TEXT NOT NULL,
+  instance_id INTEGER NOT NULL,
+  solver_version TEXT NOT NULL,
+  host TEXT NOT NULL,
+  method TEXT NOT NULL,
+  runs INTEGER NOT NULL,
+  log_cost REAL NOT NULL,
+  objective_runs INTEGER NOT NULL,
+  objective REAL,
+  PRIMARY KEY (campaign_id, backend_name, instance_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS cells_version
+  ON cells (solver_version, backend_name, instance_id, method, log_cost,
+            objective);
+CREATE INDEX IF NOT EXISTS cells_host
+  ON cells (host, backend_name, instance_id, method, log_cost, objective);
+'''
+
+RUN_COLUMNS = ('campaign_id', 'instance_id', 'backend_id', 'backend_name',
+               'solver_version', 'flags', 'host', 'method', 'timeout',
+               'status', 'solved', 'time', 'log_cost', 'objective',
+               'speed_factor')
+
+UPSERT_CELL = '''
+INSERT INTO cells (campaign_id, backend_name, instance_id, solver_version,
+                   host, method, runs, log_cost, objective_runs, objective)
+VALUES (?, ?, ?, ?, ?, ?, 1, ?, ? IS NOT NULL, ?)
+ON CONFLICT (campaign_id, backend_name, instance_id) DO UPDATE SET
+  runs = runs + 1,
+  log_cost = (log_cost * runs + excluded.log_cost) / (runs + 1),
+  objective_runs = objective_runs + excluded.objective_runs,
+  objective = CASE WHEN excluded.objective IS NULL THEN objective
+                   WHEN objective IS NULL THEN excluded.objective
+                   ELSE (objective * objective_runs + excluded.objective)
+                        / (objective_runs + 1) END
+'''
+
+# The column that selects the runs of each side of a comparison
+COMPARE_BY = {'campaign': 'campaign_id', 'version': 'solver_version',
+              'host': 'host'}
+
+# The penalty factor of unsolved runs in their cost, as in PAR-10
+PENALTY_FACTOR = 10
+
+
+def file_hash(file_path: str) -> str:
+    digest = sha256()
+    with open(file_path, 'rb') as hashed_file:
+        for chunk in iter(lambda: hashed_file.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def text_hash(text: str) -> str:
+    return sha256(text.encode()).hexdigest()
+
+
+def log_cost(time_ms: int, solved: bool, timeout: Union[None, int]) -> float:
+    # The logarithm of the PAR-10 cost in seconds, clamped to a
+    # millisecond, so that paired differences are ratios of runtimes
+    if not solved and timeout is not None:
+        time_ms = PENALTY_FACTOR * timeout
+    return log(max(time_ms, 1) / 1000)
+
+
+class Regression:
+    backend_name: str = ''
+    num_instances: int = 0
+    time_ratio: float = 1.0
+    time_p_value: float = 1.0
+    num_worse: int = 0
+    num_better: int = 0
+    objective_p_value: float = 1.0
+
+    def __init__(self, backend_name: str, num_instances: int,
+                 time_ratio: float, time_p_value: float, num_worse: int,
+                 num_better: int, objective_p_value: float):
+        self.backend_name = backend_name
+        self.num_instances = num_instances
+        self.time_ratio = time_ratio
+        self.time_p_value = time_p_value
+        self.num_worse = num_worse
+        self.num_better = num_better
+        self.objective_p_value = objective_p_value
+
+    def slower(self, alpha: float) -> bool:
+        return self.time_ratio > 1 and self.time_p_value < alpha
+
+    def worse_objective(self, alpha: float) -> bool:
+        return (self.num_worse > self.num_better and
+                self.objective_p_value < alpha)
+
+
+class Warehouse:
+    db_path: str = ''
+    connection: Union[None, sqlite3.Connection] = None
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        self.connection.executescript(SCHEMA)
+        # The runs of a warehouse from before calibrations were taken at
+        # the speed of the reference host
+        columns = [c[1] for c in self.connection.execute(
+          'PRAGMA table_info(runs)')]
+        if 'speed_factor' not in columns:
+            with self.connection:
+                self.connection.execute(
+                  'ALTER TABLE runs ADD COLUMN speed_factor REAL NOT NULL '
+                  'DEFAULT 1.0')
+
+    def close(self) -> None:
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def add_campaign(self, name: str, started: str, host: str, model: str,
+                     model_hash: str) -> int:
+        # The runs of a campaign that already exists are added to it, for
+        # example to add repetitions
+        with self.connection:
+            self.connection.execute(
+              'INSERT OR IGNORE INTO campaigns '
+              '(name, started, host, model, model_hash) '
+              'VALUES (?, ?, ?, ?, ?)',
+              (name, started, host, model, model_hash))
+        return self.connection.execute(
+          'SELECT id FROM campaigns WHERE name = ?', (name,)).fetchone()[0]
+
+    def add_instance(self, model_hash: str, instance_hash: str,
+                     instance: str) -> int:
+        with self.connection:
+            self.connection.execute(
+              'INSERT OR IGNORE INTO instances '
+              '(model_hash, instance_hash, instance) VALUES (?, ?, ?)',
+              (model_hash, instance_hash, instance))
+        return self.connection.execute(
+          'SELECT id FROM instances WHERE model_hash = ? AND '
+          'instance_hash = ?', (model_hash, instance_hash)).fetchone()[0]
+
+    def add_runs(self, runs: List[Tuple[Any, ...]]) -> None:
+        # The runs are tuples of the values of RUN_COLUMNS
+        with self.connection:
+            self.connection.executemany(
+              f'INSERT INTO runs ({", ".join(RUN_COLUMNS)}) '
+              f'VALUES ({", ".join("?" * len(RUN_COLUMNS))})', runs)
+            self.connection.executemany(UPSERT_CELL, (
+              (c_id, b_name, i_id, version, host, method, cost, objective,
+               objective)
+              for (c_id, i_id, _, b_name, version, _, host, method, _, _, _,
+                   _, cost, objective, _) in runs))
+
+    def campaigns(self) -> List[Tuple[str, str, str, str, int]]:
+        return self.connection.execute(
+          'SELECT c.name, c.started, c.host, c.model, COUNT(r.id) '
+          'FROM campaigns c LEFT JOIN runs r ON r.campaign_id = c.id '
+          'GROUP BY c.id ORDER BY c.id').fetchall()
+
+    def _campaign_id(self, name: str) -> int:
+        row = self.connection.execute(
+          'SELECT id FROM campaigns WHERE name = ?', (name,)).fetchone()
+        if row is None:
+            raise KeyError(f'Unknown campaign "{name}"')
+        return row[0]
+
+    def compare(self, baseline: str, candidate: str, by: str = 'campaign',
+                backend_names: Union[None, List[str]] = None
+                ) -> List[Regression]:
+        # Pairs the cells of both sides by backend and instance, and
+        # aggregates the paired differences in SQL so that only one row per
+        # backend is returned. A campaign has one cell per pair, which is
+        # looked up by the primary key, while the cells of the campaigns of
+        # a solver version or host are averaged in a single index scan.
+        column = COMPARE_BY[by]
+        backend_filter = ''
+        backend_args: List[str] = []
+        if backend_names is not None:
+            backend_filter = (' AND a.backend_name IN (' +
+                              ', '.join('?' * len(backend_names)) + ')')
+            backend_args = list(backend_names)
+        if by == 'campaign':
+            pairs = (
+              'SELECT a.backend_name, a.method, a.log_cost AS a_cost, '
+              'b.log_cost AS b_cost, a.objective AS a_objective, '
+              'b.objective AS b_objective '
+              'FROM cells a JOIN cells b ON b.campaign_id = ? AND '
+              'b.backend_name = a.backend_name AND '
+              'b.instance_id = a.instance_id '
+              f'WHERE a.campaign_id = ?{backend_filter}')
+            args = [self._campaign_id(candidate),
+                    self._campaign_id(baseline)] + backend_args
+        else:
+            pairs = (
+              'SELECT a.backend_name, MAX(a.method) AS method, '
+              f'AVG(CASE WHEN a.{column} = ? THEN a.log_cost END) AS a_cost, '
+              f'AVG(CASE WHEN a.{column} = ? THEN a.log_cost END) AS b_cost, '
+              f'AVG(CASE WHEN a.{column} = ? THEN a.objective END) '
+              'AS a_objective, '
+              f'AVG(CASE WHEN a.{column} = ? THEN a.objective END) '
+              'AS b_objective '
+              f'FROM cells a WHERE a.{column} IN (?, ?){backend_filter} '
+              'GROUP BY a.backend_name, a.instance_id')
+            args = ([baseline, candidate] * 3 + backend_args)
+        rows = self.connection.execute(
+          'SELECT backend_name, COUNT(*), SUM(b_cost - a_cost), '
+          'SUM((b_cost - a_cost) * (b_cost - a_cost)), '
+          "SUM(CASE WHEN method = 'minimize' THEN b_objective > a_objective "
+          "WHEN method = 'maximize' THEN b_objective < a_objective "
+          'ELSE 0 END), '
+          "SUM(CASE WHEN method = 'minimize' THEN b_objective < a_objective "
+          "WHEN method = 'maximize' THEN b_objective > a_objective "
+          'ELSE 0 END) '
+          f'FROM ({pairs}) WHERE a_cost IS NOT NULL AND b_cost IS NOT NULL '
+          'GROUP BY backend_name ORDER BY backend_name', args).fetchall()
+        regressions = []
+        for name, n, total, total_squares, worse, better in rows:
+            worse = worse or 0
+            better = better or 0
+            _, p_value = paired_t_test(n, total, total_squares)
+            regressions.append(Regression(
+              name, n, exp(total / n), p_value, worse, better,
+              sign_test(worse, worse + better)))
+        return regressions
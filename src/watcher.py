@@ -0,0 +1,107 @@
+from typing import List, Dict, Set, Tuple, Union, Iterable, Callable
+from threading import Thread, Event, Lock
+from os import path, stat
+from re import compile, MULTILINE
+
+include_re = compile(r'^\s*include\s+"([^"]+)"\s*;', MULTILINE)
+
+# A file is identified as unchanged by its modification time and size
+FileState = Union[None, Tuple[int, int]]
+
+
+class Cancelled(Exception):
+    pass
+
+
+def file_state(file_path: str) -> FileState:
+    try:
+        info = stat(file_path)
+    except OSError:
+        return None
+    return info.st_mtime_ns, info.st_size
+
+
+def model_includes(model_path: str) -> List[str]:
+    # The files a model includes, recursively, relative to the including
+    # file; includes of the MiniZinc library are not found and skipped
+    includes: List[str] = []
+    pending = [model_path]
+    seen = {path.realpath(model_path)}
+    while len(pending) > 0:
+        current = pending.pop()
+        try:
+            with open(current, 'r') as model_file:
+                text = model_file.read()
+        except (OSError, UnicodeDecodeError):
+            continue
+        for match in include_re.finditer(text):
+            include = path.join(path.dirname(current), match.group(1))
+            if not path.isfile(include) or path.realpath(include) in seen:
+                continue
+            seen.add(path.realpath(include))
+            includes.append(include)
+            pending.append(include)
+    return includes
+
+
+class Watcher:
+    interval: float = 0.5
+    states: Dict[str, FileState] = {}
+    changes: Set[str] = set()
+    changed: Union[None, Event] = None
+    lock: Union[None, Lock] = None
+    on_change: Union[None, Callable[[], None]] = None
+    _stop: Union[None, Event] = None
+    _thread: Union[None, Thread] = None
+
+    def __init__(self, file_paths: Iterable[str], interval: float = 0.5,
+                 on_change: Union[None, Callable[[], None]] = None):
+        # Polls the files from a daemon thread, since a change has to be
+        # noticed while the main thread is blocked in a solve
+        self.interval = interval
+        self.states = {p: file_state(p) for p in file_paths}
+        self.changes = set()
+        self.changed = Event()
+        self.lock = Lock()
+        self.on_change = on_change
+        self._stop = Event()
+        self._thread = Thread(target=self._poll, name='watcher', daemon=True)
+        self._thread.start()
+
+    def watch(self, file_paths: Iterable[str]) -> None:
+        with self.lock:
+            for file_path in file_paths:
+                if file_path not in self.states:
+                    self.states[file_path] = file_state(file_path)
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self.interval):
+            with self.lock:
+                changes = set()
+                for file_path, state in self.states.items():
+                    new_state = file_state(file_path)
+                    if new_state != state:
+                        self.states[file_path] = new_state
+                        changes.add(file_path)
+                self.changes |= changes
+            if len(changes) > 0:
+                self.changed.set()
+                if self.on_change is not None:
+                    self.on_change()
+
+    def wait(self) -> Set[str]:
+        # Blocks until a file changed, and then until the files have been
+        # unchanged for an interval, so that an editor saving several files
+        # (or saving a file in several writes) starts a single rerun
+        self.changed.wait()
+        while True:
+            self.changed.clear()
+            if not self.changed.wait(self.interval * 2):
+                break
+        with self.lock:
+            changes, self.changes = self.changes, set()
+        return changes
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
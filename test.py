@@ -1,5 +1,28 @@
 import unittest
+from src.test.adaptive_sweep_tester import AdaptiveSweepTester
+from src.test.aux_tester import AuxTester
 from src.test.backend_runner_tester import BackendRunnerTester
+from src.test.param_grid_tester import ParamGridTester
+from src.test.scores_tester import ScoresTester
+from src.test.flattener_tester import FlattenerTester
+from src.test.faults_tester import FaultsTester
+from src.test.generator_tester import GeneratorTester
+from src.test.calibration_tester import CalibrationTester
+from src.test.campaign_tester import CampaignTester
+from src.test.cell_tester import CellTester
+from src.test.metrics_outputter_tester import MetricsOutputterTester
+from src.test.planner_tester import PlannerTester
+from src.test.progress_tester import ProgressTester
+from src.test.proof_tester import ProofTester
+from src.test.race_tester import RaceTester
+from src.test.resource_limits_tester import ResourceLimitsTester
+from src.test.scaling_tester import ScalingTester
+from src.test.scheduler_tester import SchedulerTester
+from src.test.selector_tester import SelectorTester
+from src.test.supervisor_tester import SupervisorTester
+from src.test.test_creator_outputter_tester import TestCreatorOutputterTester
+from src.test.warehouse_tester import WarehouseTester
+from src.test.watcher_tester import WatcherTester
 import logging
 
 if __name__ == '__main__':